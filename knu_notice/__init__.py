@@ -1 +1,5 @@
-# Django 프로젝트 초기화
\ No newline at end of file
+# Django 프로젝트 초기화
+# Django가 뜰 때 Celery 앱도 함께 불러와서 @shared_task가 이 앱에 등록되게 한다
+from .celery import app as celery_app
+
+__all__ = ('celery_app',)
@@ -0,0 +1,10 @@
+import os
+
+from celery import Celery
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'knu_notice.settings')
+
+# CELERY_로 시작하는 Django 설정을 읽는다 (예: CELERY_BROKER_URL)
+app = Celery('knu_notice')
+app.config_from_object('django.conf:settings', namespace='CELERY')
+app.autodiscover_tasks()
@@ -39,7 +39,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',
+    'notices.src.snapshots.SnapshotWhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -107,6 +107,104 @@ STATIC_URL = '/static/'
 STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 
+# Cache
+# CACHE_DIR를 지정하면 파일 캐시를 써서 gunicorn 워커끼리 응답 캐시를 공유한다 (데이터 버전은 항상 DB의 DataVersion 행).
+if os.environ.get('CACHE_DIR'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.environ['CACHE_DIR'],
+            'OPTIONS': {'MAX_ENTRIES': 2000},
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'knu-notice',
+            'OPTIONS': {'MAX_ENTRIES': 2000},
+        }
+    }
+
+# notice-counts, notice-preview 응답 캐시 (워커별 LRU 크기, 유효 시간(초))
+RESPONSE_CACHE_MAX_ENTRIES = int(os.environ.get('RESPONSE_CACHE_MAX_ENTRIES', '256'))
+RESPONSE_CACHE_TTL = int(os.environ.get('RESPONSE_CACHE_TTL', '300'))
+
+# /api/v1/notice-counts/range/ 로 한 번에 조회할 수 있는 최대 일수
+NOTICE_COUNTS_MAX_RANGE_DAYS = int(os.environ.get('NOTICE_COUNTS_MAX_RANGE_DAYS', '31'))
+
+# 크롤링할 게시판 {카테고리: {게시판: URL}} 매핑 파일 (로컬 테스트 서버를 가리키게 바꿀 수 있다)
+BOARD_URLS_FILE = os.environ.get('BOARD_URLS_FILE', str(BASE_DIR / 'notices' / 'src' / 'urls.json'))
+
+# 게시판 목록 HTML 파서 (soup, lxml, stream, auto: lxml이 설치되어 있으면 lxml, 아니면 stream)
+# lxml/stream 파서를 실제 게시판 페이지로 검증하기 전까지는 기존 BeautifulSoup 파서를 기본으로 쓴다
+NOTICE_PARSER = os.environ.get('NOTICE_PARSER', 'soup')
+
+# /api/v1/boards/<id>/notices/ 한 페이지 최대 공지사항 수
+BOARD_NOTICES_MAX_LIMIT = int(os.environ.get('BOARD_NOTICES_MAX_LIMIT', '100'))
+
+# /api/v1/search/ 한 페이지 최대 결과 수
+SEARCH_MAX_LIMIT = int(os.environ.get('SEARCH_MAX_LIMIT', '50'))
+
+# 크롤링 데이터 가져오기 (/api/v1/import-data/) 시 트랜잭션당 저장할 공지사항 수
+IMPORT_BATCH_SIZE = int(os.environ.get('IMPORT_BATCH_SIZE', '500'))
+# 가져오기 응답의 peak_memory_kb를 tracemalloc으로 요청마다 잰다 (재는 동안 할당이 느려지므로 끌 수 있다)
+IMPORT_TRACE_MEMORY = os.environ.get('IMPORT_TRACE_MEMORY', 'True').lower() == 'true'
+
+# 나눠 보낸 가져오기(?batch=..&chunk=..)의 저장 완료 기록을 보관하는 일수 (이 기간 안에는 이어서 보낼 수 있다)
+IMPORT_CHUNK_RETENTION_DAYS = int(os.environ.get('IMPORT_CHUNK_RETENTION_DAYS', '7'))
+
+# 비동기 가져오기: 본문을 IMPORT_SPOOL_DIR에 저장하고 202로 바로 응답한 뒤 worker가 저장한다.
+# IMPORT_ASYNC=true면 항상, 아니면 요청에 Prefer: respond-async 헤더가 있을 때만 비동기로 처리한다.
+# IMPORT_WORKER: thread(웹 프로세스 안의 스레드), celery(Celery 작업), command(python manage.py import_worker)
+IMPORT_ASYNC = os.environ.get('IMPORT_ASYNC', 'False').lower() == 'true'
+IMPORT_WORKER = os.environ.get('IMPORT_WORKER', 'thread')
+IMPORT_SPOOL_DIR = os.environ.get('IMPORT_SPOOL_DIR', str(BASE_DIR / 'import_spool'))
+# 이 시간(분) 동안 heartbeat(배치 저장)가 없는 저장 중 작업은 worker가 죽은 것으로 보고 다시 대기열에 넣는다
+IMPORT_JOB_STALE_MINUTES = int(os.environ.get('IMPORT_JOB_STALE_MINUTES', '30'))
+
+# 대시보드 스냅샷: 저장 후 바뀐 날짜마다 게시판별 개수와 미리보기를 JSON 파일 하나로 만들어
+# SNAPSHOT_DIR에 쓰고 WhiteNoise가 SNAPSHOT_URL 아래에서 압축본(.gz/.br)과 함께 서빙한다 (최근 SNAPSHOT_DAYS일만).
+SNAPSHOT_DIR = os.environ.get('SNAPSHOT_DIR', str(BASE_DIR / 'snapshots'))
+SNAPSHOT_URL = '/snapshots/'
+SNAPSHOT_DAYS = int(os.environ.get('SNAPSHOT_DAYS', '7'))
+
+# Celery (게시판별 크롤링 작업 분산)
+# 기본값은 외부 서비스 없이 프로세스 안에서 도는 메모리 브로커/결과 저장소이고, 운영에서는 Redis 등을 지정한다.
+# 메모리 브로커로는 다른 프로세스의 워커가 작업을 받을 수 없어서 crawl_notices --celery는 이 프로세스에서 바로 실행한다.
+# CELERY_TASK_ALWAYS_EAGER=true면 워커 없이 호출한 프로세스에서 바로 실행한다 (재시도도 바로 다시 실행되고,
+# 실패는 결과의 .get()에서 예외로 나온다).
+CELERY_BROKER_URL = os.environ.get('CELERY_BROKER_URL', 'memory://')
+CELERY_RESULT_BACKEND = os.environ.get('CELERY_RESULT_BACKEND', 'cache+memory://')
+CELERY_TASK_ALWAYS_EAGER = os.environ.get('CELERY_TASK_ALWAYS_EAGER', 'False').lower() == 'true'
+CELERY_TIMEZONE = TIME_ZONE
+# crawl_notices --celery가 결과 보고서를 기다리는 최대 시간 (초, --deadline으로 바꿀 수 있다)
+CRAWL_CELERY_TIMEOUT = float(os.environ.get('CRAWL_CELERY_TIMEOUT', '1800'))
+
+# 주기적으로 크롤링할 차례가 된 게시판만 골라서 보낸다 (celery beat 사용 시)
+CELERY_BEAT_SCHEDULE = {
+    'crawl-due-boards': {
+        'task': 'notices.src.tasks.crawl_due_boards',
+        'schedule': 300.0,
+    },
+    # 새 글이 없어도 날짜가 바뀌면 오늘 스냅샷이 생기도록 주기적으로 다시 만든다
+    'refresh-dashboard-snapshots': {
+        'task': 'notices.src.tasks.refresh_snapshots_task',
+        'schedule': 3600.0,
+    },
+}
+
+# 게시판별 크롤링 주기 범위(분)와 크롤링 한 번에 기대하는 새 글 수 (notices.src.scheduler 참고)
+CRAWL_MIN_INTERVAL_MINUTES = int(os.environ.get('CRAWL_MIN_INTERVAL_MINUTES', '15'))
+CRAWL_MAX_INTERVAL_MINUTES = int(os.environ.get('CRAWL_MAX_INTERVAL_MINUTES', '1440'))
+CRAWL_TARGET_POSTS_PER_CRAWL = float(os.environ.get('CRAWL_TARGET_POSTS_PER_CRAWL', '0.5'))
+
+# 게시판 호스트별 요청 한도 (예: 30/m, 2/s) - 여러 워커가 같은 학교 서버를 몰아서 두드리지 않게 한다
+# 카운터는 CRAWL_RATE_LIMIT_CACHE_ALIAS 캐시에 둔다. 기본 LocMemCache는 워커 프로세스마다 따로 세고
+# FileBasedCache는 증가가 원자적이지 않으므로, 워커 전체에 한도를 걸려면 Redis/memcached 캐시를 지정해야 한다.
+CRAWL_HOST_RATE_LIMIT = os.environ.get('CRAWL_HOST_RATE_LIMIT', '30/m')
+CRAWL_RATE_LIMIT_CACHE_ALIAS = os.environ.get('CRAWL_RATE_LIMIT_CACHE_ALIAS', 'default')
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
@@ -0,0 +1,97 @@
+from django.core.management.base import BaseCommand, CommandError
+from notices.src.backfill import backfill_board
+from notices.src.browser_pool import BrowserPool
+from notices.src.fetchers import FETCHER_BACKENDS, create_fetcher
+from notices.src.parsers import PARSER_BACKENDS
+from notices.src.tasks import setup_initial_data
+from notices.models import NoticeBoard
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from multiprocessing import get_context
+from datetime import date
+import time
+
+
+class Command(BaseCommand):
+    help = '게시판 목록을 페이지를 넘겨 가며 읽어서 과거 공지사항을 채운다 (중단하면 다음 실행에서 이어서)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--board', nargs='+', help='채울 게시판 이름 (기본: 활성 게시판 전체)')
+        parser.add_argument('--until', type=date.fromisoformat, help='이 날짜(YYYY-MM-DD)까지의 글만 채운다')
+        parser.add_argument('--max-pages', type=int, default=100, help='게시판당 읽을 마지막 페이지 번호')
+        parser.add_argument('--workers', type=int, default=4, help='동시에 요청할 페이지 수')
+        parser.add_argument(
+            '--processes', type=int, default=2,
+            help='파싱에 쓸 프로세스 수 (0이면 요청 스레드에서 바로 파싱)'
+        )
+        parser.add_argument(
+            '--window', type=int, default=None,
+            help='한 번에 요청해서 저장할 페이지 수 (진행 상황 저장 단위, 기본: workers x 2)'
+        )
+        parser.add_argument(
+            '--backend', choices=sorted(FETCHER_BACKENDS), default='auto',
+            help='페이지 fetcher (auto: HTTP 우선, 목록을 스크립트로 채우는 페이지만 Selenium)'
+        )
+        parser.add_argument('--parser', choices=sorted(PARSER_BACKENDS), help='목록 파서 (기본: NOTICE_PARSER 설정)')
+        parser.add_argument('--restart', action='store_true', help='저장된 진행 상황을 무시하고 1페이지부터 다시 읽는다')
+
+    def handle(self, *args, **options):
+        if options['workers'] < 1 or options['max_pages'] < 1:
+            raise CommandError('--workers와 --max-pages는 1 이상이어야 합니다.')
+        setup_initial_data()
+        boards = NoticeBoard.objects.filter(is_active=True).order_by('id')
+        if options['board']:
+            boards = boards.filter(name__in=options['board'])
+            missing = set(options['board']) - {board.name for board in boards}
+            if missing:
+                raise CommandError(f"없는 게시판: {', '.join(sorted(missing))}")
+
+        # 요청 스레드와 DB 연결이 있는 프로세스를 fork하지 않도록 spawn으로 띄운다 (파서는 Django 없이 동작)
+        processes = options['processes']
+        started = time.perf_counter()
+        total_pages = total_created = total_updated = 0
+        with BrowserPool(size=1) as pool, \
+                create_fetcher(options['backend'], pool=pool, maxsize=options['workers']) as fetcher, \
+                (ProcessPoolExecutor(processes, mp_context=get_context('spawn')) if processes > 0 else nullcontext()) \
+                as parse_executor:
+            for board in boards:
+                def report(progress):
+                    self.stdout.write(
+                        f'{board.name}: {progress.last_page}페이지까지 읽음 '
+                        f'({progress.rows}행, {progress.saved.created}개 추가)'
+                    )
+
+                progress = backfill_board(
+                    board,
+                    fetcher,
+                    until=options['until'],
+                    max_pages=options['max_pages'],
+                    workers=options['workers'],
+                    window=options['window'],
+                    parse_executor=parse_executor,
+                    parser=options['parser'],
+                    restart=options['restart'],
+                    on_progress=report if options['verbosity'] > 1 else None,
+                )
+                total_pages += progress.pages
+                total_created += progress.saved.created
+                total_updated += progress.saved.updated
+                if progress.stop_reason == 'done':
+                    self.stdout.write(f'{board.name}: 이미 마지막 페이지까지 채움, 건너뜀 (--restart로 다시 읽기)')
+                    continue
+                if progress.stop_reason == 'error':
+                    self.stdout.write(self.style.ERROR(
+                        f'{board.name}: {progress.error} (다음 실행에서 {progress.last_page + 1}페이지부터 이어서 읽음)'
+                    ))
+                    continue
+                reason = {'end': '마지막 페이지', 'until': '기준 날짜', 'max_pages': '페이지 한도'}[progress.stop_reason]
+                self.stdout.write(
+                    f'{board.name}: {progress.start_page}~{progress.last_page}페이지 '
+                    f'{progress.saved.created}개 추가, {progress.saved.updated}개 갱신 ({reason}에서 멈춤)'
+                )
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'backfill 완료: 페이지 {total_pages}개, {total_created}개 추가, {total_updated}개 갱신 '
+            f'({elapsed:.1f}s, {total_pages / elapsed if elapsed else 0:.1f} 페이지/s)'
+        ))
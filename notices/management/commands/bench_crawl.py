@@ -0,0 +1,140 @@
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test import override_settings
+from io import StringIO
+from notices.models import Notice, NoticeBoard
+from notices.src.benchmark import RollbackBenchmark, generate_notice_rows
+from notices.src.crawler import load_board_urls
+from notices.src.fetchers import FETCHER_BACKENDS
+from notices.src.fixture_server import KnuFixtureServer
+from notices.src.jsonstream import iter_export_file
+from notices.src.tasks import setup_initial_data
+import json
+import os
+import tempfile
+import time
+
+
+class Command(BaseCommand):
+    help = '로컬 테스트용 게시판 서버를 띄워 백엔드/동시성 설정별 크롤링 처리량 측정'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--source', default='crawled_data.json',
+            help='서버가 내려줄 공지사항 (crawl_notices 내보내기 파일: NDJSON 또는 {"notices": [...]} JSON)'
+        )
+        parser.add_argument(
+            '--rows', type=int, default=None,
+            help='--source 대신 urls.json 게시판으로 합성 공지사항을 이만큼 생성'
+        )
+        parser.add_argument('--pages', type=int, default=3, help='게시판당 목록 페이지 수')
+        parser.add_argument('--latency', type=float, default=50.0, help='응답 지연 (ms)')
+        parser.add_argument('--jitter', type=float, default=20.0, help='응답 지연 변동 폭 (ms)')
+        parser.add_argument('--error-rate', type=float, default=0.0, help='503 응답 비율 (0~1)')
+        parser.add_argument(
+            '--backends', nargs='+', choices=sorted(FETCHER_BACKENDS), default=['http'],
+            help='측정할 페이지 fetcher'
+        )
+        parser.add_argument(
+            '--concurrency', type=int, nargs='+', default=[1, 4, 8],
+            help='측정할 crawl_notices --concurrency 값 목록'
+        )
+        parser.add_argument('--timeout', type=float, default=30.0, help='페이지 하나당 요청 제한 시간 (초)')
+        parser.add_argument('--pool-size', type=int, default=1, help='selenium 백엔드용 headless Chrome 개수')
+        parser.add_argument(
+            '--serve', metavar='URLS_FILE',
+            help='측정하지 않고 서버만 띄운 뒤 게시판 URL 매핑을 이 파일에 저장 '
+                 '(BOARD_URLS_FILE로 지정해서 crawl_notices를 실행할 수 있다)'
+        )
+
+    def handle(self, *args, **options):
+        notices, categories = self.load_notices(options)
+        server = KnuFixtureServer(
+            notices,
+            board_categories=categories,
+            latency=options['latency'] / 1000,
+            jitter=options['jitter'] / 1000,
+            error_rate=options['error_rate'],
+            pages=options['pages'],
+        )
+        with server:
+            self.stdout.write(
+                f'테스트 서버 {server.url()}: 게시판 {len(server.boards)}개 x {options["pages"]}페이지, '
+                f'지연 {options["latency"]:.0f}±{options["jitter"]:.0f}ms, 오류율 {options["error_rate"]:.0%}'
+            )
+            if options['serve']:
+                self.serve(server, options['serve'])
+                return
+            for backend in options['backends']:
+                for concurrency in options['concurrency']:
+                    self.run(server, backend, concurrency, options)
+
+    def load_notices(self, options):
+        """(공지사항 목록, {게시판: 카테고리}) 반환"""
+        urls = load_board_urls()
+        categories = {board: category for category, boards in urls.items() for board in boards}
+        if options['rows']:
+            return list(generate_notice_rows(list(categories), options['rows'])), categories
+        try:
+            notices = list(iter_export_file(options['source']))
+        except (OSError, ValueError) as e:
+            raise CommandError(f"{options['source']}을(를) 읽을 수 없습니다: {e}")
+        if not notices:
+            raise CommandError(f"{options['source']}에 공지사항이 없습니다. --rows로 합성 데이터를 쓰세요.")
+        return notices, categories
+
+    def run(self, server, backend, concurrency, options):
+        """
+        테스트 서버를 가리키는 게시판으로 crawl_notices를 그대로 실행해 게시판/s 측정
+        매번 --force로 모든 게시판을 새로 읽고, 끝나면 DB 변경(게시판 URL, 공지사항, 크롤링 상태)을 되돌린다.
+        """
+        before = dict(server.stats)
+        output = StringIO()
+        with tempfile.TemporaryDirectory() as directory:
+            urls_file = os.path.join(directory, 'urls.json')
+            with open(urls_file, 'w', encoding='utf-8') as f:
+                json.dump(server.board_urls(), f, ensure_ascii=False)
+            try:
+                with override_settings(BOARD_URLS_FILE=urls_file), transaction.atomic():
+                    setup_initial_data()
+                    # 테스트 서버에 없는 게시판은 실제 사이트를 읽지 않도록 끈다
+                    NoticeBoard.objects.exclude(url__startswith=server.url()).update(is_active=False)
+                    boards = NoticeBoard.objects.filter(is_active=True).count()
+                    notices = Notice.objects.count()
+                    started = time.perf_counter()
+                    call_command(
+                        'crawl_notices',
+                        output=os.path.join(directory, 'crawled.ndjson'),
+                        backend=backend,
+                        concurrency=concurrency,
+                        timeout=options['timeout'],
+                        pool_size=options['pool_size'],
+                        force=True,
+                        stdout=output,
+                    )
+                    elapsed = time.perf_counter() - started
+                    rows = Notice.objects.count() - notices
+                    raise RollbackBenchmark
+            except RollbackBenchmark:
+                pass
+        log = output.getvalue()
+        failed = log.count('크롤링 실패') + log.count('저장 실패')
+        if 'Failed to' in log or 'Database connection failed' in log:
+            raise CommandError(f'crawl_notices 실패:\n{log}')
+        requests = server.stats['requests'] - before['requests']
+        errors = server.stats['errors'] - before['errors']
+        self.stdout.write(
+            f'{backend} x{concurrency}: {elapsed:.2f}s, {boards / elapsed:.1f} boards/s, {rows / elapsed:,.0f} rows/s '
+            f'(게시판 {boards}, 실패 {failed}, 요청 {requests}, 서버 오류 {errors})'
+        )
+
+    def serve(self, server, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(server.board_urls(), f, ensure_ascii=False, indent=4)
+        self.stdout.write(self.style.SUCCESS(f'게시판 URL 매핑 저장: {path} (Ctrl+C로 종료)'))
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,86 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from notices.src.ingest import build_notice, bulk_upsert_notices
+from notices.models import Notice, NoticeBoard, NoticeCategory
+from notices.src.benchmark import RollbackBenchmark
+from datetime import date, timedelta
+import time
+
+
+class Command(BaseCommand):
+    help = '행 단위 저장과 일괄 upsert 저장 속도 비교 (모든 변경은 끝나면 롤백)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows', type=int, nargs='+', default=[10_000, 100_000],
+            help='측정할 행 수 목록'
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=500,
+            help='일괄 upsert 트랜잭션당 행 수'
+        )
+        parser.add_argument(
+            '--skip-per-row', action='store_true',
+            help='행 단위 저장 측정 생략 (행 수가 많을 때)'
+        )
+
+    def handle(self, *args, **options):
+        for rows in options['rows']:
+            self.stdout.write(f'--- {rows}행 ---')
+            if not options['skip_per_row']:
+                self.run('행 단위(exists + create)', rows, self.per_row)
+            self.run('일괄 upsert (신규)', rows, lambda board, data: self.bulk(board, data, options['chunk_size']))
+            self.run(
+                '일괄 upsert (재실행, 변경 없음)', rows,
+                lambda board, data: self.bulk(board, data, options['chunk_size']),
+                prefill=True,
+            )
+
+    def run(self, label, rows, func, prefill=False):
+        try:
+            with transaction.atomic():
+                category = NoticeCategory.objects.create(name='__bench__')
+                board = NoticeBoard.objects.create(category=category, name='__bench__', url='https://example.com/bench')
+                data = list(self.generate(rows))
+                if prefill:
+                    self.bulk(board, data, 1000)
+                started = time.perf_counter()
+                result = func(board, data)
+                elapsed = time.perf_counter() - started
+                self.stdout.write(
+                    f'{label}: {elapsed:.2f}s ({rows / elapsed:,.0f} rows/s) {result}'
+                )
+                raise RollbackBenchmark
+        except RollbackBenchmark:
+            pass
+
+    def generate(self, rows):
+        start = date(2025, 1, 1)
+        for i in range(rows):
+            yield {
+                'title': f'벤치마크 공지사항 {i}',
+                'url': f'/bbs/KNU/9999/{100000 + i}/artclView.do',
+                'date': (start + timedelta(days=i % 365)).isoformat(),
+                'display_order': i % 15,
+                'author': '학생복지과',
+                'view_count': i % 1000,
+                'is_important': False,
+            }
+
+    def per_row(self, board, data):
+        """기존 crawl_board_notices 방식: 행마다 exists() 후 create()"""
+        created = 0
+        for row in data:
+            if not Notice.objects.filter(title=row['title'], url=row['url']).exists():
+                Notice.objects.create(
+                    board=board,
+                    title=row['title'],
+                    url=row['url'],
+                    published_date=row['date'],
+                    display_order=row['display_order'],
+                )
+                created += 1
+        return {'created': created}
+
+    def bulk(self, board, data, chunk_size):
+        return bulk_upsert_notices((build_notice(board, row) for row in data), chunk_size=chunk_size).as_dict()
@@ -0,0 +1,75 @@
+from django.core.management.base import BaseCommand, CommandError
+from notices.src.benchmark import generate_notice_rows
+from notices.src.fixture_server import KnuFixtureServer
+from notices.src.parsers import available_parsers, get_parser
+from pathlib import Path
+import time
+
+FIXTURES_DIR = Path(__file__).resolve().parents[2] / 'fixtures'
+
+
+class Command(BaseCommand):
+    help = '게시판 목록 HTML 파서(soup, lxml, stream)별 초당 파싱 행 수 비교'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--files', nargs='*', default=[str(FIXTURES_DIR / 'board_list.html')],
+            help='파싱할 게시판 목록 HTML 파일'
+        )
+        parser.add_argument(
+            '--synthetic-pages', type=int, default=20,
+            help='테스트용 게시판 서버 형식으로 추가로 만들 목록 페이지 수'
+        )
+        parser.add_argument('--seconds', type=float, default=2.0, help='파서별 최소 측정 시간 (초)')
+        parser.add_argument(
+            '--backends', nargs='+', default=None,
+            help=f'측정할 파서 (기본: 지금 쓸 수 있는 전체 = {", ".join(available_parsers())})'
+        )
+
+    def handle(self, *args, **options):
+        pages = [Path(path).read_text(encoding='utf-8') for path in options['files']]
+        if options['synthetic_pages']:
+            server = KnuFixtureServer(
+                generate_notice_rows(['학생소식'], options['synthetic_pages'] * 15),
+                pages=options['synthetic_pages'],
+            )
+            pages.extend(body.decode('utf-8') for body in server.pages_cache.values())
+        if not pages:
+            raise CommandError('파싱할 페이지가 없습니다.')
+
+        backends = options['backends'] or available_parsers()
+        try:
+            parsers = [get_parser(name) for name in backends]
+        except (ImportError, ValueError) as e:
+            raise CommandError(str(e))
+
+        expected = self.strip(parsers[0], pages)
+        self.stdout.write(f'페이지 {len(pages)}개, 행 {sum(len(rows) for rows in expected)}개')
+        baseline = None
+        for parser in parsers:
+            if self.strip(parser, pages) != expected:
+                self.stdout.write(self.style.WARNING(f'{parser.name}: {parsers[0].name}와 결과가 다릅니다'))
+            rows_per_second, pages_per_second = self.measure(parser, pages, options['seconds'])
+            baseline = baseline or rows_per_second
+            self.stdout.write(
+                f'{parser.name}: {rows_per_second:,.0f} rows/s, {pages_per_second:,.1f} pages/s '
+                f'(x{rows_per_second / baseline:.1f})'
+            )
+
+    def strip(self, parser, pages):
+        """crawled_at을 뺀 파싱 결과 (파서끼리 비교용)"""
+        return [
+            [{key: value for key, value in row.items() if key != 'crawled_at'} for row in parser.parse(html, '학생소식')]
+            for html in pages
+        ]
+
+    def measure(self, parser, pages, seconds):
+        rows = parsed_pages = 0
+        started = time.perf_counter()
+        while True:
+            for html in pages:
+                rows += len(parser.parse(html, '학생소식'))
+            parsed_pages += len(pages)
+            elapsed = time.perf_counter() - started
+            if elapsed >= seconds:
+                return rows / elapsed, parsed_pages / elapsed
@@ -0,0 +1,82 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from notices.models import Notice, NoticeBoard, NoticeCategory
+from notices.src.benchmark import RollbackBenchmark
+from notices.src.search import search_notices
+from datetime import date, timedelta
+import random
+import statistics
+import time
+
+
+WORDS = [
+    '장학금', '신청', '안내', '수강신청', '학사일정', '졸업', '등록금', '납부', '기숙사', '입사',
+    '채용', '공고', '특강', '취업', '프로그램', '모집', '교환학생', '설명회', '도서관', '이용',
+    '변경', '휴학', '복학', '성적', '공개', '현장실습', '참가자', '봉사활동', '결과', '발표',
+]
+
+AUTHORS = ['학생복지과', '학사관리과', '취업지원과', '국제교류원', '생활관', '도서관']
+
+QUERIES = ['장학금', '수강신청 안내', '교환학생 모집', '현장실습 참가자', '기숙사 입사', '학생복지과', '존재하지않는검색어']
+
+
+class Command(BaseCommand):
+    help = '합성 데이터로 FTS5 검색과 LIKE 검색의 지연 시간 비교 (모든 변경은 끝나면 롤백)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=500_000, help='생성할 공지사항 수')
+        parser.add_argument('--repeat', type=int, default=20, help='검색어당 반복 횟수')
+        parser.add_argument('--seed', type=int, default=42, help='데이터 생성 시드')
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                started = time.perf_counter()
+                self.populate(options['rows'], options['seed'])
+                self.stdout.write(f"{options['rows']:,}행 생성 (색인 포함): {time.perf_counter() - started:.1f}s")
+                for query in QUERIES:
+                    fts = self.measure(query, options['repeat'], use_index=True)
+                    like = self.measure(query, options['repeat'], use_index=False)
+                    self.stdout.write(
+                        f"'{query}': 결과 {fts['total']:,}건 | "
+                        f"FTS p50 {fts['p50']:.1f}ms p95 {fts['p95']:.1f}ms | "
+                        f"LIKE p50 {like['p50']:.1f}ms p95 {like['p95']:.1f}ms"
+                    )
+                raise RollbackBenchmark
+        except RollbackBenchmark:
+            pass
+
+    def populate(self, rows, seed):
+        rng = random.Random(seed)
+        category = NoticeCategory.objects.create(name='__bench__')
+        board = NoticeBoard.objects.create(category=category, name='__bench__', url='https://example.com/bench')
+        start = date(2020, 1, 1)
+        batch = []
+        for i in range(rows):
+            batch.append(Notice(
+                board=board,
+                title=f"{' '.join(rng.sample(WORDS, 4))} {i}",
+                url=f'/bbs/KNU/9999/{1_000_000 + i}/artclView.do',
+                natural_key=str(1_000_000 + i),
+                published_date=start + timedelta(days=i % 2000),
+                display_order=i % 15,
+                author=rng.choice(AUTHORS),
+            ))
+            if len(batch) >= 5000:
+                Notice.objects.bulk_create(batch)
+                batch = []
+        Notice.objects.bulk_create(batch)
+
+    def measure(self, query, repeat, use_index):
+        timings = []
+        total = 0
+        for _ in range(repeat):
+            started = time.perf_counter()
+            _, total, _ = search_notices(query, limit=20, use_index=use_index)
+            timings.append((time.perf_counter() - started) * 1000)
+        timings.sort()
+        return {
+            'total': total,
+            'p50': statistics.median(timings),
+            'p95': timings[min(len(timings) - 1, int(len(timings) * 0.95))],
+        }
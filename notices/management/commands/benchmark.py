@@ -0,0 +1,73 @@
+from django.core.management.base import BaseCommand, CommandError
+from notices.src.benchmark import BenchmarkSuite, build_report, compare_reports, run_benchmarks
+import json
+
+
+class Command(BaseCommand):
+    help = '합성 데이터로 공지사항 API와 저장 경로의 지연 시간/쿼리 수/메모리를 측정 (모든 변경은 끝나면 롤백)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows', type=int, nargs='+', default=[10_000, 100_000],
+            help='합성 공지사항 수 목록 (예: 10000 100000 1000000)'
+        )
+        parser.add_argument('--repeat', type=int, default=20, help='시나리오당 반복 횟수')
+        parser.add_argument('--import-rows', type=int, default=1000, help='import-data 요청 한 번에 보낼 공지사항 수')
+        parser.add_argument('--seed', type=int, default=0, help='데이터 생성 시드')
+        parser.add_argument(
+            '--scenarios', nargs='+', choices=BenchmarkSuite.SCENARIOS,
+            help='측정할 시나리오 (기본: 전체)'
+        )
+        parser.add_argument('--output', help='결과를 저장할 JSON 파일 경로')
+        parser.add_argument('--baseline', help='비교할 기준 결과 JSON 파일 경로')
+        parser.add_argument(
+            '--threshold', type=float, default=0.2,
+            help='기준 대비 p95 증가를 성능 저하로 볼 비율 (기본 0.2 = 20%%)'
+        )
+        parser.add_argument(
+            '--fail-on-regression', action='store_true',
+            help='기준 대비 성능 저하가 있으면 실패 코드로 종료'
+        )
+
+    def handle(self, *args, **options):
+        runs = {}
+        for rows in options['rows']:
+            self.stdout.write(f'--- {rows:,}행 ---')
+            outcome = run_benchmarks(
+                rows,
+                repeat=options['repeat'],
+                import_rows=options['import_rows'],
+                seed=options['seed'],
+                scenarios=options['scenarios'],
+            )
+            self.stdout.write(f"데이터 생성: {outcome['populate_seconds']}s (가장 글이 많은 날짜 {outcome['busiest_date']})")
+            for name, result in outcome['scenarios'].items():
+                self.stdout.write(
+                    f"{name}: p50 {result['p50_ms']:.1f}ms, p95 {result['p95_ms']:.1f}ms, "
+                    f"쿼리 {result['queries']:g}개, 최대 메모리 {result['peak_memory_kb']:,.0f}KB"
+                )
+            runs[rows] = outcome
+
+        report = build_report(runs, options['repeat'], options['seed'])
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"결과 저장: {options['output']}"))
+
+        if options['baseline']:
+            with open(options['baseline'], encoding='utf-8') as f:
+                baseline = json.load(f)
+            try:
+                lines, regressions = compare_reports(report, baseline, options['threshold'])
+            except ValueError as e:
+                raise CommandError(str(e))
+            self.stdout.write('--- 기준 결과와 비교 ---')
+            for line in lines:
+                self.stdout.write(line)
+            if regressions:
+                message = f'성능 저하 {len(regressions)}건'
+                if options['fail_on_regression']:
+                    raise CommandError(message)
+                self.stdout.write(self.style.WARNING(message))
+            else:
+                self.stdout.write(self.style.SUCCESS('성능 저하 없음'))
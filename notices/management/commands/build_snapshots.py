@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand, CommandError
+from notices.src.snapshots import refresh_snapshots, snapshot_dir
+
+
+class Command(BaseCommand):
+    help = '최근 날짜들의 대시보드 스냅샷(SNAPSHOT_DIR)과 index.json을 다시 만든다 (배포 직후나 날짜가 바뀐 뒤 실행)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, help='오늘부터 며칠 전까지 만들지 (기본: SNAPSHOT_DAYS)')
+
+    def handle(self, *args, **options):
+        if options['days'] is not None and options['days'] < 1:
+            raise CommandError('--days는 1 이상이어야 합니다.')
+        names = refresh_snapshots(days=options['days'])
+        self.stdout.write(self.style.SUCCESS(f'{snapshot_dir()}에 스냅샷 {len(names)}개를 만들었습니다.'))
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+from notices.src.jsonstream import NdjsonWriter, is_ndjson_path, iter_export_file
+import os
+
+
+class Command(BaseCommand):
+    help = '예전 {"notices": [...]} 크롤링 결과 파일을 NDJSON(.ndjson, .gz면 압축)으로 변환 (파일 전체를 메모리에 올리지 않음)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('source', help='변환할 파일 (예: crawled_data.json)')
+        parser.add_argument('destination', nargs='?', help='저장할 파일 (기본: source 이름의 .ndjson.gz)')
+
+    def handle(self, *args, **options):
+        source = options['source']
+        destination = options['destination'] or os.path.splitext(source)[0] + '.ndjson.gz'
+        if not is_ndjson_path(destination):
+            raise CommandError(f'{destination}: 저장할 파일 이름은 .ndjson 또는 .jsonl로 끝나야 합니다 (.gz 가능).')
+        if os.path.abspath(source) == os.path.abspath(destination):
+            raise CommandError('source와 destination이 같습니다.')
+
+        try:
+            with NdjsonWriter(destination) as writer:
+                for notice in iter_export_file(source):
+                    writer.write(notice)
+        except (OSError, ValueError) as e:
+            raise CommandError(f'{source}을(를) 변환할 수 없습니다: {e}')
+
+        before, after = os.path.getsize(source), os.path.getsize(destination)
+        self.stdout.write(self.style.SUCCESS(
+            f'{writer.count}개 공지사항 변환: {source} ({before:,} bytes) -> {destination} ({after:,} bytes, '
+            f'{after / before * 100 if before else 0:.0f}%)'
+        ))
@@ -1,13 +1,64 @@
-import json
+from django.conf import settings
 from django.core.management.base import BaseCommand
 from django.db import connection
-from notices.src.tasks import setup_initial_data, crawl_board_notices
-from notices.src.crawler import crawl_notices
+from knu_notice.celery import app as celery_app
+from notices.src.tasks import crawl_states, dispatch_crawl, record_crawl_state, setup_initial_data, uses_local_broker
+from notices.src.pipeline import CrawlPipeline, DatabaseSink, create_export_sink
+from notices.src.async_crawl import stream_crawl
+from notices.src.browser_pool import BrowserPool
+from notices.src.fetchers import FETCHER_BACKENDS, create_fetcher
+from notices.src.scheduler import CrawlScheduler
 from notices.models import NoticeBoard
 
 class Command(BaseCommand):
     help = 'Crawl notices from Kongju University website'
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output', default='crawled_data.ndjson',
+            help='크롤링 결과를 내보낼 파일 경로 (.ndjson/.jsonl: 한 줄에 하나씩, .gz면 압축, .json: 예전 형식)'
+        )
+        parser.add_argument(
+            '--backend', choices=sorted(FETCHER_BACKENDS), default='auto',
+            help='페이지 fetcher (auto: HTTP 우선, 목록을 스크립트로 채우는 페이지만 Selenium)'
+        )
+        parser.add_argument(
+            '--concurrency', type=int, default=4,
+            help='호스트별 동시에 크롤링할 게시판 수'
+        )
+        parser.add_argument(
+            '--timeout', type=float, default=30.0,
+            help='게시판 하나당 요청 제한 시간 (초)'
+        )
+        parser.add_argument(
+            '--deadline', type=float, default=None,
+            help='전체 크롤링 제한 시간 (초, --celery면 기본 CRAWL_CELERY_TIMEOUT)'
+        )
+        parser.add_argument(
+            '--max-pages', type=int, default=3,
+            help='게시판당 읽을 최대 목록 페이지 수 (이미 본 게시글이 나오면 그 전에 멈춤)'
+        )
+        parser.add_argument(
+            '--force', action='store_true',
+            help='저장된 크롤링 상태(게시글 번호, ETag, 해시)를 무시하고 첫 페이지를 다시 읽어서 저장'
+        )
+        parser.add_argument(
+            '--due-only', action='store_true',
+            help='게시판별 크롤링 주기(crawl_schedule 참고)상 차례가 된 게시판만 크롤링'
+        )
+        parser.add_argument(
+            '--celery', action='store_true',
+            help='게시판별 Celery 작업으로 나눠 보내고 결과 보고서를 기다린다 (JSON 내보내기는 하지 않음)'
+        )
+        parser.add_argument(
+            '--pool-size', type=int, default=1,
+            help='동시에 띄워 둘 headless Chrome 개수'
+        )
+        parser.add_argument(
+            '--pages-per-browser', type=int, default=50,
+            help='브라우저 하나가 처리할 최대 페이지 수 (초과 시 재시작)'
+        )
+
     def handle(self, *args, **options):
         self.stdout.write('Checking database connection...')
         try:
@@ -33,38 +84,146 @@ class Command(BaseCommand):
             )
             return
 
+        if options['celery']:
+            self.crawl_with_celery(options)
+            return
+
         self.stdout.write('Starting to crawl notices...')
         try:
             # Celery 없이 직접 함수 호출
-            boards = NoticeBoard.objects.filter(is_active=True)
+            scheduler = CrawlScheduler()
+            boards = self.select_boards(scheduler, options)
             total_new_notices = 0
-            all_notices = []
+            exported_count = 0
+            pages_fetched = pages_skipped = rows_skipped = 0
+            bytes_downloaded = bytes_saved = 0
+            boards_skipped = {'not_modified': 0, 'same_hash': 0}
+
+            boards_by_name = {board.name: board for board in boards}
 
-            # 각 게시판을 순회하면서 크롤링
-            for board in boards:
-                try:
-                    new_count = crawl_board_notices(board)
-                    total_new_notices += new_count
-                    self.stdout.write(f'{board.name}: {new_count}개 새 공지사항 추가')
-                    
-                    # 크롤링된 데이터를 all_notices 리스트에 추가
-                    notices = crawl_notices(board_name=board.name)
-                    all_notices.extend(notices)
-                except Exception as e:
-                    self.stdout.write(
-                        self.style.ERROR(f'{board.name} 크롤링 실패: {e}')
-                    )
+            # 게시판마다 한 번만 크롤링하고, 그 결과를 DB 저장과 JSON 내보내기에 함께 사용
+            pipeline = CrawlPipeline([DatabaseSink(), create_export_sink(options['output'])])
+
+            # 브라우저는 풀에서 한 번만 띄우고 모든 게시판이 재사용
+            # 제한 시간을 넘긴 요청은 결과를 버리고, 소켓/드라이버도 같은 시간 안에 끝나게 한다
+            with BrowserPool(size=options['pool_size'], max_pages=options['pages_per_browser'],
+                             page_load_timeout=options['timeout']) as pool, \
+                    create_fetcher(options['backend'], pool=pool, maxsize=options['concurrency'],
+                                   timeout=options['timeout']) as fetcher, \
+                    pipeline:
+                # 게시판을 동시에 크롤링하고, 끝나는 순서대로 바로 저장
+                # 이미 본 게시글 번호까지만 페이지를 넘기고, 첫 페이지가 그대로면 파싱/저장을 건너뛴다
+                states = {} if options['force'] else crawl_states(boards_by_name.values())
+                results = stream_crawl(
+                    [(board.name, board.url) for board in boards_by_name.values()],
+                    fetcher,
+                    concurrency=options['concurrency'],
+                    request_timeout=options['timeout'],
+                    deadline=options['deadline'],
+                    max_pages=options['max_pages'],
+                    states=states,
+                )
+                for result in results:
+                    board = boards_by_name[result.board_name]
+                    if not result.ok:
+                        self.stdout.write(
+                            self.style.ERROR(f'{board.name} 크롤링 실패: {result.error} ({result.elapsed:.2f}s)')
+                        )
+                        continue
+                    pages_fetched += result.pages
+                    bytes_downloaded += result.crawl.bytes_downloaded
+                    if result.reached_known:
+                        pages_skipped += options['max_pages'] - result.pages
+                    if result.unchanged:
+                        boards_skipped[result.unchanged] += 1
+                        if result.unchanged == 'not_modified':
+                            bytes_saved += states[board.name].content_length
+                        record_crawl_state(board, pages=result.crawl)
+                        scheduler.record_crawl(board, 0)
+                        reason = '304 Not Modified' if result.unchanged == 'not_modified' else '목록 해시 동일'
+                        self.stdout.write(f'{board.name}: 변경 없음, 건너뜀 ({reason}, {result.elapsed:.2f}s)')
+                        continue
+                    try:
+                        counts = pipeline.process(board, result.notices)
+                        saved = counts['db']
+                        # 저장이 끝난 뒤에만 상태를 올려서, 저장 실패 시 다음 실행에서 다시 읽게 한다
+                        record_crawl_state(board, result.max_article_id, pages=result.crawl)
+                        scheduler.record_crawl(board, saved.created)
+                        total_new_notices += saved.created
+                        rows_skipped += saved.unchanged + saved.skipped
+                        exported_count += counts['export']
+                        self.stdout.write(
+                            f'{board.name}: {saved.created}개 새 공지사항 추가, '
+                            f'{saved.updated}개 갱신, {saved.unchanged}개 변경 없음 '
+                            f'({result.pages}페이지, {result.elapsed:.2f}s, {result.backend})'
+                        )
+                    except Exception as e:
+                        self.stdout.write(
+                            self.style.ERROR(f'{board.name} 저장 실패: {e}')
+                        )
+                self.stdout.write(f'브라우저 실행 {pool.launched_count}회, 교체 {pool.recycled_count}회')
+                self.stdout.write(
+                    f'목록 페이지 {pages_fetched}개 읽음, {pages_skipped}개 건너뜀 (이미 본 게시글), '
+                    f'저장 생략 {rows_skipped}행 (변경 없음/중복)'
+                )
+                self.stdout.write(
+                    f'다운로드 {bytes_downloaded:,} bytes, 절약 {bytes_saved:,} bytes, '
+                    f'건너뛴 게시판 {sum(boards_skipped.values())}개 '
+                    f'(304 {boards_skipped["not_modified"]}개, 해시 일치 {boards_skipped["same_hash"]}개)'
+                )
             
             self.stdout.write(
                 self.style.SUCCESS(f'Successfully crawled {total_new_notices} new notices')
             )
-
-            # 크롤링된 데이터를 {"notices": ...} 구조로 JSON으로 내보내기
-            with open('crawled_data.json', 'w', encoding='utf-8') as f:
-                json.dump({"notices": all_notices}, f, ensure_ascii=False, indent=4)
-            
-            self.stdout.write(self.style.SUCCESS('Successfully crawled and exported data to JSON'))
+            self.stdout.write(
+                self.style.SUCCESS(f'Successfully exported {exported_count} notices to {options["output"]}')
+            )
         except Exception as e:
             self.stdout.write(
                 self.style.ERROR(f'Failed to crawl notices: {e}')
-            )
\ No newline at end of file
+            )
+    def crawl_with_celery(self, options):
+        """게시판마다 crawl_board_task를 보내고, chord가 합친 보고서를 출력"""
+        boards = self.select_boards(CrawlScheduler(), options)
+        # 메모리 브로커면 작업을 받을 워커가 없으므로 이 프로세스에서 바로 실행한다 (기다리면 끝나지 않는다)
+        eager = uses_local_broker() and not celery_app.conf.task_always_eager
+        if eager:
+            self.stdout.write(self.style.WARNING(
+                'CELERY_BROKER_URL이 메모리 브로커라서 워커 없이 이 프로세스에서 작업을 실행합니다.'
+            ))
+        self.stdout.write(f'Dispatching {len(boards)} board crawl tasks...')
+        result = dispatch_crawl(
+            boards, max_pages=options['max_pages'], force=options['force'], backend=options['backend'], eager=eager,
+        )
+        try:
+            report = result.get(timeout=options['deadline'] or getattr(settings, 'CRAWL_CELERY_TIMEOUT', 1800))
+        except Exception as e:
+            self.stdout.write(self.style.ERROR(f'Failed to crawl notices: {e}'))
+            return
+
+        for board in report['reports']:
+            if board['status'] == 'error':
+                self.stdout.write(self.style.ERROR(f"{board['board']} 크롤링 실패: {board['error']} (재시도 {board['retries']}회)"))
+            elif board['status'] == 'unchanged':
+                self.stdout.write(f"{board['board']}: 변경 없음, 건너뜀 ({board['reason']})")
+            else:
+                self.stdout.write(
+                    f"{board['board']}: {board['created']}개 새 공지사항 추가, {board['updated']}개 갱신 "
+                    f"({board['pages']}페이지)"
+                )
+        self.stdout.write(
+            f"게시판 {report['boards']}개, 목록 페이지 {report['pages']}개, 다운로드 {report['bytes']:,} bytes, "
+            f"건너뛴 게시판 {report['boards_unchanged']}개, 실패 {len(report['errors'])}개, 재시도 {report['retries']}회"
+        )
+        self.stdout.write(
+            self.style.SUCCESS(f"Successfully crawled {report['created']} new notices")
+        )
+
+    def select_boards(self, scheduler, options):
+        """크롤링할 활성 게시판 목록 (--due-only면 차례가 된 게시판만)"""
+        boards = list(NoticeBoard.objects.filter(is_active=True))
+        if options['due_only']:
+            due = scheduler.due_boards(boards)
+            self.stdout.write(f'크롤링할 차례인 게시판 {len(due)}개 / 전체 {len(boards)}개')
+            return due
+        return boards
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from notices.src.scheduler import CrawlScheduler
+import json
+
+
+class Command(BaseCommand):
+    help = '게시판별 글 올라오는 빈도, 크롤링 주기, 다음 크롤링 예정 시각을 보여준다'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--json', action='store_true', help='JSON으로 출력')
+
+    def handle(self, *args, **options):
+        schedules = CrawlScheduler().plan()
+        if options['json']:
+            self.stdout.write(json.dumps([schedule.as_dict() for schedule in schedules], ensure_ascii=False, indent=2))
+            return
+
+        for schedule in schedules:
+            if schedule.next_run_at is None:
+                next_run = '아직 크롤링하지 않음'
+            else:
+                next_run = timezone.localtime(schedule.next_run_at).strftime('%Y-%m-%d %H:%M')
+            self.stdout.write(
+                f'{schedule.board.name}: 하루 {schedule.rate_per_day:.2f}개, '
+                f'주기 {schedule.interval.total_seconds() / 60:.0f}분, 다음 {next_run}'
+                + (' (지금 차례)' if schedule.due else '')
+            )
+        due = sum(schedule.due for schedule in schedules)
+        # 모든 게시판을 가장 짧은 주기로 돌릴 때와 비교한 하루 요청 수
+        daily = sum(86400 / schedule.interval.total_seconds() for schedule in schedules)
+        fixed = len(schedules) * 86400 / CrawlScheduler().min_interval.total_seconds()
+        self.stdout.write(self.style.SUCCESS(
+            f'게시판 {len(schedules)}개 중 {due}개 차례, 하루 예상 크롤링 {daily:.0f}회 (고정 주기 {fixed:.0f}회)'
+        ))
@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+from notices.models import ImportJob
+from notices.src.import_jobs import drain_import_jobs, spool_dir
+import time
+
+
+class Command(BaseCommand):
+    help = '비동기 가져오기 대기열(ImportJob)을 처리한다 (IMPORT_WORKER=command일 때 웹 프로세스와 따로 실행)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='대기열을 한 번 비우고 끝낸다')
+        parser.add_argument('--interval', type=float, default=5.0, help='대기열이 비었을 때 다시 확인할 간격(초)')
+        parser.add_argument(
+            '--retry-failed', action='store_true', help='실패한 작업 중 spool 파일이 남은 작업을 다시 대기열에 넣는다'
+        )
+
+    def handle(self, *args, **options):
+        if options['retry_failed']:
+            retry = [
+                job.id for job in ImportJob.objects.filter(status=ImportJob.FAILED)
+                if (spool_dir() / job.spool_file).exists()
+            ]
+            ImportJob.objects.filter(id__in=retry).update(
+                status=ImportJob.QUEUED, started_at=None, finished_at=None, error='',
+            )
+            self.stdout.write(f'실패한 작업 {len(retry)}개를 다시 대기열에 넣음')
+
+        while True:
+            for job in drain_import_jobs():
+                info = job.as_dict()
+                line = (
+                    f"작업 #{job.id} {job.status}: {job.received}건 (생성 {job.created}, 갱신 {job.updated}), "
+                    f"{info['elapsed_seconds']}s, {info['rows_per_second']} rows/s"
+                )
+                if job.status == ImportJob.FAILED:
+                    self.stdout.write(self.style.ERROR(f'{line} - {job.error}'))
+                else:
+                    self.stdout.write(self.style.SUCCESS(line))
+            if options['once']:
+                return
+            time.sleep(options['interval'])
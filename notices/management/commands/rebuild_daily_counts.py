@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from notices.src.summary import rebuild_daily_counts
+
+
+class Command(BaseCommand):
+    help = '게시판별 일별 공지사항 개수 집계(NoticeDailyCount)를 Notice 테이블에서 다시 만든다'
+
+    def handle(self, *args, **options):
+        count = rebuild_daily_counts()
+        self.stdout.write(self.style.SUCCESS(f'Successfully rebuilt {count} daily count rows'))
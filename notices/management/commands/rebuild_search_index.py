@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand, CommandError
+from notices.src.search import rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = '공지사항 검색 색인(FTS5)을 Notice 테이블에서 다시 만든다'
+
+    def handle(self, *args, **options):
+        try:
+            count = rebuild_search_index()
+        except RuntimeError as e:
+            raise CommandError(str(e))
+        self.stdout.write(self.style.SUCCESS(f'Successfully indexed {count} notices'))
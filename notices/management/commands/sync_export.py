@@ -0,0 +1,57 @@
+from django.core.management.base import BaseCommand, CommandError
+from notices.src.sync import DeltaSyncClient
+import os
+import urllib3
+
+
+class Command(BaseCommand):
+    help = '크롤링 결과 파일에서 서버에 없거나 바뀐 공지사항만 골라 /api/v1/import-data/로 보낸다'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', nargs='?', default='crawled_data.ndjson', help='보낼 크롤링 결과 파일')
+        parser.add_argument('--url', default=os.getenv('RENDER_APP_URL'), help='서버 주소 (기본: RENDER_APP_URL)')
+        parser.add_argument('--token', default=os.getenv('CRAWL_AUTH_TOKEN'), help='인증 토큰 (기본: CRAWL_AUTH_TOKEN)')
+        parser.add_argument('--full', action='store_true', help='서버와 비교하지 않고 모두 보낸다')
+        parser.add_argument('--dry-run', action='store_true', help='보내지 않고 보낼 양만 계산한다')
+        parser.add_argument('--chunk-size', type=int, default=1000, help='한 번에 보낼 공지사항 수 (조각 크기)')
+        parser.add_argument('--no-gzip', action='store_true', help='압축하지 않고 보낸다')
+        parser.add_argument(
+            '--async', dest='async_import', action='store_true',
+            help='서버가 바로 응답하고 백그라운드에서 저장하게 한 뒤, 저장이 끝날 때까지 작업 상태를 확인한다',
+        )
+        parser.add_argument(
+            '--batch-id', help='업로드 id (기본: 보낼 내용의 해시, 같은 id로 다시 보내면 저장된 조각은 건너뛴다)'
+        )
+
+    def handle(self, *args, **options):
+        if not options['url'] or not options['token']:
+            raise CommandError('--url과 --token(또는 RENDER_APP_URL, CRAWL_AUTH_TOKEN 환경 변수)이 필요합니다.')
+        if not os.path.exists(options['path']):
+            raise CommandError(f"{options['path']} 파일이 없습니다.")
+
+        if options['chunk_size'] < 1:
+            raise CommandError('--chunk-size는 1 이상이어야 합니다.')
+        client = DeltaSyncClient(
+            options['url'], options['token'], chunk_size=options['chunk_size'], compress=not options['no_gzip'],
+            async_import=options['async_import'],
+        )
+        try:
+            result = client.sync(
+                options['path'], full=options['full'], dry_run=options['dry_run'], batch_id=options['batch_id'],
+            )
+        except (urllib3.exceptions.HTTPError, ValueError) as e:
+            raise CommandError(f'동기화 실패: {e}')
+
+        self.stdout.write(
+            f'{result.total}개 중 {result.sent}개 전송 대상 (변경 없음 {result.unchanged}개, 중복 {result.duplicates}개, '
+            f'서버에 없는 게시판 {result.skipped}개, {result.payload_bytes:,} bytes, 서버 목록 {result.manifest_entries}개)'
+        )
+        if result.response:
+            response = result.response
+            self.stdout.write(self.style.SUCCESS(
+                f"저장 완료 ({response['batch']}, 조각 {result.chunks}개 중 {result.chunks_resumed}개는 이미 저장됨, "
+                f"{result.upload_bytes:,} bytes 전송): 생성 {response['created']}, 갱신 {response['updated']}, "
+                f"변경 없음 {response['unchanged']}, 건너뜀 {response['skipped']}"
+            ))
+        elif not result.sent:
+            self.stdout.write(self.style.SUCCESS('바뀐 공지사항이 없어 보내지 않았습니다.'))
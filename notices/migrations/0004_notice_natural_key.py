@@ -0,0 +1,54 @@
+import hashlib
+import re
+
+from django.db import migrations, models
+
+ARTICLE_ID_PATTERN = re.compile(r'/(\d+)/artclView\.do')
+
+
+def natural_key(url, title):
+    match = ARTICLE_ID_PATTERN.search(url or '')
+    if match:
+        return match.group(1)
+    return 'sha1:' + hashlib.sha1((url or title or '').encode('utf-8')).hexdigest()
+
+
+def populate_natural_key(apps, schema_editor):
+    """기존 공지사항에 고유 키를 채우고, 같은 키가 겹치면 가장 최근 행만 남긴다."""
+    Notice = apps.get_model('notices', 'Notice')
+    seen = {}
+    duplicates = []
+    for notice in Notice.objects.order_by('-id').only('id', 'board_id', 'url', 'title').iterator():
+        key = (notice.board_id, natural_key(notice.url, notice.title))
+        if key in seen:
+            duplicates.append(notice.id)
+            continue
+        seen[key] = notice.id
+        Notice.objects.filter(id=notice.id).update(natural_key=key[1])
+    if duplicates:
+        Notice.objects.filter(id__in=duplicates).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notices', '0003_alter_notice_options_alter_noticeboard_options_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notice',
+            name='natural_key',
+            field=models.CharField(max_length=64, null=True),
+        ),
+        migrations.RunPython(populate_natural_key, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='notice',
+            name='natural_key',
+            field=models.CharField(max_length=64),
+        ),
+        migrations.AddConstraint(
+            model_name='notice',
+            constraint=models.UniqueConstraint(fields=('board', 'natural_key'), name='unique_notice_natural_key'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:48
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notices', '0004_notice_natural_key'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='notice',
+            name='crawled_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+    ]
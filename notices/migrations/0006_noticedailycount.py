@@ -0,0 +1,51 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:49
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def populate_daily_counts(apps, schema_editor):
+    Notice = apps.get_model('notices', 'Notice')
+    NoticeDailyCount = apps.get_model('notices', 'NoticeDailyCount')
+    rows = (
+        Notice.objects.order_by()
+        .values('board_id', 'published_date', 'is_important')
+        .annotate(total=Count('id'))
+    )
+    NoticeDailyCount.objects.bulk_create(
+        [
+            NoticeDailyCount(
+                board_id=row['board_id'],
+                published_date=row['published_date'],
+                is_important=row['is_important'],
+                count=row['total'],
+            )
+            for row in rows
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notices', '0005_notice_crawled_at_default'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NoticeDailyCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('published_date', models.DateField()),
+                ('is_important', models.BooleanField(default=False)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('board', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_counts', to='notices.noticeboard')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('board', 'published_date', 'is_important'), name='unique_notice_daily_count')],
+            },
+        ),
+        migrations.RunPython(populate_daily_counts, migrations.RunPython.noop),
+    ]
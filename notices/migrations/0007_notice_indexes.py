@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notices', '0006_noticedailycount'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='notice',
+            index=models.Index(fields=['board', 'published_date', 'is_important', 'display_order'], name='notice_board_date_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notice',
+            index=models.Index(fields=['is_important', 'published_date', 'board'], name='notice_important_date_idx'),
+        ),
+    ]
@@ -0,0 +1,73 @@
+from django.db import migrations
+
+FTS_TABLE = 'notices_notice_fts'
+
+# trigram 토크나이저는 공백이 없는 한국어 제목도 3글자 단위로 색인하므로 부분 일치 검색이 된다
+CREATE_SQL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE}
+    USING fts5(title, author, board_name, tokenize='trigram')
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS notices_notice_fts_insert AFTER INSERT ON notices_notice BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, author, board_name)
+        VALUES (new.id, new.title, new.author,
+                (SELECT name FROM notices_noticeboard WHERE id = new.board_id));
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS notices_notice_fts_update
+    AFTER UPDATE OF title, author, board_id ON notices_notice BEGIN
+        DELETE FROM {FTS_TABLE} WHERE rowid = old.id;
+        INSERT INTO {FTS_TABLE}(rowid, title, author, board_name)
+        VALUES (new.id, new.title, new.author,
+                (SELECT name FROM notices_noticeboard WHERE id = new.board_id));
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS notices_notice_fts_delete AFTER DELETE ON notices_notice BEGIN
+        DELETE FROM {FTS_TABLE} WHERE rowid = old.id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS notices_noticeboard_fts_rename
+    AFTER UPDATE OF name ON notices_noticeboard BEGIN
+        UPDATE {FTS_TABLE} SET board_name = new.name
+        WHERE rowid IN (SELECT id FROM notices_notice WHERE board_id = new.id);
+    END
+    """,
+    f"""
+    INSERT INTO {FTS_TABLE}(rowid, title, author, board_name)
+    SELECT n.id, n.title, n.author, b.name
+    FROM notices_notice n JOIN notices_noticeboard b ON b.id = n.board_id
+    """,
+]
+
+DROP_SQL = [
+    'DROP TRIGGER IF EXISTS notices_noticeboard_fts_rename',
+    'DROP TRIGGER IF EXISTS notices_notice_fts_delete',
+    'DROP TRIGGER IF EXISTS notices_notice_fts_update',
+    'DROP TRIGGER IF EXISTS notices_notice_fts_insert',
+    f'DROP TABLE IF EXISTS {FTS_TABLE}',
+]
+
+
+def run_sql(statements):
+    def operation(apps, schema_editor):
+        # FTS5는 SQLite 전용이라 다른 DB에서는 건너뛰고, 검색은 LIKE로 동작한다
+        if schema_editor.connection.vendor != 'sqlite':
+            return
+        for statement in statements:
+            schema_editor.execute(statement)
+    return operation
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notices', '0007_notice_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(run_sql(CREATE_SQL), run_sql(DROP_SQL)),
+    ]
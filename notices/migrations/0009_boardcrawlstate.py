@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:06
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notices', '0008_notice_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BoardCrawlState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('max_article_id', models.BigIntegerField(default=0)),
+                ('last_crawled_at', models.DateTimeField(blank=True, null=True)),
+                ('board', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='crawl_state', to='notices.noticeboard')),
+            ],
+        ),
+    ]
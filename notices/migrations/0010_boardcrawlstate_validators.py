@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notices', '0009_boardcrawlstate'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='boardcrawlstate',
+            name='content_hash',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='boardcrawlstate',
+            name='content_length',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='boardcrawlstate',
+            name='etag',
+            field=models.CharField(blank=True, default='', max_length=200),
+        ),
+        migrations.AddField(
+            model_name='boardcrawlstate',
+            name='last_modified',
+            field=models.CharField(blank=True, default='', max_length=100),
+        ),
+    ]
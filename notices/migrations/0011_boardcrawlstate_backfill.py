@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notices', '0010_boardcrawlstate_validators'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='boardcrawlstate',
+            name='backfill_complete',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='boardcrawlstate',
+            name='backfill_page',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='boardcrawlstate',
+            name='backfill_updated_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
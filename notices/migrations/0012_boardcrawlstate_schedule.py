@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notices', '0011_boardcrawlstate_backfill'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='boardcrawlstate',
+            name='crawl_interval',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='boardcrawlstate',
+            name='next_crawl_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,52 @@
+import hashlib
+import json
+
+from django.db import migrations, models
+
+CONTENT_HASH_FIELDS = ('title', 'url', 'published_date', 'display_order', 'author', 'view_count', 'is_important')
+
+
+def content_hash(values):
+    text = json.dumps(list(values), ensure_ascii=False, default=str, separators=(',', ':'))
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()[:16]
+
+
+def populate_content_hash(apps, schema_editor):
+    """기존 공지사항의 내용 해시를 채운다."""
+    Notice = apps.get_model('notices', 'Notice')
+    batch = []
+    for notice in Notice.objects.only('id', *CONTENT_HASH_FIELDS).iterator(chunk_size=2000):
+        notice.content_hash = content_hash(getattr(notice, field) for field in CONTENT_HASH_FIELDS)
+        batch.append(notice)
+        if len(batch) >= 2000:
+            Notice.objects.bulk_update(batch, ['content_hash'])
+            batch = []
+    if batch:
+        Notice.objects.bulk_update(batch, ['content_hash'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notices', '0012_boardcrawlstate_schedule'),
+    ]
+
+    operations = [
+        # SQLite에서 AddField는 테이블을 새로 만들면서 검색 색인(0008) 트리거를 잃으므로 컬럼만 추가한다
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunSQL(
+                    "ALTER TABLE notices_notice ADD COLUMN content_hash varchar(16) NOT NULL DEFAULT ''",
+                    "ALTER TABLE notices_notice DROP COLUMN content_hash",
+                ),
+            ],
+            state_operations=[
+                migrations.AddField(
+                    model_name='notice',
+                    name='content_hash',
+                    field=models.CharField(blank=True, default='', max_length=16),
+                ),
+            ],
+        ),
+        migrations.RunPython(populate_content_hash, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:34
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notices', '0014_importchunk'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('queued', '대기'), ('running', '저장 중'), ('done', '완료'), ('failed', '실패')], default='queued', max_length=10)),
+                ('spool_file', models.CharField(max_length=100)),
+                ('content_type', models.CharField(max_length=100)),
+                ('content_encoding', models.CharField(blank=True, default='', max_length=20)),
+                ('size', models.PositiveBigIntegerField(default=0)),
+                ('batch_id', models.CharField(blank=True, default='', max_length=64)),
+                ('sequence', models.PositiveIntegerField(blank=True, null=True)),
+                ('received', models.PositiveIntegerField(default=0)),
+                ('created', models.PositiveIntegerField(default=0)),
+                ('updated', models.PositiveIntegerField(default=0)),
+                ('unchanged', models.PositiveIntegerField(default=0)),
+                ('skipped', models.PositiveIntegerField(default=0)),
+                ('error', models.TextField(blank=True, default='')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['status', 'id'], name='import_job_status_idx'), models.Index(fields=['batch_id', 'sequence'], name='import_job_chunk_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,37 @@
+import hashlib
+import json
+
+from django.db import migrations
+
+# 목록 위치(display_order)와 조회수(view_count)를 뺀 내용 해시 필드 (notices.models.CONTENT_HASH_FIELDS)
+CONTENT_HASH_FIELDS = ('title', 'url', 'published_date', 'author', 'is_important')
+
+
+def content_hash(values):
+    text = json.dumps(list(values), ensure_ascii=False, default=str, separators=(',', ':'))
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()[:16]
+
+
+def recompute_content_hash(apps, schema_editor):
+    """저장된 공지사항의 내용 해시를 새 필드 목록으로 다시 계산한다."""
+    Notice = apps.get_model('notices', 'Notice')
+    batch = []
+    for notice in Notice.objects.only('id', *CONTENT_HASH_FIELDS).iterator(chunk_size=2000):
+        notice.content_hash = content_hash(getattr(notice, field) for field in CONTENT_HASH_FIELDS)
+        batch.append(notice)
+        if len(batch) >= 2000:
+            Notice.objects.bulk_update(batch, ['content_hash'])
+            batch = []
+    if batch:
+        Notice.objects.bulk_update(batch, ['content_hash'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notices', '0015_importjob'),
+    ]
+
+    operations = [
+        migrations.RunPython(recompute_content_hash, migrations.RunPython.noop),
+    ]
@@ -1,5 +1,38 @@
 from django.db import models
 from django.utils import timezone
+import hashlib
+import json
+import re
+
+ARTICLE_ID_PATTERN = re.compile(r'/(\d+)/artclView\.do')
+
+def notice_natural_key(url, title=None):
+    """
+    공지사항의 고유 키
+    artclView.do URL에 들어 있는 게시글 번호를 쓰고, 없으면 URL(또는 제목)의 해시를 쓴다.
+    예: '/bbs/KNU/2132/412197/artclView.do' -> '412197'
+    """
+    match = ARTICLE_ID_PATTERN.search(url or '')
+    if match:
+        return match.group(1)
+    return 'sha1:' + hashlib.sha1((url or title or '').encode('utf-8')).hexdigest()
+
+def notice_article_id(url):
+    """artclView.do URL의 게시글 번호 (정수, 없으면 None)"""
+    match = ARTICLE_ID_PATTERN.search(url or '')
+    return int(match.group(1)) if match else None
+
+# 내용 해시에 들어가는 필드 (하나라도 바뀌면 동기화할 때 다시 보낸다)
+# 목록 위치(display_order)와 조회수(view_count)는 크롤링할 때마다 바뀌므로 넣지 않는다.
+CONTENT_HASH_FIELDS = ('title', 'url', 'published_date', 'author', 'is_important')
+
+def notice_content_hash(values):
+    """
+    CONTENT_HASH_FIELDS 순서의 값으로 만든 짧은 내용 해시 (16자리 hex)
+    크롤러와 서버가 같은 값을 계산해서, 동기화할 때 바뀐 공지사항만 골라 보낸다.
+    """
+    text = json.dumps(list(values), ensure_ascii=False, default=str, separators=(',', ':'))
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()[:16]
 
 # Create your models here.
 class NoticeCategory(models.Model):
@@ -27,13 +60,175 @@ class Notice(models.Model):
     url = models.URLField()
     published_date = models.DateField()
     display_order = models.IntegerField(default=0)
-    crawled_at = models.DateTimeField(auto_now_add=True)
+    crawled_at = models.DateTimeField(default=timezone.now)
     author = models.CharField(max_length=100, blank=True, null=True)
     view_count = models.IntegerField(default=0)
     is_important = models.BooleanField(default=False)    
+    natural_key = models.CharField(max_length=64)
+    content_hash = models.CharField(max_length=16, blank=True, default='')
 
     class Meta:
         ordering = ['display_order']
+        constraints = [
+            models.UniqueConstraint(fields=['board', 'natural_key'], name='unique_notice_natural_key'),
+        ]
+        indexes = [
+            # 게시판 미리보기/목록: board, 날짜, 중요 여부로 거르고 display_order 순으로 정렬
+            models.Index(
+                fields=['board', 'published_date', 'is_important', 'display_order'],
+                name='notice_board_date_order_idx',
+            ),
+            # 날짜(기간)별 게시판 개수 GROUP BY (집계 테이블이 없을 때)
+            models.Index(
+                fields=['is_important', 'published_date', 'board'],
+                name='notice_important_date_idx',
+            ),
+        ]
+
+    def save(self, *args, **kwargs):
+        if not self.natural_key:
+            self.natural_key = notice_natural_key(self.url, self.title)
+        self.content_hash = notice_content_hash(getattr(self, field) for field in CONTENT_HASH_FIELDS)
+        super().save(*args, **kwargs)
+
+    def __str__(self):
+        return self.title
+
+class NoticeDailyCount(models.Model):
+    """게시판별 날짜별 공지사항 개수 (notice-counts API용 집계 테이블)"""
+    board = models.ForeignKey(NoticeBoard, on_delete=models.CASCADE, related_name="daily_counts")
+    published_date = models.DateField()
+    is_important = models.BooleanField(default=False)
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['board', 'published_date', 'is_important'], name='unique_notice_daily_count'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.board} {self.published_date} ({self.count})"
+
+class BoardCrawlState(models.Model):
+    """
+    게시판별 크롤링 상태 (증분 크롤링용)
+    max_article_id보다 큰 게시글 번호만 새 글로 보고, 이미 본 번호가 나오면 다음 페이지를 읽지 않는다.
+    첫 페이지의 ETag/Last-Modified로 조건부 요청을 보내고, 304이거나 tbody 해시가 같으면 파싱과 저장을 건너뛴다.
+    """
+    board = models.OneToOneField(NoticeBoard, on_delete=models.CASCADE, related_name="crawl_state")
+    max_article_id = models.BigIntegerField(default=0)
+    last_crawled_at = models.DateTimeField(blank=True, null=True)
+    etag = models.CharField(max_length=200, blank=True, default='')
+    last_modified = models.CharField(max_length=100, blank=True, default='')
+    content_hash = models.CharField(max_length=64, blank=True, default='')
+    # 마지막으로 내려받은 첫 페이지 크기 (304일 때 아낀 bytes 계산용)
+    content_length = models.PositiveIntegerField(default=0)
+    # 과거 글 채우기(backfill) 진행 상황: 여기까지의 목록 페이지는 모두 저장됨 (중단 후 다음 페이지부터 이어서)
+    backfill_page = models.PositiveIntegerField(default=0)
+    backfill_complete = models.BooleanField(default=False)  # 마지막 페이지까지 읽었는지
+    backfill_updated_at = models.DateTimeField(blank=True, null=True)
+    # 게시판별 크롤링 주기 (notices.src.scheduler.CrawlScheduler가 글 올라오는 빈도로 정한다)
+    crawl_interval = models.PositiveIntegerField(default=0)     # 초, 0이면 아직 정하지 않음
+    next_crawl_at = models.DateTimeField(blank=True, null=True)
+
+    def __str__(self):
+        return f"{self.board} (#{self.max_article_id})"
+
+class ImportChunk(models.Model):
+    """
+    나눠 보낸 가져오기(/api/v1/import-data/?batch=..&chunk=..)에서 저장을 마친 조각
+    조각 하나는 한 트랜잭션으로 저장되고 이 행도 같이 생기므로, 같은 조각을 다시 받으면 저장하지 않고 건너뛴다.
+    """
+    batch_id = models.CharField(max_length=64)
+    sequence = models.PositiveIntegerField()
+    received = models.PositiveIntegerField(default=0)
+    created = models.PositiveIntegerField(default=0)
+    updated = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['batch_id', 'sequence'], name='unique_import_chunk'),
+        ]
+        indexes = [
+            models.Index(fields=['created_at'], name='import_chunk_created_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.batch_id}#{self.sequence}"
+
+class ImportJob(models.Model):
+    """
+    비동기 가져오기 작업
+    요청 본문을 spool 디렉터리(IMPORT_SPOOL_DIR)에 그대로 저장해 두고 바로 202로 응답하면,
+    worker(notices.src.import_jobs)가 차례로 꺼내서 저장하고 진행 상황을 여기에 기록한다.
+    """
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = [(QUEUED, '대기'), (RUNNING, '저장 중'), (DONE, '완료'), (FAILED, '실패')]
+    ACTIVE_STATUSES = (QUEUED, RUNNING)
+
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=QUEUED)
+    spool_file = models.CharField(max_length=100)
+    content_type = models.CharField(max_length=100)
+    content_encoding = models.CharField(max_length=20, blank=True, default='')
+    size = models.PositiveBigIntegerField(default=0)   # spool 파일 크기 (bytes, 압축된 그대로)
+    # 나눠 보내기 조각이면 (batch_id, sequence)
+    batch_id = models.CharField(max_length=64, blank=True, default='')
+    sequence = models.PositiveIntegerField(blank=True, null=True)
+    received = models.PositiveIntegerField(default=0)
+    created = models.PositiveIntegerField(default=0)
+    updated = models.PositiveIntegerField(default=0)
+    unchanged = models.PositiveIntegerField(default=0)
+    skipped = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(default=timezone.now)
+    started_at = models.DateTimeField(blank=True, null=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+    # worker가 살아 있다는 표시 (작업을 잡을 때와 배치를 저장할 때마다 갱신)
+    heartbeat_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'id'], name='import_job_status_idx'),
+            models.Index(fields=['batch_id', 'sequence'], name='import_job_chunk_idx'),
+        ]
+
+    def as_dict(self):
+        end = self.finished_at or timezone.now()
+        elapsed = (end - self.started_at).total_seconds() if self.started_at else None
+        return {
+            'job_id': self.id,
+            'status': self.status,
+            'bytes': self.size,
+            'batch': self.batch_id or None,
+            'chunk': self.sequence,
+            'received': self.received,
+            'created': self.created,
+            'updated': self.updated,
+            'unchanged': self.unchanged,
+            'skipped': self.skipped,
+            'error': self.error or None,
+            'created_at': self.created_at.isoformat(),
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+            'elapsed_seconds': round(elapsed, 3) if elapsed is not None else None,
+            'rows_per_second': round(self.received / elapsed, 1) if elapsed else None,
+        }
+
+    def __str__(self):
+        return f"ImportJob #{self.id} ({self.status})"
+
+class DataVersion(models.Model):
+    """
+    API 응답 캐시의 데이터 버전 (행 하나, pk=1)
+    크롤링/가져오기로 데이터가 바뀔 때마다 올리고, 웹 프로세스와 worker/명령 프로세스가 모두 DB에서 같은 값을 본다.
+    """
+    version = models.BigIntegerField(default=0)    # 밀리초 타임스탬프
 
     def __str__(self):
-        return self.title
\ No newline at end of file
+        return f"DataVersion {self.version}"
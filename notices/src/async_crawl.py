@@ -0,0 +1,160 @@
+from notices.src.crawler import BoardPages, crawl_board_pages
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+import asyncio
+import logging
+import queue
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+_DONE = object()
+
+
+class BoardCrawlResult:
+    """게시판 하나의 크롤링 결과 (pages: crawl_board_pages가 돌려준 BoardPages)"""
+
+    def __init__(self, board_name, board_url, notices=None, backend=None, elapsed=0.0, error=None, pages=None):
+        self.board_name = board_name
+        self.board_url = board_url
+        self.notices = notices or []
+        self.backend = backend
+        self.elapsed = elapsed
+        self.error = error
+        self.crawl = pages or BoardPages()
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    @property
+    def pages(self):
+        """읽은 목록 페이지 수"""
+        return self.crawl.pages
+
+    @property
+    def reached_known(self):
+        """이미 본 게시글에 닿아서 페이지 넘기기를 멈췄는지"""
+        return self.crawl.reached_known
+
+    @property
+    def unchanged(self):
+        """첫 페이지가 바뀌지 않아서 파싱/저장을 건너뛰었으면 그 이유 ('not_modified', 'same_hash')"""
+        return self.crawl.unchanged
+
+    @property
+    def max_article_id(self):
+        return self.crawl.max_article_id
+
+
+async def crawl_boards(boards, fetcher, concurrency=4, request_timeout=30.0, deadline=None,
+                       max_pages=1, states=None):
+    """
+    여러 게시판을 동시에 크롤링하는 비동기 제너레이터
+    - boards: (게시판 이름, URL) 목록
+    - concurrency: 호스트별 동시 요청 수 (제한 시간을 넘겨 아직 도는 요청도 센다)
+    - request_timeout: 게시판 하나를 가져와서 파싱하는 데 허용하는 시간 (초)
+    - deadline: 전체 크롤링에 허용하는 시간 (초), 넘으면 남은 게시판은 실패로 처리
+      제한 시간을 넘긴 요청은 기다리지 않고 결과를 버린다. 스레드는 fetcher의 소켓/드라이버 제한 시간이 지나면
+      스스로 끝나므로 fetcher도 같은 제한 시간으로 만든다 (create_fetcher의 timeout 참고).
+    - max_pages, states: 게시판별 크롤링 상태({이름: BoardCrawlState})가 있으면 이미 본 게시글 번호에 닿을 때까지
+      최대 max_pages페이지를 읽고, 첫 페이지는 조건부 요청과 tbody 해시로 바뀌었는지 확인한다 (crawl_board_pages 참고)
+    끝나는 순서대로 BoardCrawlResult를 내보낸다.
+    """
+    slots = {}
+    states = states or {}
+    loop = asyncio.get_running_loop()
+    # 게시판마다 스레드 하나 (제한 시간을 넘겨 아직 도는 스레드 때문에 다른 게시판이 기다리지 않게)
+    executor = ThreadPoolExecutor(max_workers=max(len(boards), 1), thread_name_prefix='crawl-board')
+
+    def crawl_in_slot(slot, board_name, board_url, state):
+        """호스트 슬롯을 잡은 채로 게시판 하나를 크롤링하고, 스레드가 실제로 끝날 때 슬롯을 놓는다"""
+        try:
+            return crawl_board_pages(
+                fetcher,
+                board_name,
+                board_url,
+                high_water_mark=state.max_article_id if state else 0,
+                max_pages=max_pages,
+                validators={'etag': state.etag, 'last_modified': state.last_modified} if state else None,
+                content_hash=state.content_hash if state else None,
+            )
+        finally:
+            slot.release()
+
+    async def crawl_one(board_name, board_url):
+        host = urlsplit(board_url).netloc
+        # 호스트별 동시 요청 수는 스레드 기준으로 센다: 제한 시간을 넘겨 결과를 버린 요청도
+        # 스레드가 끝날 때까지 슬롯을 차지하므로, 느린 호스트에 concurrency개보다 많이 보내지 않는다
+        slot = slots.setdefault(host, threading.BoundedSemaphore(concurrency))
+        await loop.run_in_executor(executor, slot.acquire)
+        started = time.perf_counter()
+        try:
+            future = executor.submit(crawl_in_slot, slot, board_name, board_url, states.get(board_name))
+            # 시작하기 전에 취소되면 crawl_in_slot이 돌지 않으므로 여기서 슬롯을 놓는다
+            future.add_done_callback(lambda f: slot.release() if f.cancelled() else None)
+            pages = await asyncio.wait_for(asyncio.wrap_future(future), timeout=request_timeout)
+            return BoardCrawlResult(board_name, board_url, pages.rows, pages.backend,
+                                    time.perf_counter() - started, pages=pages)
+        except asyncio.TimeoutError:
+            return BoardCrawlResult(board_name, board_url, elapsed=time.perf_counter() - started,
+                                    error=f"{request_timeout}초 안에 응답이 없습니다.")
+        except Exception as e:
+            logger.error(f"Error crawling board {board_url}: {e}")
+            return BoardCrawlResult(board_name, board_url, elapsed=time.perf_counter() - started,
+                                    error=str(e))
+
+    tasks = {asyncio.ensure_future(crawl_one(name, url)): name for name, url in boards}
+    pending = set(tasks)
+    started = time.perf_counter()
+    try:
+        while pending:
+            remaining = None if deadline is None else deadline - (time.perf_counter() - started)
+            if remaining is not None and remaining <= 0:
+                break
+            done, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                yield task.result()
+    finally:
+        for task in pending:
+            task.cancel()
+        # 아직 도는 요청을 기다리지 않는다 (asyncio.run도 기본 executor가 아니므로 기다리지 않음)
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    # 전체 제한 시간을 넘긴 게시판
+    for task in pending:
+        board_name = tasks[task]
+        board_url = dict(boards)[board_name]
+        yield BoardCrawlResult(board_name, board_url, elapsed=time.perf_counter() - started,
+                               error=f"전체 제한 시간({deadline}초) 초과")
+
+
+def stream_crawl(boards, fetcher, **kwargs):
+    """
+    crawl_boards를 별도 스레드의 이벤트 루프에서 돌리고 결과를 끝나는 순서대로 넘겨주는 동기 제너레이터
+    DB 저장은 호출한 스레드에서 하므로 Django ORM을 그대로 쓸 수 있다.
+    마지막 결과를 넘기면 바로 끝난다 (제한 시간을 넘긴 요청이나 이벤트 루프 정리를 기다리지 않음).
+    """
+    results = queue.Queue()
+
+    async def run():
+        async for result in crawl_boards(boards, fetcher, **kwargs):
+            results.put(result)
+        results.put(_DONE)
+
+    def worker():
+        try:
+            asyncio.run(run())
+        except Exception as e:
+            results.put(e)
+            results.put(_DONE)
+
+    threading.Thread(target=worker, name='crawl-orchestrator', daemon=True).start()
+    while True:
+        item = results.get()
+        if item is _DONE:
+            break
+        if isinstance(item, Exception):
+            raise item
+        yield item
@@ -0,0 +1,144 @@
+from concurrent.futures import ThreadPoolExecutor
+from django.utils import timezone
+from notices.models import BoardCrawlState, notice_article_id
+from notices.src.crawler import board_page_url
+from notices.src.ingest import IngestResult
+from notices.src.parsers import get_parser, parse_board_page
+from notices.src.pipeline import normalize_notice, page_display_order
+from notices.src.tasks import save_board_notices
+from datetime import date
+import logging
+
+logger = logging.getLogger(__name__)
+
+class BackfillProgress:
+    """게시판 하나의 backfill 결과"""
+
+    def __init__(self, board_name, start_page):
+        self.board_name = board_name
+        self.start_page = start_page
+        self.last_page = start_page - 1     # 이번 실행에서 마지막으로 처리한 페이지
+        self.pages = 0
+        self.rows = 0
+        self.saved = IngestResult()
+        # 'end': 마지막 페이지(빈 목록)까지 읽음, 'until': 기준 날짜보다 오래된 글에 닿음,
+        # 'max_pages': 페이지 한도, 'error': 요청/파싱 실패, 'done': 이미 끝난 게시판
+        self.stop_reason = None
+        self.error = None
+
+    @property
+    def complete(self):
+        return self.stop_reason in ('end', 'done')
+
+
+def page_notices(rows, page, until=None):
+    """
+    목록 한 페이지의 행을 저장할 형태로 정리해서 (저장할 행, 멈출 이유 또는 None) 반환
+    고정글은 모든 페이지에 다시 나오므로 1페이지의 것만 남긴다.
+    """
+    regular = [row for row in rows if not row.get('is_important')]
+    if not regular:
+        return [], 'end'
+    notices = []
+    reached_until = False
+    for position, row in enumerate(rows):
+        if page > 1 and row.get('is_important'):
+            continue
+        notice = normalize_notice(row, page_display_order(page, position))
+        if until and not notice['is_important']:
+            try:
+                if date.fromisoformat(notice['date']) < until:
+                    reached_until = True
+                    continue
+            except (TypeError, ValueError):
+                pass
+        notices.append(notice)
+    return notices, 'until' if reached_until else None
+
+
+def backfill_board(board, fetcher, until=None, max_pages=100, workers=4, window=None,
+                   parse_executor=None, parser=None, restart=False, on_progress=None):
+    """
+    게시판 목록을 페이지를 넘겨 가며 읽어서 과거 글을 채운다.
+    - until(date)보다 오래된 글이 나오거나, max_pages번째 페이지까지 읽거나, 빈 페이지가 나오면 멈춘다.
+    - window개 페이지를 workers개 스레드로 동시에 요청하고, parse_executor(ProcessPoolExecutor)가 있으면
+      파싱은 그쪽 프로세스에서 한다. 페이지 순서대로 모아 한 번에 bulk upsert 한 뒤 진행 상황을 저장한다.
+    - 중단되면 다음 실행은 BoardCrawlState.backfill_page 다음 페이지부터 이어서 읽는다 (restart면 처음부터).
+      그 사이 새 글이 올라오면 글이 뒤 페이지로 밀려서 일부를 다시 읽을 뿐 빠뜨리지는 않는다.
+    """
+    state, _ = BoardCrawlState.objects.get_or_create(board=board)
+    if restart:
+        state.backfill_page = 0
+        state.backfill_complete = False
+    progress = BackfillProgress(board.name, state.backfill_page + 1)
+    if state.backfill_complete:
+        progress.stop_reason = 'done'
+        return progress
+
+    # 프로세스 풀에는 'auto'가 아닌 실제 파서 이름을 넘긴다
+    parser_name = get_parser(parser).name
+    window = window or workers * 2
+
+    def parse(html):
+        if parse_executor is None:
+            return parse_board_page(html, board.name, parser_name)
+        return parse_executor.submit(parse_board_page, html, board.name, parser_name).result()
+
+    def fetch(page):
+        _, rows = fetcher.fetch_rows(board_page_url(board.url, page), parse, key=board.name)
+        return rows or []
+
+    next_page = progress.start_page
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='backfill') as pool:
+        while progress.stop_reason is None:
+            if next_page > max_pages:
+                progress.stop_reason = 'max_pages'
+                break
+            futures = [
+                (page, pool.submit(fetch, page))
+                for page in range(next_page, min(next_page + window, max_pages + 1))
+            ]
+            notices = []
+            saved_page = progress.last_page
+            for page, future in futures:
+                try:
+                    rows = future.result()
+                except Exception as e:
+                    progress.stop_reason = 'error'
+                    progress.error = f'{page}페이지: {e}'
+                    logger.error(f"{board.name} backfill 실패: {progress.error}")
+                    break
+                progress.pages += 1
+                progress.last_page = page
+                kept, stop = page_notices(rows, page, until)
+                notices.extend(kept)
+                if stop:
+                    progress.stop_reason = stop
+                    break
+                saved_page = page
+            # 처리하지 않을 페이지 요청은 취소 (이미 시작된 요청은 끝날 때까지 기다린다)
+            for _, future in futures:
+                future.cancel()
+
+            if notices:
+                progress.saved += save_board_notices(board, notices)
+                progress.rows += len(notices)
+            if progress.stop_reason == 'end':
+                saved_page = progress.last_page
+            # until에서 멈춘 페이지는 일부만 저장했으므로 다음 실행(더 이른 until)에서 다시 읽게 한다
+            record_backfill_progress(state, saved_page, progress.stop_reason == 'end', notices)
+            next_page = progress.last_page + 1
+            if on_progress:
+                on_progress(progress)
+    return progress
+
+
+def record_backfill_progress(state, page, complete, notices):
+    """저장이 끝난 페이지까지 backfill 진행 상황 기록 (증분 크롤링 기준 번호도 함께 올린다)"""
+    state.backfill_page = page
+    state.backfill_complete = complete
+    state.backfill_updated_at = timezone.now()
+    state.max_article_id = max(
+        [state.max_article_id] + [notice_article_id(notice.get('url')) or 0 for notice in notices]
+    )
+    state.save(update_fields=['backfill_page', 'backfill_complete', 'backfill_updated_at', 'max_article_id'])
@@ -0,0 +1,323 @@
+from django.db import connection, connections, transaction
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from notices.models import Notice, NoticeBoard
+from notices.src.import_views import ImportDataView
+from notices.src.response_cache import bump_data_version
+from notices.src.summary import rebuild_daily_counts
+from notices.src.tasks import crawl_board_notices, setup_initial_data
+from notices import views
+from datetime import date, datetime, timedelta
+from unittest import mock
+import django
+import json
+import logging
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import time
+import tracemalloc
+
+logger = logging.getLogger(__name__)
+
+# 결과 파일 형식이 바뀌면 올린다 (다른 형식의 기준 결과와는 비교하지 않음)
+RESULT_FORMAT_VERSION = 1
+
+BENCHMARK_TOKEN = 'benchmark-token'
+
+TITLE_WORDS = [
+    '장학금', '신청', '안내', '수강신청', '학사일정', '졸업', '등록금', '납부', '기숙사', '입사',
+    '채용', '공고', '특강', '취업', '프로그램', '모집', '교환학생', '설명회', '도서관', '이용',
+    '변경', '휴학', '복학', '성적', '공개', '현장실습', '참가자', '봉사활동', '결과', '발표',
+]
+
+AUTHORS = ['학생복지과', '학사관리과', '취업지원과', '국제교류원', '생활관', '도서관', '총학생회']
+
+# 최근 날짜일수록 글이 많도록 (평균 60일 전) 지수 분포로 게시일을 뽑고, 최대 2년 전까지만
+MEAN_AGE_DAYS = 60
+MAX_AGE_DAYS = 730
+END_DATE = date(2025, 7, 31)
+
+
+class RollbackBenchmark(Exception):
+    """벤치마크에서 만든 데이터를 되돌리기 위한 예외"""
+
+
+def board_weights(board_names):
+    """
+    게시판별 글 비중 (Zipf 분포)
+    urls.json의 앞쪽 게시판(학생소식, 행정소식 등)일수록 글이 많다.
+    """
+    weights = [1 / (rank + 1) for rank in range(len(board_names))]
+    total = sum(weights)
+    return {name: weight / total for name, weight in zip(board_names, weights)}
+
+
+def generate_notice_rows(board_names, rows, seed=0, end_date=END_DATE, start_id=1_000_000):
+    """
+    crawled_data.json과 같은 형식의 합성 공지사항을 rows개 생성 (같은 seed면 항상 같은 결과)
+    게시판은 Zipf 분포, 게시일은 end_date에 가까울수록 많도록 치우치게 뽑는다.
+    """
+    rng = random.Random(seed)
+    weights = board_weights(board_names)
+    names = list(weights)
+    probabilities = list(weights.values())
+    crawled_at = datetime.combine(end_date, datetime.min.time()).isoformat()
+    positions = {name: 0 for name in names}
+    for i in range(rows):
+        board_name = rng.choices(names, weights=probabilities)[0]
+        age = min(int(rng.expovariate(1 / MEAN_AGE_DAYS)), MAX_AGE_DAYS)
+        position = positions[board_name] % 15
+        positions[board_name] += 1
+        article_id = start_id + i
+        yield {
+            'title': f"{' '.join(rng.sample(TITLE_WORDS, 3))} ({article_id})",
+            'url': f'/bbs/KNU/{9000 + names.index(board_name)}/{article_id}/artclView.do',
+            'is_important': rng.random() < 0.05,
+            'num': str(article_id),
+            'date': (end_date - timedelta(days=age)).isoformat(),
+            'display_order': position,
+            'view_count': int(rng.paretovariate(1.5) * 50),
+            'author': rng.choice(AUTHORS),
+            'board_name': board_name,
+            'crawled_at': crawled_at,
+        }
+
+
+def populate(rows, seed=0, batch_size=5000):
+    """
+    urls.json의 카테고리/게시판을 만들고 합성 공지사항 rows개를 채운 뒤 (게시판 목록, 가장 글이 많은 날짜) 반환
+    속도를 위해 upsert 대신 bulk_create로 넣고 일별 집계는 마지막에 한 번에 만든다.
+    """
+    setup_initial_data()
+    boards = {board.name: board for board in NoticeBoard.objects.filter(is_active=True).order_by('id')}
+    batch = []
+    per_date = {}
+    for row in generate_notice_rows(list(boards), rows, seed=seed):
+        board = boards[row['board_name']]
+        batch.append(Notice(
+            board=board,
+            natural_key=row['num'],
+            title=row['title'],
+            url=row['url'],
+            published_date=date.fromisoformat(row['date']),
+            display_order=row['display_order'],
+            author=row['author'],
+            view_count=row['view_count'],
+            is_important=row['is_important'],
+        ))
+        per_date[row['date']] = per_date.get(row['date'], 0) + 1
+        if len(batch) >= batch_size:
+            Notice.objects.bulk_create(batch)
+            batch = []
+    Notice.objects.bulk_create(batch)
+    rebuild_daily_counts()
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+    busiest = max(per_date, key=per_date.get) if per_date else END_DATE.isoformat()
+    return list(boards.values()), busiest
+
+
+def percentile(sorted_values, fraction):
+    """정렬된 값 목록의 백분위수 (가장 가까운 순위 방식)"""
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values) + 0.5) - 1))
+    return sorted_values[index]
+
+
+def measure(func, repeat, setup=None):
+    """
+    func를 repeat번 실행해서 지연 시간(ms) 통계, 호출당 쿼리 수, 최대 메모리(KB) 반환
+    setup은 매 실행 전에 불리며 측정에 포함되지 않는다.
+    메모리는 tracemalloc 때문에 느려지므로 따로 한 번 더 실행해서 잰다.
+    """
+    timings = []
+    queries = []
+    for i in range(repeat):
+        if setup:
+            setup(i)
+        with CaptureQueriesContext(connections['default']) as captured:
+            started = time.perf_counter()
+            func(i)
+            timings.append((time.perf_counter() - started) * 1000)
+        queries.append(len(captured.captured_queries))
+
+    if setup:
+        setup(repeat)
+    tracemalloc.start()
+    try:
+        func(repeat)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    timings.sort()
+    return {
+        'iterations': repeat,
+        'p50_ms': round(statistics.median(timings), 3),
+        'p95_ms': round(percentile(timings, 0.95), 3),
+        'mean_ms': round(statistics.fmean(timings), 3),
+        'queries': round(statistics.fmean(queries), 2),
+        'peak_memory_kb': round(peak / 1024, 1),
+    }
+
+
+class BenchmarkSuite:
+    """
+    웹 API와 저장 경로의 성능 측정
+    get_notice_counts/get_notice_preview는 응답 캐시를 매번 무효화한 상태(cold)와 캐시된 상태(warm)를 따로 재고,
+    ImportDataView.post와 crawl_board_notices(크롤러는 합성 데이터로 대체)는 매번 새 글을 저장한다.
+    """
+
+    SCENARIOS = ('notice_counts', 'notice_counts_cached', 'notice_preview', 'import_data', 'crawl_board')
+
+    def __init__(self, boards, busiest_date, repeat=20, import_rows=1000, seed=0):
+        self.boards = boards
+        self.busiest_date = busiest_date
+        self.repeat = repeat
+        self.import_rows = import_rows
+        self.seed = seed
+        self.factory = RequestFactory()
+        # 합성 데이터와 겹치지 않는 게시글 번호부터 새 글을 만든다
+        self.next_id = 50_000_000
+
+    def run(self, scenarios=None):
+        results = {}
+        for name in scenarios or self.SCENARIOS:
+            results[name] = getattr(self, f'bench_{name}')()
+            logger.info(f"벤치마크 {name}: {results[name]}")
+        return results
+
+    def cold(self, i):
+        bump_data_version()
+
+    def bench_notice_counts(self):
+        return measure(lambda i: self.get(views.get_notice_counts, {'date': self.busiest_date}), self.repeat, self.cold)
+
+    def bench_notice_counts_cached(self):
+        self.get(views.get_notice_counts, {'date': self.busiest_date})
+        return measure(lambda i: self.get(views.get_notice_counts, {'date': self.busiest_date}), self.repeat)
+
+    def bench_notice_preview(self):
+        params = {'url': self.boards[0].url, 'date': self.busiest_date}
+        return measure(lambda i: self.get(views.get_notice_preview, params), self.repeat, self.cold)
+
+    def bench_import_data(self):
+        payloads = {}
+
+        def setup(i):
+            payloads[i] = json.dumps({'notices': self.new_rows(self.import_rows)}).encode('utf-8')
+
+        def run(i):
+            request = self.factory.post(
+                '/api/v1/import-data/', payloads.pop(i), content_type='application/json',
+                HTTP_AUTHORIZATION=f'Bearer {BENCHMARK_TOKEN}',
+            )
+            response = ImportDataView.as_view()(request)
+            if response.status_code != 200:
+                raise RuntimeError(f'import-data 실패: {response.status_code} {response.content[:200]}')
+
+        with mock.patch.dict(os.environ, {'CRAWL_AUTH_TOKEN': BENCHMARK_TOKEN}):
+            return measure(run, self.repeat, setup)
+
+    def bench_crawl_board(self):
+        board = self.boards[0]
+        pages = {}
+
+        def setup(i):
+            # 게시판 목록 한 페이지(15개) 분량
+            pages[i] = self.new_rows(15, board.name)
+
+        def run(i):
+            with mock.patch('notices.src.tasks.crawl_notices', return_value=pages.pop(i)):
+                crawl_board_notices(board)
+
+        return measure(run, self.repeat, setup)
+
+    def get(self, view, params):
+        response = view(self.factory.get('/', params))
+        if response.status_code != 200:
+            raise RuntimeError(f'{view.__name__} 실패: {response.status_code}')
+        return response
+
+    def new_rows(self, count, board_name=None):
+        names = [board_name] if board_name else [board.name for board in self.boards]
+        rows = list(generate_notice_rows(names, count, seed=self.seed + self.next_id, start_id=self.next_id))
+        self.next_id += count
+        return rows
+
+
+def run_benchmarks(rows, repeat=20, import_rows=1000, seed=0, scenarios=None):
+    """
+    합성 데이터 rows개를 채운 상태에서 시나리오를 측정하고 결과 dict 반환
+    모든 변경은 트랜잭션 롤백으로 되돌린다.
+    """
+    outcome = {}
+    try:
+        with transaction.atomic():
+            started = time.perf_counter()
+            boards, busiest = populate(rows, seed=seed)
+            outcome['populate_seconds'] = round(time.perf_counter() - started, 2)
+            outcome['busiest_date'] = busiest
+            suite = BenchmarkSuite(boards, busiest, repeat=repeat, import_rows=import_rows, seed=seed)
+            outcome['scenarios'] = suite.run(scenarios)
+            raise RollbackBenchmark
+    except RollbackBenchmark:
+        pass
+    # 롤백된 데이터로 만든 캐시 응답이 남지 않도록
+    bump_data_version()
+    return outcome
+
+
+def environment_info():
+    return {
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'sqlite': sqlite3.sqlite_version,
+        'database': connection.vendor,
+        'platform': platform.platform(),
+    }
+
+
+def build_report(runs, repeat, seed):
+    """결과 파일 내용: {'format', 'created_at', 'environment', 'repeat', 'seed', 'runs': {행 수: 결과}}"""
+    return {
+        'format': RESULT_FORMAT_VERSION,
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'environment': environment_info(),
+        'repeat': repeat,
+        'seed': seed,
+        'runs': {str(rows): outcome for rows, outcome in runs.items()},
+    }
+
+
+def compare_reports(current, baseline, threshold=0.2):
+    """
+    기준 결과와 비교해서 (비교 행 목록, 성능 저하 목록) 반환
+    p95가 threshold(비율)보다 많이 늘거나 쿼리 수가 늘면 성능 저하로 본다.
+    """
+    if baseline.get('format') != current.get('format'):
+        raise ValueError(f"결과 형식이 다릅니다: {baseline.get('format')} != {current.get('format')}")
+    lines = []
+    regressions = []
+    for rows, outcome in current['runs'].items():
+        base_outcome = baseline['runs'].get(rows)
+        if not base_outcome:
+            continue
+        for name, result in outcome['scenarios'].items():
+            base = base_outcome['scenarios'].get(name)
+            if not base:
+                continue
+            change = (result['p95_ms'] - base['p95_ms']) / base['p95_ms'] if base['p95_ms'] else 0.0
+            line = (
+                f"[{rows}] {name}: p95 {base['p95_ms']:.1f} -> {result['p95_ms']:.1f}ms ({change:+.0%}), "
+                f"queries {base['queries']:g} -> {result['queries']:g}"
+            )
+            lines.append(line)
+            if change > threshold or result['queries'] > base['queries']:
+                regressions.append(line)
+    return lines, regressions
@@ -0,0 +1,146 @@
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from contextlib import contextmanager
+import logging
+import queue
+import threading
+
+logger = logging.getLogger(__name__)
+
+def create_chrome_driver():
+    """
+    Headless Chrome WebDriver 생성
+    """
+    options = Options()
+    options.add_argument("--headless")  # Headless 모드로 실행 (GUI 없이 실행)
+    options.add_argument("--disable-gpu")  # GPU 가속 사용 안 함
+    options.add_argument("--no-sandbox")  # Sandbox 모드 사용 안 함
+    options.add_argument("--disable-dev-shm-usage")  # /dev/shm 공간 공유 안 함
+    return webdriver.Chrome(options=options)
+
+
+class PooledDriver:
+    """풀에서 대여한 WebDriver (페이지 수 기록용 래퍼)"""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.page_count = 0
+        self.broken = False
+
+    def get(self, url):
+        self.page_count += 1
+        self.driver.get(url)
+
+    @property
+    def page_source(self):
+        return self.driver.page_source
+
+    def is_healthy(self):
+        try:
+            return self.driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+
+    def quit(self):
+        try:
+            self.driver.quit()
+        except Exception as e:
+            logger.warning(f"WebDriver 종료 실패: {e}")
+
+
+class BrowserPool:
+    """
+    Headless Chrome 세션 풀
+    - 최대 size개의 드라이버를 필요할 때 한 번만 띄우고 게시판 크롤링에 대여
+    - max_pages 페이지를 처리했거나 오류가 난 드라이버는 종료 후 새로 생성
+    - page_load_timeout(초)을 주면 드라이버가 페이지 하나를 그 시간 안에 읽지 못하면 예외를 낸다
+    """
+
+    def __init__(self, size=1, max_pages=50, driver_factory=create_chrome_driver, page_load_timeout=None):
+        if size < 1:
+            raise ValueError("size는 1 이상이어야 합니다.")
+        self.size = size
+        self.max_pages = max_pages
+        self.page_load_timeout = page_load_timeout
+        self.driver_factory = driver_factory
+        self.launched_count = 0
+        self.recycled_count = 0
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._closed = False
+        # 빈 슬롯(None)은 첫 대여 시에 드라이버를 띄운다
+        for _ in range(size):
+            self._idle.put(None)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _launch(self):
+        driver = PooledDriver(self.driver_factory())
+        if self.page_load_timeout:
+            driver.driver.set_page_load_timeout(self.page_load_timeout)
+        with self._lock:
+            self.launched_count += 1
+        logger.info(f"WebDriver 실행 ({self.launched_count}번째)")
+        return driver
+
+    def _retire(self, pooled, reason):
+        logger.info(f"WebDriver 교체: {reason} (처리 페이지 {pooled.page_count})")
+        pooled.quit()
+        with self._lock:
+            self.recycled_count += 1
+
+    @contextmanager
+    def lease(self, timeout=None):
+        """
+        드라이버 대여 (with 블록이 끝나면 반납)
+        블록 안에서 예외가 발생하면 해당 드라이버는 폐기된다.
+        """
+        if self._closed:
+            raise RuntimeError("이미 종료된 BrowserPool입니다.")
+
+        pooled = self._idle.get(timeout=timeout)
+        try:
+            if pooled is not None and not pooled.is_healthy():
+                self._retire(pooled, "상태 점검 실패")
+                pooled = None
+            if pooled is None:
+                pooled = self._launch()
+        except Exception:
+            # 드라이버 실행 실패 시 슬롯은 비워서 돌려놓는다
+            self._idle.put(None)
+            raise
+
+        try:
+            yield pooled
+        except Exception:
+            pooled.broken = True
+            raise
+        finally:
+            self._release(pooled)
+
+    def _release(self, pooled):
+        if self._closed:
+            pooled.quit()
+            return
+        if pooled.broken:
+            self._retire(pooled, "크롤링 중 오류")
+            pooled = None
+        elif self.max_pages and pooled.page_count >= self.max_pages:
+            self._retire(pooled, "최대 페이지 도달")
+            pooled = None
+        self._idle.put(pooled)
+
+    def close(self):
+        """대기 중인 모든 드라이버 종료 (대여 중인 드라이버는 반납 시 종료)"""
+        self._closed = True
+        while True:
+            try:
+                pooled = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            if pooled is not None:
+                pooled.quit()
@@ -1,114 +1,161 @@
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from bs4 import BeautifulSoup
-from datetime import datetime
+from django.conf import settings
+from notices.src.fetchers import create_fetcher
+from notices.src.parsers import get_parser, tbody_hash
+from notices.src.pipeline import page_display_order
+from notices.models import notice_article_id
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 import logging
 import json
 
 logger = logging.getLogger(__name__)
 
-def crawl_notices(board_name=None):
+def load_board_urls(path=None):
     """
-    공주대학교 공지사항을 크롤링하는 함수 (Selenium 사용)
+    urls.json의 {카테고리: {게시판: URL}} 매핑 읽어오기
+    BOARD_URLS_FILE 설정으로 다른 매핑 파일(예: 로컬 테스트 서버)을 가리킬 수 있다.
+    """
+    path = path or getattr(settings, 'BOARD_URLS_FILE', 'notices/src/urls.json')
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def find_board_url(urls, board_name):
+    """게시판 이름으로 URL 찾기 (없으면 None)"""
+    for category, boards in urls.items():
+        if board_name in boards:
+            return boards[board_name]
+    return None
+
+def parse_notice_rows(html, board_name, parser=None):
+    """
+    게시판 목록 HTML에서 게시물 행을 추출
+    parser는 'soup', 'lxml', 'stream' 중 하나이고, 없으면 NOTICE_PARSER 설정을 따른다 (notices.src.parsers 참고).
+    """
+    return get_parser(parser).parse(html, board_name)
+
+def board_page_url(board_url, page):
+    """게시판 목록의 page번째 페이지 URL (1페이지는 게시판 URL 그대로)"""
+    if page <= 1:
+        return board_url
+    parts = urlsplit(board_url)
+    query = [(key, value) for key, value in parse_qsl(parts.query) if key != 'page']
+    query.append(('page', str(page)))
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+class BoardPages:
+    """게시판 여러 페이지를 읽은 결과"""
+
+    def __init__(self):
+        self.rows = []
+        self.pages = 0
+        self.backend = None
+        self.reached_known = False  # 이미 본 게시글에 닿아서 멈췄는지
+        self.max_article_id = 0
+        # 첫 페이지가 바뀌지 않아서 파싱/저장을 건너뛴 이유 ('not_modified': 304, 'same_hash': tbody 해시 일치)
+        self.unchanged = None
+        self.etag = None
+        self.last_modified = None
+        self.content_hash = None
+        self.content_length = 0     # 첫 페이지 본문 크기
+        self.bytes_downloaded = 0
+
+def crawl_board_pages(fetcher, board_name, board_url, high_water_mark=0, max_pages=1, parser=None,
+                      validators=None, content_hash=None):
+    """
+    게시판 목록을 1페이지부터 읽다가 high_water_mark 이하 게시글 번호(이미 본 글)가 나오면 멈춘다.
+    고정글은 모든 페이지에 다시 나오므로 처음 페이지의 것만 남기고, 멈춤 판단에도 쓰지 않는다.
+    high_water_mark가 없으면(처음 크롤링) 1페이지만 읽는다. 과거 글 전체는 backfill로 채운다.
+    첫 페이지는 validators(ETag/Last-Modified)로 조건부 요청을 보내고, 304이거나 tbody 해시가
+    content_hash와 같으면 파싱하지 않고 바로 끝낸다 (pages.unchanged).
+    """
+    if not high_water_mark:
+        max_pages = 1
+    pages = BoardPages()
+    seen_urls = set()
+    for page in range(1, max_pages + 1):
+        first = page == 1
+        result, rows = fetcher.fetch_rows(
+            board_page_url(board_url, page),
+            lambda html: parse_notice_rows(html, board_name, parser),
+            key=board_name,
+            validators=validators if first else None,
+            skip=(lambda html: tbody_hash(html) == content_hash) if first and content_hash else None,
+        )
+        pages.pages += 1
+        pages.backend = result.backend
+        pages.bytes_downloaded += result.size
+        if first:
+            pages.etag = result.etag
+            pages.last_modified = result.last_modified
+            if not result.not_modified:
+                pages.content_hash = tbody_hash(result.html)
+                pages.content_length = result.size
+        if rows is None:
+            pages.unchanged = 'not_modified' if result.not_modified else 'same_hash'
+            break
+
+        regular_ids = []
+        for position, row in enumerate(rows):
+            # 앞 페이지에서 이미 받은 글(고정글)은 건너뛴다 (같은 페이지 안의 중복은 저장할 때 정리)
+            if row['url'] in seen_urls:
+                continue
+            # backfill과 같은 표시 순서 (페이지를 넘겨 읽어도 같은 글은 같은 값)
+            row.setdefault('display_order', page_display_order(page, position))
+            pages.rows.append(row)
+            article_id = notice_article_id(row['url'])
+            if article_id:
+                pages.max_article_id = max(pages.max_article_id, article_id)
+                if not row['is_important']:
+                    regular_ids.append(article_id)
+
+        seen_urls.update(row['url'] for row in rows)
+
+        if not regular_ids:
+            # 빈 페이지 (마지막 페이지 뒤)
+            break
+        if high_water_mark and min(regular_ids) <= high_water_mark:
+            pages.reached_known = True
+            break
+    return pages
+
+def crawl_notices(board_name=None, pool=None, fetcher=None, urls=None):
+    """
+    공주대학교 공지사항을 크롤링하는 함수
+    기본은 HTTP로 가져오고, 목록을 스크립트로 채우는 페이지만 Selenium(BrowserPool)으로 다시 가져온다.
+    fetcher를 넘기면 그 fetcher를 그대로 쓰고, 게시판별 사용 백엔드는 fetcher.stats에 남는다.
+    urls를 넘기면 urls.json 대신 그 {카테고리: {게시판: URL}} 매핑에서 게시판 URL을 찾는다.
     """
-    base_url = "https://www.kongju.ac.kr/board/bbs/board.do"
-    
     all_notices = []
-    
+
     # URL 정보 파일 읽어오기
-    with open('notices/src/urls.json', 'r', encoding='utf-8') as f:
-        urls = json.load(f)
-    
-    # Selenium 옵션 설정
-    options = Options()
-    options.add_argument("--headless")  # Headless 모드로 실행 (GUI 없이 실행)
-    options.add_argument("--disable-gpu")  # GPU 가속 사용 안 함
-    options.add_argument("--no-sandbox")  # Sandbox 모드 사용 안 함
-    options.add_argument("--disable-dev-shm-usage")  # /dev/shm 공간 공유 안 함
-    
-    # Chrome WebDriver 실행 (경로 설정 필요)
-    driver = webdriver.Chrome(options=options)
-    
+    if urls is None:
+        urls = load_board_urls()
+
+    # fetcher가 없으면 이번 호출에서만 쓰는 fetcher 생성
+    own_fetcher = fetcher is None
+    if own_fetcher:
+        fetcher = create_fetcher('auto', pool=pool)
+
     try:
         # 특정 게시판만 크롤링할 경우
         if board_name:
             # 게시판 URL 가져오기
-            board_url = None
-            for category, boards in urls.items():
-                if board_name in boards:
-                    board_url = boards[board_name]
-                    break
-            
+            board_url = find_board_url(urls, board_name)
+
             if board_url:
                 try:
-                    driver.get(board_url)
-                    
-                    # 페이지 소스 가져오기
-                    html = driver.page_source
-                    soup = BeautifulSoup(html, 'html.parser')
-                    
-                    # 실제 HTML 구조에 맞게 게시물 목록 추출
-                    notice_list = soup.select('table.board-table.horizon1 > tbody > tr')
-
-                    for notice in notice_list:
-                        try:
-                            # 번호
-                            num = notice.select_one('td.td-num')
-                            num = num.text.strip() if num else None
-
-                            # 제목 및 링크
-                            subject_a = notice.select_one('td.td-subject a')
-                            title = subject_a.text.strip() if subject_a else None
-                            url = subject_a['href'] if subject_a and subject_a.has_attr('href') else None
-
-                            # 작성자
-                            author = notice.select_one('td.td-write')
-                            author = author.text.strip() if author else None
-
-
-                            # 작성일 (YYYY-MM-DD로 변환)
-                            date = notice.select_one('td.td-date')
-                            date = date.text.strip() if date else None
-                            if date:
-                                if '.' in date:
-                                    try:
-                                        from datetime import datetime as dt
-                                        date_obj = dt.strptime(date, '%Y.%m.%d')
-                                        date = date_obj.strftime('%Y-%m-%d')
-                                    except Exception as e:
-                                        logger.warning(f"날짜 변환 실패: {date} ({e})")
-
-                            # 조회수
-                            view_count = notice.select_one('td.td-access')
-                            view_count = view_count.text.strip() if view_count else None
-
-                            # 중요 공지사항 (예: 아이콘 등)
-                            is_important = bool(notice.select_one('span.icon-important'))
-
-                            notice_data = {
-                                "title": title,
-                                "url": url,
-                                "is_important": is_important,
-                                "num": num,
-                                "date": date,
-                                "view_count": view_count,
-                                "author": author,
-                                "board_name": board_name,
-                                "category_name": board_name,
-                                "crawled_at": datetime.now().isoformat()
-                            }
-                            all_notices.append(notice_data)
-                        except Exception as e:
-                            logger.error(f"Error processing notice: {e}")
-                            continue
-                
+                    result, notices = fetcher.fetch_rows(
+                        board_url,
+                        lambda html: parse_notice_rows(html, board_name),
+                        key=board_name,
+                    )
+                    all_notices.extend(notices)
                 except Exception as e:
                     logger.error(f"Error crawling board {board_url}: {e}")
             else:
                 logger.warning(f"Board {board_name} not found in urls.json")
-    
+
     finally:
-        driver.quit()  # WebDriver 종료
-    
-    return all_notices
\ No newline at end of file
+        if own_fetcher:
+            fetcher.close()  # 커넥션 및 WebDriver 종료
+
+    return all_notices
@@ -0,0 +1,211 @@
+from notices.src.browser_pool import BrowserPool
+from notices.src.parsers import needs_browser
+import logging
+import urllib3
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_USER_AGENT = (
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/126.0 Safari/537.36 knu-notice"
+)
+
+
+class HttpStatusError(urllib3.exceptions.HTTPError):
+    """4xx/5xx 응답 (transient: 잠시 뒤 다시 시도하면 될 수 있는 429/5xx)"""
+
+    def __init__(self, status, url):
+        super().__init__(f"HTTP {status}: {url}")
+        self.status = status
+        self.url = url
+
+    @property
+    def transient(self):
+        return self.status == 429 or self.status >= 500
+
+
+class FetchResult:
+    """페이지 요청 결과 (304면 html은 빈 문자열)"""
+
+    def __init__(self, url, html, backend, status=200, etag=None, last_modified=None, size=None):
+        self.url = url
+        self.html = html
+        self.backend = backend
+        self.status = status
+        self.etag = etag
+        self.last_modified = last_modified
+        # 실제로 내려받은 본문 크기 (bytes)
+        self.size = len(html.encode('utf-8')) if size is None else size
+
+    @property
+    def not_modified(self):
+        return self.status == 304
+
+
+class Fetcher:
+    """
+    게시판 페이지 fetcher 기본 클래스
+    하위 클래스는 fetch(url)만 구현하면 된다.
+    """
+    name = None
+
+    def __init__(self):
+        # 게시판별로 실제 사용된 백엔드 기록 (예: {'학생소식': 'http'})
+        self.stats = {}
+
+    def fetch(self, url, validators=None):
+        """
+        페이지 요청
+        validators({'etag': ..., 'last_modified': ...})를 지원하는 백엔드는 조건부 요청을 보내고,
+        바뀌지 않았으면 status 304 결과를 돌려준다.
+        """
+        raise NotImplementedError
+
+    def fetch_rows(self, url, parse, key=None, validators=None, skip=None):
+        """
+        페이지를 가져와서 parse(html) 결과와 함께 반환
+        304 응답이거나 skip(html)이 참이면 파싱하지 않고 rows 자리에 None을 돌려준다.
+        """
+        result = self.fetch(url, validators)
+        self.stats[key or url] = result.backend
+        if result.not_modified or (skip and skip(result.html)):
+            return result, None
+        return result, parse(result.html)
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class HttpFetcher(Fetcher):
+    """keep-alive 커넥션 풀을 쓰는 일반 HTTP 클라이언트"""
+    name = 'http'
+
+    def __init__(self, maxsize=4, connect_timeout=5.0, read_timeout=15.0, retries=2):
+        super().__init__()
+        self.http = urllib3.PoolManager(
+            maxsize=maxsize,
+            block=False,
+            timeout=urllib3.Timeout(connect=connect_timeout, read=read_timeout),
+            retries=urllib3.Retry(total=retries, backoff_factor=0.5, status_forcelist=(502, 503, 504)),
+            headers={
+                'User-Agent': DEFAULT_USER_AGENT,
+                'Accept': 'text/html,application/xhtml+xml',
+                'Accept-Language': 'ko-KR,ko;q=0.9',
+            },
+        )
+
+    def fetch(self, url, validators=None):
+        headers = None
+        if validators:
+            headers = dict(self.http.headers)
+            if validators.get('etag'):
+                headers['If-None-Match'] = validators['etag']
+            if validators.get('last_modified'):
+                headers['If-Modified-Since'] = validators['last_modified']
+        response = self.http.request('GET', url, headers=headers)
+        if response.status >= 400:
+            raise HttpStatusError(response.status, url)
+        html = response.data.decode(_content_charset(response) or 'utf-8', errors='replace')
+        return FetchResult(
+            url, html, self.name, response.status,
+            etag=response.headers.get('ETag'),
+            last_modified=response.headers.get('Last-Modified'),
+            size=len(response.data),
+        )
+
+    def close(self):
+        self.http.clear()
+
+
+class SeleniumFetcher(Fetcher):
+    """BrowserPool의 headless Chrome으로 렌더링된 페이지를 가져오는 fetcher"""
+    name = 'selenium'
+
+    def __init__(self, pool=None):
+        super().__init__()
+        self.own_pool = pool is None
+        self.pool = pool or BrowserPool(size=1)
+
+    def fetch(self, url, validators=None):
+        # 브라우저로는 조건부 요청을 보낼 수 없어서 validators는 무시한다
+        with self.pool.lease() as driver:
+            driver.get(url)
+            html = driver.page_source
+        return FetchResult(url, html, self.name)
+
+    def close(self):
+        if self.own_pool:
+            self.pool.close()
+
+
+class AutoFetcher(Fetcher):
+    """
+    HTTP 우선 fetcher
+    HTTP 응답에 게시판 표가 없거나 목록을 스크립트로 채우는 페이지(parsers.needs_browser)일 때만 Selenium으로
+    다시 가져온다. HTTP 오류는 브라우저로 다시 시도해도 같으므로 그대로 올려 보내고,
+    표는 있지만 행이 없는 페이지(마지막 페이지 뒤 등)는 빈 목록으로 돌려준다.
+    """
+    name = 'auto'
+
+    def __init__(self, primary=None, fallback=None, pool=None):
+        super().__init__()
+        self.primary = primary or HttpFetcher()
+        self.fallback = fallback or SeleniumFetcher(pool)
+
+    def fetch(self, url, validators=None):
+        return self.primary.fetch(url, validators)
+
+    def fetch_rows(self, url, parse, key=None, validators=None, skip=None):
+        result = self.primary.fetch(url, validators)
+        if result.not_modified or (skip and skip(result.html)):
+            self.stats[key or url] = result.backend
+            return result, None
+        if needs_browser(result.html):
+            logger.info(f"HTTP 응답에 게시판 목록이 없어 Selenium으로 전환: {url}")
+            result = self.fallback.fetch(url)
+        self.stats[key or url] = result.backend
+        return result, parse(result.html)
+
+    def close(self):
+        self.primary.close()
+        self.fallback.close()
+
+
+FETCHER_BACKENDS = {
+    'auto': AutoFetcher,
+    'http': HttpFetcher,
+    'selenium': SeleniumFetcher,
+}
+
+
+def create_fetcher(backend='auto', pool=None, maxsize=4, timeout=None):
+    """
+    백엔드 이름으로 fetcher 생성
+    pool은 Selenium을 쓰는 백엔드에, maxsize(호스트별 keep-alive 커넥션 수)는 HTTP를 쓰는 백엔드에 전달
+    timeout(초)을 주면 HTTP 요청의 연결/읽기 제한 시간으로 쓴다 (브라우저는 BrowserPool의 page_load_timeout).
+    """
+    if backend not in FETCHER_BACKENDS:
+        raise ValueError(f"알 수 없는 fetcher 백엔드: {backend}")
+    http_options = {'maxsize': maxsize}
+    if timeout:
+        http_options.update(connect_timeout=min(5.0, timeout), read_timeout=timeout)
+    if backend == 'http':
+        return HttpFetcher(**http_options)
+    if backend == 'selenium':
+        return SeleniumFetcher(pool=pool)
+    return AutoFetcher(primary=HttpFetcher(**http_options), pool=pool)
+
+
+def _content_charset(response):
+    content_type = response.headers.get('Content-Type', '')
+    for part in content_type.split(';'):
+        part = part.strip()
+        if part.lower().startswith('charset='):
+            return part.split('=', 1)[1].strip('"\'')
+    return None
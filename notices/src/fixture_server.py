@@ -0,0 +1,317 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from html import escape
+from urllib.parse import parse_qs, urlsplit
+from collections import defaultdict
+from email.utils import formatdate
+import hashlib
+import logging
+import random
+import re
+import threading
+import time
+import zlib
+
+logger = logging.getLogger(__name__)
+
+ARTICLE_PATH = re.compile(r'^/bbs/KNU/(?P<code>\d+)/(?P<article_id>\d+)/artclView\.do$')
+LIST_PATH = re.compile(r'^/KNU/(?P<code>\d+)/subview\.do$')
+
+LIST_PAGE = """<!DOCTYPE html>
+<html lang="ko">
+<head>
+<meta charset="UTF-8">
+<title>{board} | 국립공주대학교</title>
+</head>
+<body>
+<div id="container">
+	<div class="board-area">
+		<table class="board-table horizon1">
+			<caption>{board} 게시판 목록</caption>
+			<thead>
+				<tr>
+					<th scope="col" class="th-num">번호</th>
+					<th scope="col" class="th-subject">제목</th>
+					<th scope="col" class="th-write">작성자</th>
+					<th scope="col" class="th-date">작성일</th>
+					<th scope="col" class="th-access">조회수</th>
+					<th scope="col" class="th-file">첨부파일</th>
+				</tr>
+			</thead>
+			<tbody>
+{rows}
+			</tbody>
+		</table>
+	</div>
+	<div class="_paging"><span class="_inner">{paging}</span></div>
+</div>
+</body>
+</html>
+"""
+
+LIST_ROW = """				<tr{row_class}>
+					<td class="td-num">{num}</td>
+					<td class="td-subject">
+						<a href="{url}" onclick="jf_viewArtcl('KNU', '{code}', '{article_id}')">
+							<strong>{title}</strong>
+						</a>
+					</td>
+					<td class="td-write">{author}</td>
+					<td class="td-date">{date}</td>
+					<td class="td-access">{view_count}</td>
+					<td class="td-file"></td>
+				</tr>"""
+
+ARTICLE_PAGE = """<!DOCTYPE html>
+<html lang="ko">
+<head>
+<meta charset="UTF-8">
+<title>{title} | 국립공주대학교</title>
+</head>
+<body>
+<div class="artclView">
+	<h2 class="artclViewTitle">{title}</h2>
+	<dl class="artclForm">
+		<dt>작성자</dt><dd class="artclInfo">{author}</dd>
+		<dt>작성일</dt><dd class="artclInfo">{date}</dd>
+		<dt>조회수</dt><dd class="artclInfo">{view_count}</dd>
+	</dl>
+	<div class="artclView-content">{body}</div>
+</div>
+</body>
+</html>
+"""
+
+
+class FixtureBoard:
+    """
+    서버가 내려줄 게시판 하나의 글 목록
+    고정글(is_important)은 실제 게시판처럼 모든 페이지 맨 위에 다시 나오고, max_pinned개를 넘는 것은 일반 글로 둔다.
+    """
+
+    def __init__(self, name, category, code, notices, max_pinned=5):
+        self.name = name
+        self.category = category
+        self.code = code
+        self.pinned = [notice for notice in notices if notice.get('is_important')][:max_pinned]
+        pinned_ids = {id(notice) for notice in self.pinned}
+        self.notices = [notice for notice in notices if id(notice) not in pinned_ids]
+
+    @property
+    def path(self):
+        return f'/KNU/{self.code}/subview.do'
+
+
+class KnuFixtureServer:
+    """
+    공주대 게시판을 흉내 내는 로컬 HTTP 서버 (크롤러 처리량 측정용)
+    crawled_data.json 형식의 공지사항으로 board-table horizon1 목록 페이지(?page=N)와 artclView.do 상세 페이지를 만든다.
+    - latency/jitter: 응답 전 대기 시간과 그 변동 폭 (초)
+    - error_rate: 503으로 응답할 확률
+    - pages: 게시판당 목록 페이지 수 (글이 모자라면 게시글 번호를 바꿔 가며 반복해서 채운다)
+    - conditional: 목록 페이지에 ETag/Last-Modified를 붙이고 조건부 요청에 304로 응답
+    load()로 실행 중에 글 목록을 바꿀 수 있다 (새 글이 올라온 상황 흉내).
+    """
+
+    def __init__(self, notices, board_categories=None, latency=0.0, jitter=0.0, error_rate=0.0,
+                 pages=1, page_size=15, seed=0, host='127.0.0.1', port=0, conditional=True):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.pages = pages
+        self.page_size = page_size
+        self.host = host
+        self.port = port
+        self.random = random.Random(seed)
+        self._random_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.conditional = conditional
+        self.board_categories = board_categories or {}
+        self.stats = {'requests': 0, 'errors': 0, 'not_modified': 0, 'bytes': 0}
+        self.server = None
+        self.thread = None
+        self.codes = {}
+        self.load(notices)
+
+    def load(self, notices):
+        """글 목록을 (다시) 만든다. 게시판 코드(URL)는 이름이 같으면 그대로 유지된다."""
+        by_board = defaultdict(list)
+        for notice in notices:
+            by_board[notice['board_name']].append(notice)
+        boards = {}
+        for name, rows in by_board.items():
+            code = self.codes.setdefault(name, str(20000 + len(self.codes)))
+            boards[code] = FixtureBoard(name, self.board_categories.get(name, name), code, rows)
+        self.boards = boards
+        self.articles = {}
+        pages_cache = {}
+        validators = {}
+        last_modified = formatdate(time.time(), usegmt=True)
+        for board in self.boards.values():
+            for page in range(1, self.pages + 1):
+                body = self.render_list(board, page)
+                pages_cache[(board.code, page)] = body
+                validators[(board.code, page)] = ('"' + hashlib.sha1(body).hexdigest() + '"', last_modified)
+        self.pages_cache = pages_cache
+        self.validators = validators
+
+    def render_list(self, board, page):
+        rows = [self.render_row(board, notice, headline=True) for notice in board.pinned]
+        if board.notices:
+            start = (page - 1) * self.page_size
+            total = self.pages * self.page_size
+            for position in range(start, start + self.page_size):
+                notice = board.notices[position % len(board.notices)]
+                # 원본 글 수보다 많이 채울 때는 게시글 번호를 바꿔서 서로 다른 글로 만든다
+                cycle = position // len(board.notices)
+                rows.append(self.render_row(board, notice, num=total - position, cycle=cycle))
+        paging = ' '.join(f'<a href="{board.path}?page={number}">{number}</a>' for number in range(1, self.pages + 1))
+        return LIST_PAGE.format(board=escape(board.name), rows='\n'.join(rows), paging=paging).encode('utf-8')
+
+    def render_row(self, board, notice, num=None, headline=False, cycle=0):
+        article_id = self.article_id(notice) + cycle * 1_000_000
+        url = f'/bbs/KNU/{board.code}/{article_id}/artclView.do'
+        self.articles[(board.code, str(article_id))] = notice
+        if headline:
+            num_html = '<span class="headline">일반공지</span><span class="icon-important">중요</span>'
+        else:
+            num_html = str(num)
+        return LIST_ROW.format(
+            row_class=' class="notice"' if headline else '',
+            num=num_html,
+            url=url,
+            code=board.code,
+            article_id=article_id,
+            title=escape(notice['title']),
+            author=escape(notice.get('author') or ''),
+            date=str(notice['date']).replace('-', '.'),
+            view_count=notice.get('view_count') or 0,
+        )
+
+    def article_id(self, notice):
+        match = re.search(r'/(\d+)/artclView\.do', notice.get('url') or '')
+        if match:
+            return int(match.group(1))
+        return zlib.crc32(f"{notice['board_name']}|{notice['title']}".encode('utf-8')) % 1_000_000
+
+    def render_article(self, notice):
+        return ARTICLE_PAGE.format(
+            title=escape(notice['title']),
+            author=escape(notice.get('author') or ''),
+            date=str(notice['date']).replace('-', '.'),
+            view_count=notice.get('view_count') or 0,
+            body=escape(notice['title']) * 20,
+        ).encode('utf-8')
+
+    def respond(self, path, query, headers=None):
+        """(상태 코드, 본문, 추가 헤더) 반환"""
+        headers = headers or {}
+        match = LIST_PATH.match(path)
+        if match:
+            try:
+                page = int(parse_qs(query).get('page', ['1'])[0])
+            except ValueError:
+                page = 1
+            key = (match.group('code'), page)
+            if match.group('code') not in self.boards:
+                return 404, b'Not Found', {}
+            body = self.pages_cache.get(key)
+            if body is None:
+                # 마지막 페이지 뒤는 빈 목록
+                body = LIST_PAGE.format(board=escape(self.boards[match.group('code')].name), rows='', paging='').encode('utf-8')
+                return 200, body, {}
+            if not self.conditional:
+                return 200, body, {}
+            etag, last_modified = self.validators[key]
+            extra = {'ETag': etag, 'Last-Modified': last_modified}
+            if_none_match = headers.get('If-None-Match')
+            if (if_none_match and etag in [tag.strip() for tag in if_none_match.split(',')]) or \
+                    (not if_none_match and headers.get('If-Modified-Since') == last_modified):
+                return 304, b'', extra
+            return 200, body, extra
+        match = ARTICLE_PATH.match(path)
+        if match:
+            notice = self.articles.get((match.group('code'), match.group('article_id')))
+            if notice is None:
+                return 404, b'Not Found', {}
+            return 200, self.render_article(notice), {}
+        return 404, b'Not Found', {}
+
+    def delay(self):
+        with self._random_lock:
+            seconds = self.latency + self.random.uniform(-self.jitter, self.jitter)
+            failed = self.random.random() < self.error_rate
+        if seconds > 0:
+            time.sleep(seconds)
+        return failed
+
+    def record(self, status, size):
+        with self._stats_lock:
+            self.stats['requests'] += 1
+            self.stats['bytes'] += size
+            if status >= 500:
+                self.stats['errors'] += 1
+            elif status == 304:
+                self.stats['not_modified'] += 1
+
+    def url(self, path=''):
+        return f'http://{self.host}:{self.server.server_port}{path}'
+
+    def board_urls(self):
+        """urls.json과 같은 {카테고리: {게시판: URL}} 매핑 (load_board_urls 대신 쓸 수 있다)"""
+        urls = defaultdict(dict)
+        for board in self.boards.values():
+            urls[board.category][board.name] = self.url(board.path)
+        return dict(urls)
+
+    def page_urls(self):
+        """모든 게시판의 모든 목록 페이지 (이름, URL) 목록 (첫 페이지는 게시판 이름 그대로)"""
+        return [
+            (board.name if page == 1 else f'{board.name} ({page})', self.url(f'{board.path}?page={page}'))
+            for board in self.boards.values()
+            for page in range(1, self.pages + 1)
+        ]
+
+    def start(self):
+        fixture = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                parts = urlsplit(self.path)
+                if fixture.delay():
+                    status, body, extra = 503, b'Service Unavailable', {}
+                else:
+                    status, body, extra = fixture.respond(parts.path, parts.query, self.headers)
+                self.send_response(status)
+                for name, value in extra.items():
+                    self.send_header(name, value)
+                if status != 304:
+                    self.send_header('Content-Type', 'text/html; charset=UTF-8')
+                    self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                if body:
+                    self.wfile.write(body)
+                fixture.record(status, len(body))
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        logger.info(f"테스트용 게시판 서버 시작: {self.url()} (게시판 {len(self.boards)}개, 페이지 {self.pages}개씩)")
+        return self
+
+    def stop(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
@@ -0,0 +1,210 @@
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+from notices.models import ImportChunk, ImportJob
+from notices.src.importer import NoticeImporter, summarize_import
+from datetime import timedelta
+from pathlib import Path
+import logging
+import os
+import threading
+import uuid
+import zlib
+
+logger = logging.getLogger(__name__)
+
+SPOOL_READ_SIZE = 64 * 1024
+
+
+def spool_dir():
+    return Path(getattr(settings, 'IMPORT_SPOOL_DIR', 'import_spool'))
+
+
+def spool_request(stream, content_type, encoding='', chunk=None):
+    """
+    요청 본문을 spool 파일로 저장하고 대기 중인 ImportJob을 만든다 (본문이 비어 있으면 None)
+    .part로 쓰고 fsync한 뒤 이름을 바꾸므로, 작업이 보이는 시점에는 파일이 온전히 디스크에 있다.
+    """
+    directory = spool_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    name = f'{uuid.uuid4().hex}.body'
+    part = directory / f'{name}.part'
+    size = 0
+    with open(part, 'wb') as f:
+        while True:
+            data = stream.read(SPOOL_READ_SIZE)
+            if not data:
+                break
+            f.write(data)
+            size += len(data)
+        f.flush()
+        os.fsync(f.fileno())
+    if not size:
+        part.unlink()
+        return None
+    os.replace(part, directory / name)
+
+    batch_id, sequence = chunk or ('', None)
+    job = ImportJob.objects.create(
+        spool_file=name, content_type=content_type, content_encoding=encoding, size=size,
+        batch_id=batch_id, sequence=sequence,
+    )
+    transaction.on_commit(lambda: start_worker(job.id))
+    logger.info(f"가져오기 작업 #{job.id} 대기열에 추가 ({size} bytes)")
+    return job
+
+
+def chunk_is_held(batch_id, sequence):
+    """조각이 이미 저장되었거나 저장을 기다리는 중인지"""
+    return (
+        ImportChunk.objects.filter(batch_id=batch_id, sequence=sequence).exists()
+        or ImportJob.objects.filter(
+            batch_id=batch_id, sequence=sequence, status__in=ImportJob.ACTIVE_STATUSES
+        ).exists()
+    )
+
+
+def start_worker(job_id):
+    """IMPORT_WORKER 설정에 따라 작업을 처리할 worker를 깨운다"""
+    mode = getattr(settings, 'IMPORT_WORKER', 'thread')
+    if mode == 'thread':
+        start_worker_thread()
+    elif mode == 'celery':
+        from notices.src.tasks import run_import_job_task
+        run_import_job_task.delay(job_id)
+    # command: python manage.py import_worker가 대기열을 확인한다
+
+
+def claim_job(job_id=None):
+    """대기 중인 작업 하나를 저장 중으로 바꿔서 가져온다 (여러 worker가 같은 작업을 잡지 않음, 없으면 None)"""
+    queued = ImportJob.objects.filter(status=ImportJob.QUEUED)
+    if job_id is not None:
+        queued = queued.filter(id=job_id)
+    for candidate in queued.order_by('id').values_list('id', flat=True)[:10]:
+        now = timezone.now()
+        claimed = ImportJob.objects.filter(id=candidate, status=ImportJob.QUEUED).update(
+            status=ImportJob.RUNNING, started_at=now, heartbeat_at=now,
+        )
+        if claimed:
+            return ImportJob.objects.get(id=candidate)
+    return None
+
+
+def process_job(job):
+    """spool 파일을 읽어서 저장하고 결과를 job에 기록 (성공하면 spool 파일 삭제)"""
+    path = spool_dir() / job.spool_file
+
+    def record_progress(received, summaries):
+        total = summarize_import(summaries, log=False)
+        job.heartbeat_at = timezone.now()
+        ImportJob.objects.filter(id=job.id).update(
+            received=received, created=total.created, updated=total.updated,
+            unchanged=total.unchanged, skipped=total.skipped, heartbeat_at=job.heartbeat_at,
+        )
+
+    importer = NoticeImporter(on_batch=record_progress)
+    try:
+        with open(path, 'rb') as stream:
+            if job.batch_id:
+                imported = importer.import_chunk(
+                    stream, job.content_type, job.content_encoding, job.batch_id, job.sequence,
+                )
+            else:
+                imported = importer.import_stream(stream, job.content_type, job.content_encoding)
+        if imported is None:
+            job.error = '이미 저장된 조각이라 건너뜀'
+        else:
+            summaries, received = imported
+            if not received:
+                raise ValueError('공지사항 데이터가 없습니다.')
+            total = summarize_import(summaries)
+            job.received = received
+            job.created, job.updated = total.created, total.updated
+            job.unchanged, job.skipped = total.unchanged, total.skipped
+        job.status = ImportJob.DONE
+        path.unlink(missing_ok=True)
+    except (ValueError, zlib.error, OSError) as e:
+        logger.error(f"가져오기 작업 #{job.id} 실패: {e}")
+        job.status, job.error = ImportJob.FAILED, str(e)
+    except Exception as e:
+        logger.exception(f"가져오기 작업 #{job.id} 예상치 못한 오류")
+        job.status, job.error = ImportJob.FAILED, str(e)
+    job.finished_at = timezone.now()
+    job.save()
+    info = job.as_dict()
+    logger.info(
+        f"가져오기 작업 #{job.id} {job.status}: {job.received}건, "
+        f"{info['elapsed_seconds']}s ({info['rows_per_second']} rows/s)"
+    )
+    return job
+
+
+def run_import_job(job_id=None):
+    """대기 중인 작업 하나(job_id를 주면 그 작업)를 처리하고 반환 (처리할 작업이 없으면 None)"""
+    job = claim_job(job_id)
+    return process_job(job) if job is not None else None
+
+
+def requeue_stale_jobs(now=None):
+    """
+    IMPORT_JOB_STALE_MINUTES 넘게 heartbeat가 없는 저장 중 작업(worker가 죽은 경우)을 다시 대기열에 넣는다
+    오래 걸리는 작업이라도 배치를 저장할 때마다 heartbeat_at이 갱신되므로 두 번 처리되지 않는다.
+    조각은 한 트랜잭션으로, 그 외는 upsert로 저장하므로 처음부터 다시 해도 결과가 같다.
+    """
+    now = now or timezone.now()
+    cutoff = now - timedelta(minutes=getattr(settings, 'IMPORT_JOB_STALE_MINUTES', 30))
+    # heartbeat_at이 없는 작업(heartbeat를 도입하기 전에 잡힌 작업)은 started_at으로 판단
+    stale = Q(heartbeat_at__lt=cutoff) | Q(heartbeat_at__isnull=True, started_at__lt=cutoff)
+    count = ImportJob.objects.filter(stale, status=ImportJob.RUNNING).update(
+        status=ImportJob.QUEUED, started_at=None, heartbeat_at=None,
+    )
+    if count:
+        logger.warning(f"멈춘 가져오기 작업 {count}개를 다시 대기열에 넣음")
+    return count
+
+
+def drain_import_jobs(limit=None):
+    """대기열이 빌 때까지(또는 limit개) 작업을 처리하고 처리한 작업 목록 반환"""
+    requeue_stale_jobs()
+    jobs = []
+    while limit is None or len(jobs) < limit:
+        job = run_import_job()
+        if job is None:
+            break
+        jobs.append(job)
+    return jobs
+
+
+_worker_lock = threading.Lock()
+_worker_wakeup = threading.Event()
+_worker_thread = None
+
+
+def start_worker_thread():
+    """웹 프로세스 안의 worker 스레드를 깨운다 (없으면 띄움, 프로세스당 하나)"""
+    global _worker_thread
+    with _worker_lock:
+        _worker_wakeup.set()
+        if _worker_thread is None:
+            _worker_thread = threading.Thread(target=_worker_loop, name='import-worker', daemon=True)
+            _worker_thread.start()
+
+
+def _worker_loop():
+    global _worker_thread
+    try:
+        while True:
+            _worker_wakeup.clear()
+            drain_import_jobs()
+            with _worker_lock:
+                # 대기열을 비우는 동안 새 작업이 들어오지 않았으면 종료
+                if not _worker_wakeup.is_set():
+                    _worker_thread = None
+                    return
+    except Exception:
+        logger.exception("가져오기 worker 스레드 오류")
+        with _worker_lock:
+            _worker_thread = None
+    finally:
+        connection.close()
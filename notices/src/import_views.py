@@ -1,83 +1,225 @@
+from django.conf import settings
 from django.http import JsonResponse
+from django.urls import reverse
 from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
 from django.views import View
-from notices.models import NoticeCategory, NoticeBoard, Notice
+from notices.models import ImportJob, Notice, NoticeBoard
+from notices.src.import_jobs import chunk_is_held, spool_request
+from notices.src.importer import NoticeImporter, batch_status, summarize_import
+from notices.src.jsonstream import NDJSON_CONTENT_TYPES
+from contextlib import contextmanager
 from datetime import datetime
-import json
 import os
+import re
+import time
+import tracemalloc
+import zlib
 import logging
 
 logger = logging.getLogger(__name__)
 
+BATCH_ID_PATTERN = re.compile(r'[A-Za-z0-9_-]{1,64}')
+
+@contextmanager
+def traced_peak_memory():
+    """
+    블록 안에서 할당된 파이썬 메모리의 최대치를 잰다 (끝나면 result['peak_memory_kb']에 KB, 재지 않았으면 None)
+    tracemalloc은 프로세스 전체에 하나뿐이라 다른 요청이 이미 재고 있으면 재지 않고, 재는 동안 같은 프로세스의
+    다른 스레드가 할당한 메모리도 같이 잡힌다. IMPORT_TRACE_MEMORY=false면 재지 않는다 (할당이 느려지므로).
+    """
+    result = {'peak_memory_kb': None}
+    if not getattr(settings, 'IMPORT_TRACE_MEMORY', True) or tracemalloc.is_tracing():
+        yield result
+        return
+    tracemalloc.start()
+    try:
+        yield result
+        _, peak = tracemalloc.get_traced_memory()
+        result['peak_memory_kb'] = round(peak / 1024, 1)
+    finally:
+        tracemalloc.stop()
+
+
+def check_crawl_token(request):
+    """크롤러 토큰(CRAWL_AUTH_TOKEN) 확인, 통과하면 None, 아니면 오류 응답"""
+    auth_token = request.headers.get('Authorization', '').replace('Bearer ', '')
+    expected_token = os.getenv('CRAWL_AUTH_TOKEN')
+
+    if not expected_token:
+        logger.error("CRAWL_AUTH_TOKEN 환경 변수가 설정되지 않았습니다.")
+        return JsonResponse({'error': 'Internal Server Error'}, status=500)
+
+    if auth_token != expected_token:
+        logger.warning("인증 실패: 잘못된 토큰")
+        return JsonResponse({'error': 'Unauthorized'}, status=401)
+    return None
+
+
+def parse_chunk_params(params):
+    """?batch=<id>&chunk=<순번>을 (batch_id, sequence)로 변환 (형식이 틀리면 None)"""
+    batch_id = params.get('batch', '')
+    sequence = params.get('chunk', '')
+    if not BATCH_ID_PATTERN.fullmatch(batch_id) or not sequence.isdigit():
+        return None
+    return batch_id, int(sequence)
+
+
 @method_decorator(csrf_exempt, name='dispatch')
 class ImportDataView(View):
-    """GitHub Actions에서 JSON 데이터를 받아서 저장"""
-    
+    """
+    GitHub Actions에서 JSON 데이터를 받아서 저장
+    {"notices": [...]} 본문(또는 Content-Type이 application/x-ndjson이면 한 줄에 공지사항 하나인 NDJSON)을
+    스트림에서 조금씩 읽으면서 IMPORT_BATCH_SIZE개씩 트랜잭션으로 upsert한다 (NoticeImporter).
+    Content-Encoding: gzip 본문은 읽으면서 압축을 푼다.
+
+    비동기: IMPORT_ASYNC=true이거나 Prefer: respond-async 헤더가 있으면 본문을 spool 파일에 저장하고
+    202와 작업 id로 바로 응답한다. worker가 저장하는 동안 /api/v1/import-jobs/<id>/로 진행 상황을 본다.
+
+    나눠 보내기: POST ?batch=<id>&chunk=<순번>
+    - 조각 하나를 한 트랜잭션으로 저장하고 ImportChunk에 기록한다 (중간에 실패하면 그 조각은 저장되지 않음)
+    - 이미 저장했거나 저장을 기다리는 조각을 다시 받으면 저장하지 않고 duplicate로 응답한다
+    - GET ?batch=<id>로 저장을 마친 조각(chunks)과 기다리는 조각(pending) 순번을 확인해서, 다시 보낼 때 건너뛸 수 있다
+    """
+
+    def get(self, request):
+        denied = check_crawl_token(request)
+        if denied is not None:
+            return denied
+        batch_id = request.GET.get('batch', '')
+        if not BATCH_ID_PATTERN.fullmatch(batch_id):
+            return JsonResponse({'error': 'batch가 필요합니다'}, status=400)
+        return JsonResponse(batch_status(batch_id))
+
     def post(self, request):
         try:
-            # 간단한 토큰 확인
-            auth_token = request.headers.get('Authorization', '').replace('Bearer ', '')
-            expected_token = os.getenv('CRAWL_AUTH_TOKEN')
-            
-            if not expected_token:
-                logger.error("CRAWL_AUTH_TOKEN 환경 변수가 설정되지 않았습니다.")
-                return JsonResponse({'error': 'Internal Server Error'}, status=500)
-            
-            if auth_token != expected_token:
-                logger.warning("인증 실패: 잘못된 토큰")
-                return JsonResponse({'error': 'Unauthorized'}, status=401)
-            
-            # JSON 데이터 파싱
+            denied = check_crawl_token(request)
+            if denied is not None:
+                return denied
+
+            encoding = request.headers.get('Content-Encoding', 'identity').lower()
+            if encoding not in ('identity', 'gzip'):
+                return JsonResponse({'error': f'Unsupported Content-Encoding: {encoding}'}, status=415)
+
+            chunk = None
+            if 'batch' in request.GET or 'chunk' in request.GET:
+                chunk = parse_chunk_params(request.GET)
+                if chunk is None:
+                    return JsonResponse({'error': 'batch와 chunk(0 이상의 정수)가 필요합니다'}, status=400)
+
+            if getattr(settings, 'IMPORT_ASYNC', False) or 'respond-async' in request.headers.get('Prefer', ''):
+                return self.enqueue(request, encoding, chunk)
+
+            started = time.perf_counter()
+            importer = NoticeImporter()
             try:
-                data = json.loads(request.body)
-                notices_data = data.get('notices', [])
-            except json.JSONDecodeError as e:
+                # 최대 메모리는 프로세스 평생 최대치(ru_maxrss)가 아니라 이 요청의 저장 동안만 잰다
+                with traced_peak_memory() as memory:
+                    if chunk is not None:
+                        imported = importer.import_chunk(request, request.content_type, encoding, *chunk)
+                    else:
+                        imported = importer.import_stream(request, request.content_type, encoding)
+                if imported is None:
+                    logger.info(f"이미 저장한 조각: {chunk[0]}#{chunk[1]}")
+                    return JsonResponse({'success': True, 'duplicate': True, **batch_status(chunk[0])})
+                summaries, received = imported
+            except zlib.error as e:
+                logger.error(f"gzip 본문 오류: {str(e)}")
+                return JsonResponse({'error': 'Invalid gzip body'}, status=400)
+            except ValueError as e:
                 logger.error(f"JSON 디코딩 오류: {str(e)}")
                 return JsonResponse({'error': 'Invalid JSON format'}, status=400)
-            
-            if not notices_data:
+            elapsed = time.perf_counter() - started
+
+            if not received:
                 logger.warning("공지사항 데이터가 없습니다.")
                 return JsonResponse({'error': 'No notices data'}, status=400)
-            
-            saved_count = 0
-            for notice_data in notices_data:
-                try:
-                    # 데이터 유효성 검사
-                    required_keys = ('title', 'url', 'date', 'board_name', 'crawled_at')
-                    if not all(key in notice_data for key in required_keys):
-                        missing = [k for k in required_keys if k not in notice_data]
-                        logger.warning(f"필수 필드 누락({missing}): {notice_data}")
-                        continue
-
-                    # 게시판 찾기
-                    board = NoticeBoard.objects.filter(name=notice_data['board_name']).first()
-                    if not board:
-                        logger.warning(f"게시판을 찾을 수 없음: {notice_data['board_name']}")
-                        continue
-
-                    # 이미 있으면 update, 없으면 create (upsert)
-                    notice_obj, created = Notice.objects.update_or_create(
-                        board=board,
-                        published_date=datetime.fromisoformat(notice_data['date']).date(),
-                        title=notice_data['title'],
-                        defaults={
-                            'url': notice_data['url'],
-                            'display_order': notice_data.get('display_order', 0),
-                            'crawled_at': datetime.fromisoformat(notice_data['crawled_at'])
-                        }
-                    )
-                    saved_count += 1
-                    logger.info(f"공지사항 {'생성' if created else '업데이트'}: id={notice_obj.id}, title={notice_obj.title}, board={board.name}")
-                except Exception as e:
-                    logger.error(f"공지사항 처리 중 오류: {str(e)}, 데이터: {notice_data}")
-                    continue
-            
-            return JsonResponse({
+
+            total = summarize_import(summaries)
+            rows_per_second = round(received / elapsed, 1) if elapsed > 0 else None
+            logger.info(f"공지사항 가져오기 완료: {received}건, {elapsed:.2f}s ({rows_per_second} rows/s)")
+            response = {
                 'success': True,
-                'saved_count': saved_count
-            })
-            
+                'saved_count': total.created + total.updated + total.unchanged,
+                **total.as_dict(),
+                'received': received,
+                'elapsed_seconds': round(elapsed, 3),
+                'rows_per_second': rows_per_second,
+                'peak_memory_kb': memory['peak_memory_kb'],
+            }
+            if chunk is not None:
+                response.update(duplicate=False, **batch_status(chunk[0]))
+            return JsonResponse(response)
+
         except Exception as e:
             logger.exception("예상치 못한 오류 발생")
-            return JsonResponse({'error': str(e)}, status=500)
\ No newline at end of file
+            return JsonResponse({'error': str(e)}, status=500)
+
+    def enqueue(self, request, encoding, chunk):
+        """본문을 spool 파일에 저장하고 202와 작업 id로 바로 응답 (worker가 나중에 저장)"""
+        if request.content_type not in ('application/json', *NDJSON_CONTENT_TYPES):
+            return JsonResponse({'error': f'Unsupported Content-Type: {request.content_type}'}, status=415)
+        if chunk is not None and chunk_is_held(*chunk):
+            logger.info(f"이미 받은 조각: {chunk[0]}#{chunk[1]}")
+            return JsonResponse({'success': True, 'duplicate': True, **batch_status(chunk[0])})
+
+        job = spool_request(request, request.content_type, '' if encoding == 'identity' else encoding, chunk)
+        if job is None:
+            logger.warning("공지사항 데이터가 없습니다.")
+            return JsonResponse({'error': 'No notices data'}, status=400)
+        status_url = reverse('notices:import_job', args=[job.id])
+        response = JsonResponse({'success': True, **job.as_dict(), 'status_url': status_url}, status=202)
+        response['Location'] = status_url
+        return response
+
+
+class ImportJobView(View):
+    """비동기 가져오기 작업의 상태, 진행 상황(저장한 건수), 처리 속도"""
+
+    def get(self, request, job_id):
+        denied = check_crawl_token(request)
+        if denied is not None:
+            return denied
+        try:
+            job = ImportJob.objects.get(id=job_id)
+        except ImportJob.DoesNotExist:
+            return JsonResponse({'error': 'Not found'}, status=404)
+        data = job.as_dict()
+        if job.status == ImportJob.QUEUED:
+            data['queue_position'] = ImportJob.objects.filter(status=ImportJob.QUEUED, id__lt=job.id).count()
+        return JsonResponse(data)
+
+
+class SyncManifestView(View):
+    """
+    크롤러가 바뀐 공지사항만 보낼 수 있도록 저장된 공지사항의 {natural_key: content_hash} 목록을 반환
+    GET ?board=학생소식&board=행정소식&since=YYYY-MM-DD
+    -> {"since": ..., "boards": {"학생소식": {"412197": "9f86d081884c7d65", ...}, ...}}
+    since를 주면 그 날짜 이후 글만 담아서, 크롤링한 범위만큼의 크기로 유지한다.
+    서버에 없는 게시판은 boards에서 빠진다 (보내도 저장되지 않음).
+    """
+
+    def get(self, request):
+        denied = check_crawl_token(request)
+        if denied is not None:
+            return denied
+
+        board_names = request.GET.getlist('board')
+        if not board_names:
+            return JsonResponse({'error': 'board가 필요합니다'}, status=400)
+        since = request.GET.get('since')
+        notices = Notice.objects.filter(board__name__in=board_names)
+        if since:
+            try:
+                notices = notices.filter(published_date__gte=datetime.strptime(since, '%Y-%m-%d').date())
+            except ValueError:
+                return JsonResponse({'error': '잘못된 날짜 형식입니다.'}, status=400)
+
+        boards = {name: {} for name in NoticeBoard.objects.filter(name__in=board_names).values_list('name', flat=True)}
+        for board_name, natural_key, content_hash in notices.values_list('board__name', 'natural_key', 'content_hash'):
+            boards[board_name][natural_key] = content_hash
+        logger.info(f"동기화 목록: 게시판 {len(boards)}개, 공지사항 {sum(map(len, boards.values()))}개 (since={since})")
+        return JsonResponse(
+            {'since': since, 'boards': boards},
+            json_dumps_params={'ensure_ascii': False, 'separators': (',', ':')},
+        )
@@ -0,0 +1,170 @@
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from notices.models import ImportChunk, ImportJob, NoticeBoard
+from notices.src.ingest import IngestResult, build_notice, bulk_upsert_notices
+from notices.src.jsonstream import NDJSON_CONTENT_TYPES, GzipStreamReader, iter_json_array, iter_ndjson
+from notices.src.pipeline import normalize_notice
+from notices.src.response_cache import bump_data_version
+from notices.src.snapshots import schedule_snapshot_refresh
+from collections import defaultdict
+from datetime import timedelta
+import logging
+
+logger = logging.getLogger(__name__)
+
+REQUIRED_KEYS = ('title', 'url', 'date', 'board_name', 'crawled_at')
+
+
+class BoardImportSummary:
+    """게시판별 가져오기 집계"""
+
+    def __init__(self):
+        self.received = 0
+        self.invalid = 0
+        self.duplicates = 0
+        self.result = IngestResult()
+
+
+def summarize_import(summaries, log=True):
+    """게시판별 집계를 합친 IngestResult (중복과 형식 오류는 skipped)"""
+    total = IngestResult()
+    for board_name, summary in summaries.items():
+        total += summary.result
+        total.skipped += summary.invalid + summary.duplicates
+        if log:
+            logger.info(
+                f"공지사항 가져오기 [{board_name}] 수신 {summary.received}, "
+                f"생성 {summary.result.created}, 갱신 {summary.result.updated}, "
+                f"변경 없음 {summary.result.unchanged}, 중복 {summary.duplicates}, 건너뜀 {summary.invalid}"
+            )
+    return total
+
+
+def batch_status(batch_id):
+    """나눠 보내기에서 저장을 마친 조각 순번과 합계 (pending: 비동기 작업으로 저장을 기다리는 조각)"""
+    chunks = list(ImportChunk.objects.filter(batch_id=batch_id).order_by('sequence').values_list('sequence', 'received'))
+    pending = ImportJob.objects.filter(batch_id=batch_id, status__in=ImportJob.ACTIVE_STATUSES)
+    return {
+        'batch': batch_id,
+        'chunks': [sequence for sequence, _ in chunks],
+        'chunks_received': sum(received for _, received in chunks),
+        'pending': sorted(pending.values_list('sequence', flat=True)),
+    }
+
+
+class NoticeImporter:
+    """
+    {"notices": [...]} JSON 또는 NDJSON 스트림을 조금씩 읽으면서 IMPORT_BATCH_SIZE개씩 트랜잭션으로 upsert
+    요청 본문(ImportDataView)과 spool 파일(비동기 가져오기 worker)에 같이 쓴다.
+    """
+
+    def __init__(self, batch_size=None, on_batch=None):
+        self.batch_size = batch_size or getattr(settings, 'IMPORT_BATCH_SIZE', 500)
+        self.on_batch = on_batch    # 배치를 저장할 때마다 (수신 건수, 게시판별 집계)로 호출 (진행 상황 기록용)
+
+    def import_stream(self, stream, content_type, encoding=''):
+        """스트림을 읽으면서 배치 단위로 저장하고 (게시판별 집계, 수신 건수) 반환"""
+        # 게시판은 한 번만 조회 (이름이 같으면 id가 가장 작은 게시판)
+        boards = {}
+        for board in NoticeBoard.objects.order_by('-id'):
+            boards[board.name] = board
+
+        summaries = defaultdict(BoardImportSummary)
+        try:
+            received = self.read_batches(stream, content_type, encoding, boards, summaries)
+        finally:
+            # 중간에 JSON 오류가 나도 이미 저장된 배치가 있으면 캐시를 무효화 (조각 트랜잭션 안이면 커밋된 뒤에)
+            if any(summary.result.created or summary.result.updated for summary in summaries.values()):
+                transaction.on_commit(bump_data_version)
+                schedule_snapshot_refresh(set().union(*(summary.result.dates for summary in summaries.values())))
+
+        for board_name, summary in summaries.items():
+            if summary.invalid:
+                reason = '게시판을 찾을 수 없음' if board_name not in boards else '필수 필드 누락 또는 형식 오류'
+                logger.warning(f"공지사항 {summary.invalid}건 건너뜀 [{board_name}]: {reason}")
+        return summaries, received
+
+    def import_chunk(self, stream, content_type, encoding, batch_id, sequence):
+        """
+        조각 하나를 한 트랜잭션으로 저장하고 (게시판별 집계, 수신 건수) 반환
+        이미 저장한 조각이면 None (동시에 같은 조각이 와도 한쪽만 저장된다)
+        """
+        with transaction.atomic():
+            try:
+                with transaction.atomic():
+                    chunk = ImportChunk.objects.create(batch_id=batch_id, sequence=sequence)
+            except IntegrityError:
+                return None
+            summaries, received = self.import_stream(stream, content_type, encoding)
+            if not received:
+                # 빈 조각은 기록하지 않는다
+                transaction.set_rollback(True)
+                return summaries, received
+            total = summarize_import(summaries, log=False)
+            chunk.received, chunk.created, chunk.updated = received, total.created, total.updated
+            chunk.save(update_fields=['received', 'created', 'updated'])
+
+        retention = timedelta(days=getattr(settings, 'IMPORT_CHUNK_RETENTION_DAYS', 7))
+        ImportChunk.objects.filter(created_at__lt=timezone.now() - retention).delete()
+        return summaries, received
+
+    def read_batches(self, stream, content_type, encoding, boards, summaries):
+        """스트림의 공지사항을 batch_size개씩 저장하고 수신 건수 반환"""
+        seen = set()
+        batch = []
+        received = 0
+        if encoding == 'gzip':
+            stream = GzipStreamReader(stream)
+        if content_type in NDJSON_CONTENT_TYPES:
+            notices = iter_ndjson(stream)
+        else:
+            notices = iter_json_array(stream, 'notices')
+        for notice_data in notices:
+            received += 1
+            if not isinstance(notice_data, dict):
+                summaries['(unknown)'].invalid += 1
+                continue
+            board_name = notice_data.get('board_name') or '(unknown)'
+            summary = summaries[board_name]
+            summary.received += 1
+
+            # 데이터 유효성 검사
+            board = boards.get(board_name)
+            if board is None or not all(key in notice_data for key in REQUIRED_KEYS):
+                summary.invalid += 1
+                continue
+            try:
+                notice = build_notice(board, normalize_notice(notice_data))
+            except (TypeError, ValueError) as e:
+                logger.warning(f"공지사항 변환 실패: {e}, 데이터: {notice_data}")
+                summary.invalid += 1
+                continue
+
+            # 상단 고정 공지처럼 같은 게시글이 다시 나오면 처음 것만 저장 (배치가 달라도 동일)
+            key = (board.id, notice.natural_key)
+            if key in seen:
+                summary.duplicates += 1
+                continue
+            seen.add(key)
+            batch.append(notice)
+
+            if len(batch) >= self.batch_size:
+                self.flush(batch, summaries, received)
+                batch = []
+        if batch:
+            self.flush(batch, summaries, received)
+        if getattr(stream, 'truncated', False):
+            raise ValueError('gzip 본문이 중간에 끊겼습니다.')
+        return received
+
+    def flush(self, batch, summaries, received):
+        """한 배치를 트랜잭션 하나로 저장 (게시판별로 결과 집계)"""
+        by_board = defaultdict(list)
+        for notice in batch:
+            by_board[notice.board.name].append(notice)
+        with transaction.atomic():
+            for board_name, notices in by_board.items():
+                summaries[board_name].result += bulk_upsert_notices(notices, chunk_size=len(notices))
+        if self.on_batch is not None:
+            self.on_batch(received, summaries)
@@ -0,0 +1,165 @@
+from django.db import transaction
+from django.utils import timezone
+from notices.models import CONTENT_HASH_FIELDS, Notice, notice_content_hash, notice_natural_key
+from notices.src.summary import refresh_daily_counts
+from datetime import date, datetime
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 충돌(같은 board, natural_key) 시 갱신하는 필드
+# 목록 위치와 조회수는 내용 해시에 들어가지 않아서, 내용이 바뀐 글을 다시 쓸 때만 같이 갱신된다.
+UPSERT_FIELDS = CONTENT_HASH_FIELDS + ('display_order', 'view_count', 'content_hash')
+
+DEFAULT_CHUNK_SIZE = 500
+
+
+class IngestResult:
+    """일괄 저장 결과 (새로 생성 / 변경되어 갱신 / 변경 없음 / 건너뜀, dates: 생성되거나 갱신된 글의 게시일)"""
+
+    def __init__(self, created=0, updated=0, unchanged=0, skipped=0, dates=None):
+        self.created = created
+        self.updated = updated
+        self.unchanged = unchanged
+        self.skipped = skipped
+        self.dates = set(dates or ())
+
+    def __add__(self, other):
+        return IngestResult(
+            self.created + other.created,
+            self.updated + other.updated,
+            self.unchanged + other.unchanged,
+            self.skipped + other.skipped,
+            self.dates | other.dates,
+        )
+
+    def as_dict(self):
+        return {
+            'created': self.created,
+            'updated': self.updated,
+            'unchanged': self.unchanged,
+            'skipped': self.skipped,
+        }
+
+    def __repr__(self):
+        return f"IngestResult({self.as_dict()})"
+
+
+def _to_date(value):
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return datetime.fromisoformat(value).date()
+
+
+def _to_datetime(value):
+    if not isinstance(value, datetime):
+        value = datetime.fromisoformat(value)
+    if timezone.is_naive(value):
+        value = timezone.make_aware(value)
+    return value
+
+
+def build_notice(board, row):
+    """
+    정리된 공지사항 dict(normalize_notice 결과)로 저장 전 Notice 객체 생성
+    crawled_at은 처음 저장될 때만 기록되고 이후 upsert에서는 바뀌지 않는다.
+    """
+    notice = Notice(
+        board=board,
+        natural_key=notice_natural_key(row['url'], row['title']),
+        title=row['title'],
+        url=row['url'],
+        published_date=_to_date(row['date']),
+        display_order=row.get('display_order') or 0,
+        author=row.get('author'),
+        view_count=row.get('view_count') or 0,
+        is_important=bool(row.get('is_important')),
+    )
+    notice.content_hash = notice_content_hash(getattr(notice, field) for field in CONTENT_HASH_FIELDS)
+    if row.get('crawled_at'):
+        notice.crawled_at = _to_datetime(row['crawled_at'])
+    return notice
+
+
+def notice_digest(row):
+    """정리된 공지사항 dict의 (natural_key, content_hash) - 서버에 저장될 값과 같다"""
+    notice = build_notice(None, row)
+    return notice.natural_key, notice.content_hash
+
+
+def _chunks(iterable, size):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _upsert_chunk(notices):
+    result = IngestResult()
+
+    # 같은 묶음 안에서 키가 겹치면 (상단 고정 공지 등) 처음 나온 행만 사용
+    by_key = {}
+    for notice in notices:
+        key = (notice.board_id, notice.natural_key)
+        if key in by_key:
+            result.skipped += 1
+            continue
+        by_key[key] = notice
+
+    # 내용 해시가 같으면 변경 없음, 날짜/중요 여부는 일별 집계(NoticeDailyCount)를 다시 계산할지 판단용
+    existing = {
+        (board_id, natural_key): (content_hash, published_date, is_important)
+        for board_id, natural_key, content_hash, published_date, is_important in Notice.objects.filter(
+            board_id__in={key[0] for key in by_key},
+            natural_key__in={key[1] for key in by_key},
+        ).values_list('board_id', 'natural_key', 'content_hash', 'published_date', 'is_important')
+    }
+
+    to_write = []
+    count_keys = set()
+    for key, notice in by_key.items():
+        current = existing.get(key)
+        if current is None:
+            result.created += 1
+            count_keys.add((notice.board_id, notice.published_date))
+        elif notice.content_hash != current[0]:
+            result.updated += 1
+            if (notice.published_date, notice.is_important) != current[1:]:
+                count_keys.add((notice.board_id, notice.published_date))
+                count_keys.add((notice.board_id, current[1]))
+        else:
+            result.unchanged += 1
+            continue
+        result.dates.add(notice.published_date)
+        if current is not None:
+            result.dates.add(current[1])
+        to_write.append(notice)
+
+    if to_write:
+        Notice.objects.bulk_create(
+            to_write,
+            update_conflicts=True,
+            unique_fields=['board', 'natural_key'],
+            update_fields=list(UPSERT_FIELDS),
+        )
+    refresh_daily_counts(count_keys)
+    return result
+
+
+def bulk_upsert_notices(notices, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Notice 객체들을 (board, natural_key) 기준으로 일괄 upsert
+    chunk_size개씩 트랜잭션 하나로 묶어 저장하고, 바뀐 행만 쓴다.
+    새 글이 생기거나 날짜/중요 여부가 바뀐 (게시판, 날짜)의 일별 집계도 같은 트랜잭션에서 갱신한다.
+    """
+    total = IngestResult()
+    for chunk in _chunks(notices, chunk_size):
+        with transaction.atomic():
+            total += _upsert_chunk(chunk)
+    return total
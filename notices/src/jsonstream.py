@@ -0,0 +1,288 @@
+import codecs
+import gzip
+import json
+import logging
+import zlib
+
+logger = logging.getLogger(__name__)
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = ' \t\n\r'
+# 버퍼 끝에서 잘렸을 수 있는 토큰(-Infinity, \uXXXX 이스케이프 등)의 최대 길이
+_TRUNCATION_MARGIN = 16
+
+
+class _Reader:
+    """스트림에서 필요한 만큼만 읽어 오는 텍스트 버퍼"""
+
+    def __init__(self, stream, chunk_size):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.decoder = codecs.getincrementaldecoder('utf-8')()
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+
+    def fill(self, size=1):
+        """데이터를 size글자 이상(끝이면 거기까지) 더 읽어 오고, 더 읽을 게 없으면 False"""
+        if self.eof:
+            return False
+        # 이미 처리한 앞부분은 버려서 버퍼가 계속 커지지 않게 하고, 읽은 조각은 한 번에 이어 붙인다
+        pieces = [self.buffer[self.pos:]]
+        added = 0
+        read = False
+        while added < size or not read:
+            data = self.stream.read(self.chunk_size)
+            if not data:
+                self.eof = True
+                pieces.append(self.decoder.decode(b'', final=True))
+                break
+            if isinstance(data, str):
+                data = data.encode('utf-8')
+            read = True
+            text = self.decoder.decode(data)
+            pieces.append(text)
+            added += len(text)
+        self.buffer = ''.join(pieces)
+        self.pos = 0
+        return read
+
+    def error(self, message):
+        return json.JSONDecodeError(message, self.buffer, self.pos)
+
+    def peek(self):
+        """공백을 건너뛰고 다음 글자 반환 (끝이면 '')"""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                return ''
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise self.error(f"'{char}'가 필요합니다")
+        self.pos += 1
+
+    def value(self):
+        """
+        JSON 값 하나를 읽어서 반환 (값이 버퍼 끝에 걸리면 더 읽은 뒤 다시 시도)
+        다시 시도할 때마다 남은 버퍼를 두 배로 늘려서, 큰 값 하나를 다시 파싱하는 비용이 값 크기에 비례하게 한다.
+        오류가 버퍼 끝보다 앞에서 났으면 더 읽어도 그대로이므로, 나머지 본문을 읽지 않고 바로 던진다.
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError as e:
+                truncated = (
+                    len(self.buffer) - e.pos <= _TRUNCATION_MARGIN
+                    or e.msg.startswith('Unterminated string')
+                )
+                if truncated and not self.eof:
+                    self.fill(max(len(self.buffer) - self.pos, _TRUNCATION_MARGIN))
+                    continue
+                raise
+            # 1.5가 1로 읽히는 것처럼 버퍼 끝에서 잘렸을 수 있는 값은 더 읽어서 다시 파싱
+            if len(self.buffer) - end < _TRUNCATION_MARGIN and not self.eof:
+                self.fill(max(len(self.buffer) - self.pos, _TRUNCATION_MARGIN))
+                continue
+            self.pos = end
+            return value
+
+
+def iter_json_array(stream, key, chunk_size=64 * 1024):
+    """
+    {"key": [...], ...} 형태의 JSON을 스트림에서 조금씩 읽으면서 key 배열의 원소를 하나씩 반환
+    다른 최상위 키의 값은 읽고 버린다. 형식이 잘못되면 json.JSONDecodeError를 던진다.
+    """
+    reader = _Reader(stream, chunk_size)
+    reader.expect('{')
+    if reader.peek() == '}':
+        return
+    while True:
+        name = reader.value()
+        if not isinstance(name, str):
+            raise reader.error("객체 키는 문자열이어야 합니다")
+        reader.expect(':')
+        if name == key and reader.peek() == '[':
+            reader.pos += 1
+            if reader.peek() == ']':
+                reader.pos += 1
+            else:
+                while True:
+                    yield reader.value()
+                    char = reader.peek()
+                    reader.pos += 1
+                    if char == ']':
+                        break
+                    if char != ',':
+                        raise reader.error("',' 또는 ']'가 필요합니다")
+        else:
+            reader.value()
+
+        char = reader.peek()
+        reader.pos += 1
+        if char == '}':
+            break
+        if char != ',':
+            raise reader.error("',' 또는 '}'가 필요합니다")
+
+    if reader.peek() != '':
+        raise reader.error("JSON 뒤에 불필요한 데이터가 있습니다")
+
+
+NDJSON_CONTENT_TYPES = ('application/x-ndjson', 'application/jsonl')
+
+
+def is_gzip_path(path):
+    return str(path).endswith('.gz')
+
+
+def is_ndjson_path(path):
+    """파일 이름으로 NDJSON(한 줄에 JSON 객체 하나) 형식인지 판단 (.ndjson, .jsonl, 뒤에 .gz 가능)"""
+    name = str(path)[:-3] if is_gzip_path(path) else str(path)
+    return name.endswith(('.ndjson', '.jsonl'))
+
+
+class GzipStreamReader:
+    """
+    gzip 스트림을 조금씩 풀어 주는 읽기 전용 파일 객체 (여러 member가 이어진 gzip도 읽는다)
+    쓰는 도중이거나 중간에 끊긴 파일은 예외 없이 풀 수 있는 데까지만 돌려준다.
+    """
+
+    def __init__(self, raw, chunk_size=64 * 1024):
+        self.raw = raw
+        self.chunk_size = chunk_size
+        self.decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        self.finished = False
+        self.truncated = False
+
+    def read(self, size=-1):
+        """다음으로 풀린 데이터 (size와 관계없이 풀린 만큼 돌려주고, 끝이면 b'')"""
+        while not self.finished:
+            data = self.raw.read(self.chunk_size)
+            if not data:
+                self.finished = True
+                # 마지막 member가 끝나지 않았으면 쓰는 중이거나 잘린 파일
+                self.truncated = not self.decompressor.eof
+                return self.decompressor.flush()
+            output = self.decompressor.decompress(data)
+            while self.decompressor.eof and self.decompressor.unused_data:
+                rest = self.decompressor.unused_data
+                self.decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+                output += self.decompressor.decompress(rest)
+            if output:
+                return output
+        return b''
+
+    def close(self):
+        self.raw.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def iter_ndjson(stream, chunk_size=64 * 1024):
+    """
+    스트림에서 조금씩 읽으면서 한 줄에 하나씩 있는 JSON 값을 반환 (빈 줄은 건너뜀)
+    한 번에 한 줄만 메모리에 둔다. 잘못된 줄이 있으면 몇 번째 줄인지 담아 json.JSONDecodeError를 던진다.
+    """
+    # 아직 줄바꿈이 오지 않은 줄의 조각들 (줄이 끝났을 때 한 번만 이어 붙인다)
+    pending = []
+    line_number = 0
+    while True:
+        data = stream.read(chunk_size)
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        if not data:
+            break
+        if b'\n' not in data:
+            pending.append(data)
+            continue
+        lines = data.split(b'\n')
+        pending.append(lines[0])
+        lines[0] = b''.join(pending)
+        pending = [lines.pop()]
+        for line in lines:
+            line_number += 1
+            value = _ndjson_line(line, line_number)
+            if value is not None:
+                yield value
+    rest = b''.join(pending)
+    if rest:
+        value = _ndjson_line(rest, line_number + 1)
+        if value is not None:
+            yield value
+
+
+def _ndjson_line(line, line_number):
+    text = line.decode('utf-8').strip()
+    if not text:
+        return None
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError as e:
+        raise json.JSONDecodeError(f"{line_number}번째 줄: {e.msg}", e.doc, e.pos) from None
+
+
+def iter_export_file(path, key='notices'):
+    """
+    크롤링 결과 파일의 공지사항을 하나씩 반환
+    NDJSON(.ndjson/.jsonl)과 예전 {"notices": [...]} JSON 모두 읽고, .gz면 압축을 풀면서 읽는다.
+    쓰는 도중 중단되어 gzip 끝이 잘린 파일은 읽을 수 있는 데까지만 읽는다.
+    """
+    with open_export_file(path) as f:
+        if is_ndjson_path(path):
+            yield from iter_ndjson(f)
+        else:
+            yield from iter_json_array(f, key)
+        if getattr(f, 'truncated', False):
+            logger.warning(f"{path}: 압축 파일이 중간에 끊겨 있어 읽을 수 있는 데까지만 읽었습니다.")
+
+
+def open_export_file(path):
+    """크롤링 결과 파일을 바이너리 읽기용으로 연다 (.gz면 GzipStreamReader로 풀면서 읽음)"""
+    raw = open(path, 'rb')
+    return GzipStreamReader(raw) if is_gzip_path(path) else raw
+
+
+class NdjsonWriter:
+    """
+    공지사항을 한 줄에 하나씩 공백 없는 JSON으로 이어 쓰는 writer (.gz면 gzip 압축)
+    flush()할 때마다 지금까지 쓴 내용이 파일에 반영되어, 중간에 멈춰도 그때까지의 결과는 남는다.
+    """
+
+    def __init__(self, path, compresslevel=6):
+        self.path = path
+        if is_gzip_path(path):
+            self.file = gzip.open(path, 'wb', compresslevel=compresslevel)
+        else:
+            self.file = open(path, 'wb')
+        self.count = 0
+
+    def write(self, record):
+        self.file.write(json.dumps(record, ensure_ascii=False, separators=(',', ':')).encode('utf-8') + b'\n')
+        self.count += 1
+
+    def write_many(self, records):
+        for record in records:
+            self.write(record)
+        self.flush()
+
+    def flush(self):
+        # gzip은 여기까지 압축한 블록을 내보내서(Z_SYNC_FLUSH) 중간 결과도 풀 수 있게 한다
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
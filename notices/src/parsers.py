@@ -0,0 +1,334 @@
+from bs4 import BeautifulSoup
+from django.conf import settings
+from html.parser import HTMLParser
+from datetime import datetime
+import hashlib
+import logging
+import re
+
+try:
+    from lxml import etree, html as lxml_html
+except ImportError:  # pip install 'knu-notice-v2[fast]'
+    lxml_html = None
+
+logger = logging.getLogger(__name__)
+
+
+def build_notice_row(board_name, num, title, url, author, date, view_count, is_important):
+    """파서가 찾은 값으로 공지사항 dict 생성 (모든 파서가 같은 형식을 돌려주도록)"""
+    # 작성일 (YYYY-MM-DD로 변환)
+    if date and '.' in date:
+        try:
+            date = datetime.strptime(date, '%Y.%m.%d').strftime('%Y-%m-%d')
+        except Exception as e:
+            logger.warning(f"날짜 변환 실패: {date} ({e})")
+    return {
+        "title": title,
+        "url": url,
+        "is_important": is_important,
+        "num": num,
+        "date": date,
+        "view_count": view_count,
+        "author": author,
+        "board_name": board_name,
+        "category_name": board_name,
+        "crawled_at": datetime.now().isoformat()
+    }
+
+
+class NoticeParser:
+    """
+    게시판 목록 HTML에서 게시물 행을 추출하는 파서 기본 클래스
+    table.board-table.horizon1 > tbody > tr 행마다 번호/제목/링크/작성자/작성일/조회수/중요 여부를 뽑는다.
+    """
+    name = None
+
+    def parse(self, html, board_name):
+        raise NotImplementedError
+
+
+class SoupParser(NoticeParser):
+    """BeautifulSoup(html.parser)로 문서 전체 트리를 만들어서 찾는 파서 (기존 방식)"""
+    name = 'soup'
+
+    def parse(self, html, board_name):
+        notices = []
+        soup = BeautifulSoup(html, 'html.parser')
+
+        # 실제 HTML 구조에 맞게 게시물 목록 추출
+        for notice in soup.select('table.board-table.horizon1 > tbody > tr'):
+            try:
+                num = notice.select_one('td.td-num')
+                subject_a = notice.select_one('td.td-subject a')
+                author = notice.select_one('td.td-write')
+                date = notice.select_one('td.td-date')
+                view_count = notice.select_one('td.td-access')
+                notices.append(build_notice_row(
+                    board_name,
+                    num=num.text.strip() if num else None,
+                    title=subject_a.text.strip() if subject_a else None,
+                    url=subject_a['href'] if subject_a and subject_a.has_attr('href') else None,
+                    author=author.text.strip() if author else None,
+                    date=date.text.strip() if date else None,
+                    view_count=view_count.text.strip() if view_count else None,
+                    # 중요 공지사항 (예: 아이콘 등)
+                    is_important=bool(notice.select_one('span.icon-important')),
+                ))
+            except Exception as e:
+                logger.error(f"Error processing notice: {e}")
+                continue
+        return notices
+
+
+def _has_class(name):
+    return f'contains(concat(" ", normalize-space(@class), " "), " {name} ")'
+
+
+class LxmlParser(NoticeParser):
+    """lxml(libxml2)로 트리를 만들고 미리 컴파일한 XPath로 찾는 파서 (lxml 필요)"""
+    name = 'lxml'
+
+    if lxml_html is not None:
+        ROWS = etree.XPath(f'//table[{_has_class("board-table")} and {_has_class("horizon1")}]/tbody/tr')
+        CELLS = {
+            name: etree.XPath(f'.//td[{_has_class(css)}]')
+            for name, css in (('num', 'td-num'), ('author', 'td-write'), ('date', 'td-date'), ('view_count', 'td-access'))
+        }
+        SUBJECT_LINK = etree.XPath(f'.//td[{_has_class("td-subject")}]//a')
+        IMPORTANT = etree.XPath(f'.//span[{_has_class("icon-important")}]')
+
+    def __init__(self):
+        if lxml_html is None:
+            raise ImportError("lxml 파서를 쓰려면 lxml을 설치하세요 (pip install 'knu-notice-v2[fast]').")
+
+    def parse(self, html, board_name):
+        notices = []
+        if not html.strip():
+            return notices
+        document = lxml_html.document_fromstring(html)
+        for notice in self.ROWS(document):
+            try:
+                values = {}
+                for name, xpath in self.CELLS.items():
+                    cells = xpath(notice)
+                    values[name] = cells[0].text_content().strip() if cells else None
+                links = self.SUBJECT_LINK(notice)
+                subject_a = links[0] if links else None
+                notices.append(build_notice_row(
+                    board_name,
+                    title=subject_a.text_content().strip() if subject_a is not None else None,
+                    url=subject_a.get('href') if subject_a is not None else None,
+                    is_important=bool(self.IMPORTANT(notice)),
+                    **values,
+                ))
+            except Exception as e:
+                logger.error(f"Error processing notice: {e}")
+                continue
+        return notices
+
+
+# 게시판 표의 시작 태그 (class 순서가 바뀌어도 찾도록 따로 확인)
+_TABLE_TAG = re.compile(r'<table\b[^>]*>', re.IGNORECASE)
+_TBODY_START = re.compile(r'<tbody\b[^>]*>', re.IGNORECASE)
+_TABLE_END = re.compile(r'</table\s*>', re.IGNORECASE)
+_ROW_START = re.compile(r'<tr\b', re.IGNORECASE)
+_CELL_FIELDS = {'td-num': 'num', 'td-write': 'author', 'td-date': 'date', 'td-access': 'view_count'}
+
+# HTML에서 닫는 태그가 없는 빈 요소
+_VOID_TAGS = {'br', 'img', 'input', 'hr', 'meta', 'link', 'col', 'wbr', 'source', 'area', 'base', 'embed'}
+
+
+def board_tbody(html):
+    """board-table horizon1 표의 <tbody>...</tbody> 부분 (없으면 None)"""
+    for match in _TABLE_TAG.finditer(html):
+        class_match = re.search(r'class\s*=\s*["\']([^"\']*)["\']', match.group(0), re.IGNORECASE)
+        classes = class_match.group(1).split() if class_match else []
+        if 'board-table' not in classes or 'horizon1' not in classes:
+            continue
+        end = _TABLE_END.search(html, match.end())
+        end = end.start() if end else len(html)
+        tbody = _TBODY_START.search(html, match.end(), end)
+        if tbody is None:
+            return None
+        return html[tbody.start():end]
+    return None
+
+
+# 목록을 스크립트로 채우는 페이지 표시 (예: <script>jf_loadBoardList('KNU', '2132');</script>)
+_RENDER_SCRIPT = re.compile(r'jf_loadBoardList\s*\(', re.IGNORECASE)
+
+
+def needs_browser(html):
+    """
+    HTTP 응답만으로는 목록을 읽을 수 없어서 브라우저로 렌더링해야 하는지
+    게시판 표가 없거나, 표가 비어 있으면서 목록을 스크립트로 채우는 페이지일 때만 참이다.
+    표는 있는데 행이 없는 페이지(마지막 페이지 뒤, 글이 없는 게시판)는 그대로 빈 목록이다.
+    """
+    body = board_tbody(html)
+    if body is None:
+        return True
+    return _ROW_START.search(body) is None and _RENDER_SCRIPT.search(html) is not None
+
+
+def tbody_hash(html):
+    """
+    게시판 표 tbody의 공백을 정리한 뒤 구한 SHA-256 (행이 없으면 None)
+    페이지의 다른 부분(배너, 세션 토큰 등)이 바뀌어도 게시물 목록이 같으면 같은 값이 나온다.
+    """
+    body = board_tbody(html)
+    if body is None or not _ROW_START.search(body):
+        return None
+    return hashlib.sha256(' '.join(body.split()).encode('utf-8')).hexdigest()
+
+
+class _RowTokenizer(HTMLParser):
+    """
+    tbody 안의 tr/td/a/span 태그만 보고 행 값을 모으는 토크나이저
+    닫는 태그가 빠져 있어도 다음 tr/td가 시작되면 앞의 것을 닫고, 셀 안에 중첩된 표의 태그는 무시한다.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.rows = []
+        self.row = None
+        self.texts = None
+        self.field = None       # 지금 글자를 모으는 td 필드 이름
+        self.in_subject = False
+        self.in_link = False
+        self.nested_tables = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _VOID_TAGS:
+            return
+        if tag == 'table':
+            self.nested_tables += 1
+            return
+        if self.nested_tables:
+            return
+        if tag == 'tr':
+            self.finish_row()
+            self.row = {'num': None, 'title': None, 'url': None, 'author': None, 'date': None,
+                        'view_count': None, 'is_important': False}
+            self.texts = {}
+            return
+        if self.row is None:
+            return
+        classes = (dict(attrs).get('class') or '').split()
+        if tag == 'td':
+            self.field = next(
+                (_CELL_FIELDS[css] for css in classes if css in _CELL_FIELDS and _CELL_FIELDS[css] not in self.texts),
+                None,
+            )
+            if self.field:
+                self.texts[self.field] = []
+            self.in_subject = 'td-subject' in classes
+            self.in_link = False
+        elif tag == 'a' and self.in_subject and 'title' not in self.texts:
+            self.in_link = True
+            self.texts['title'] = []
+            self.row['url'] = dict(attrs).get('href')
+        elif tag == 'span' and 'icon-important' in classes:
+            self.row['is_important'] = True
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if tag in _VOID_TAGS:
+            return
+        if tag == 'table' and self.nested_tables:
+            self.nested_tables -= 1
+            return
+        if self.nested_tables:
+            return
+        if tag == 'a':
+            self.in_link = False
+        elif tag == 'td':
+            self.field = None
+            self.in_subject = False
+            self.in_link = False
+        elif tag in ('tr', 'tbody', 'table'):
+            self.finish_row()
+
+    def handle_data(self, data):
+        if self.field is not None:
+            self.texts[self.field].append(data)
+        if self.in_link:
+            self.texts['title'].append(data)
+
+    def finish_row(self):
+        if self.row is None:
+            return
+        for name, parts in self.texts.items():
+            self.row[name] = ''.join(parts).strip()
+        self.rows.append(self.row)
+        self.row = None
+        self.texts = None
+        self.field = None
+        self.in_subject = False
+        self.in_link = False
+
+    def close(self):
+        super().close()
+        self.finish_row()
+
+
+class StreamingParser(NoticeParser):
+    """
+    문서 전체 트리를 만들지 않고 게시판 표의 tbody 부분만 잘라서 토큰 단위로 읽는 파서
+    표준 라이브러리만 쓰고, 행 밖의 태그는 보지 않는다.
+    """
+    name = 'stream'
+
+    def parse(self, html, board_name):
+        body = board_tbody(html)
+        if body is None:
+            return []
+        tokenizer = _RowTokenizer()
+        tokenizer.feed(body)
+        tokenizer.close()
+        notices = []
+        for row in tokenizer.rows:
+            try:
+                notices.append(build_notice_row(board_name, **row))
+            except Exception as e:
+                logger.error(f"Error processing notice: {e}")
+        return notices
+
+
+def parse_board_page(html, board_name, parser_name):
+    """
+    프로세스 풀에서 부르는 파싱 함수 (모듈 최상위 함수라 pickle 가능)
+    parser_name은 'auto'가 아닌 실제 파서 이름이어야 하고, Django 앱 로딩 없이 동작한다.
+    """
+    return get_parser(parser_name).parse(html, board_name)
+
+
+PARSER_BACKENDS = {
+    'soup': SoupParser,
+    'lxml': LxmlParser,
+    'stream': StreamingParser,
+}
+
+_parsers = {}
+
+
+def available_parsers():
+    """지금 환경에서 쓸 수 있는 파서 이름 목록 (lxml이 없으면 제외)"""
+    return [name for name in PARSER_BACKENDS if name != 'lxml' or lxml_html is not None]
+
+
+def get_parser(name=None):
+    """
+    이름으로 파서 인스턴스 반환 (같은 이름이면 재사용)
+    이름이 없으면 NOTICE_PARSER 설정(기본 soup)을 따르고, 'auto'면 lxml이 있을 때 lxml, 없으면 stream을 쓴다.
+    """
+    name = name or getattr(settings, 'NOTICE_PARSER', 'soup')
+    if name == 'auto':
+        name = 'lxml' if lxml_html is not None else 'stream'
+    if name not in PARSER_BACKENDS:
+        raise ValueError(f"알 수 없는 파서: {name} (사용 가능: {', '.join(PARSER_BACKENDS)})")
+    if name not in _parsers:
+        _parsers[name] = PARSER_BACKENDS[name]()
+    return _parsers[name]
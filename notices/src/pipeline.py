@@ -0,0 +1,124 @@
+from notices.src.jsonstream import NdjsonWriter, is_ndjson_path
+from datetime import datetime
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 목록 페이지마다 display_order를 이만큼 띄워서 다른 페이지의 글과 순서가 섞이지 않게 한다
+PAGE_ORDER_STRIDE = 1000
+
+def page_display_order(page, position):
+    """목록 page페이지의 position번째(0부터, 고정글 포함) 행의 표시 순서 (크롤링과 backfill이 같은 값을 쓴다)"""
+    return (page - 1) * PAGE_ORDER_STRIDE + position
+
+def normalize_notice(notice, position=0):
+    """
+    크롤링된 공지사항 한 건을 저장/내보내기 공통 형태로 정리
+    - 날짜: 'YYYY.MM.DD' -> 'YYYY-MM-DD'
+    - 조회수: 정수 (없으면 0)
+    - 표시 순서: 값이 없으면 게시판 목록에서의 위치
+    """
+    normalized = dict(notice)
+    for key in ('title', 'url', 'author', 'num'):
+        if isinstance(normalized.get(key), str):
+            normalized[key] = normalized[key].strip()
+
+    date_str = normalized.get('date')
+    if date_str and '.' in date_str:
+        try:
+            date_str = datetime.strptime(date_str, '%Y.%m.%d').strftime('%Y-%m-%d')
+        except ValueError as e:
+            logger.warning(f"날짜 변환 실패: {date_str} ({e})")
+    normalized['date'] = date_str
+
+    view_count = normalized.get('view_count')
+    try:
+        normalized['view_count'] = int(str(view_count).replace(',', '')) if view_count not in (None, '') else 0
+    except ValueError:
+        normalized['view_count'] = 0
+
+    normalized['is_important'] = bool(normalized.get('is_important'))
+    if normalized.get('display_order') is None:
+        normalized['display_order'] = position
+    return normalized
+
+
+class DatabaseSink:
+    """정리된 공지사항을 DB에 저장하는 sink"""
+    name = 'db'
+
+    def write(self, board, notices):
+        from notices.src.tasks import save_board_notices
+        return save_board_notices(board, notices)
+
+    def close(self):
+        pass
+
+
+class JsonExportSink:
+    """정리된 공지사항을 {"notices": [...]} 형태의 JSON 파일로 내보내는 sink"""
+    name = 'export'
+
+    def __init__(self, path='crawled_data.json'):
+        self.path = path
+        self.notices = []
+
+    def write(self, board, notices):
+        self.notices.extend(notices)
+        return len(notices)
+
+    def close(self):
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump({"notices": self.notices}, f, ensure_ascii=False, indent=4)
+
+
+class NdjsonExportSink:
+    """
+    정리된 공지사항을 한 줄에 하나씩 NDJSON으로 내보내는 sink (.gz면 gzip 압축)
+    게시판 하나가 끝날 때마다 파일에 바로 써서, 메모리에 모아 두지 않고 중간에 멈춰도 결과가 남는다.
+    """
+    name = 'export'
+
+    def __init__(self, path='crawled_data.ndjson'):
+        self.path = path
+        self.writer = NdjsonWriter(path)
+
+    def write(self, board, notices):
+        self.writer.write_many(notices)
+        return len(notices)
+
+    def close(self):
+        self.writer.close()
+
+
+def create_export_sink(path):
+    """파일 이름으로 내보내기 sink 선택 (.ndjson/.jsonl[.gz]: NDJSON, 그 외: 예전 {"notices": [...]} JSON)"""
+    if is_ndjson_path(path):
+        return NdjsonExportSink(path)
+    return JsonExportSink(path)
+
+
+class CrawlPipeline:
+    """
+    fetch -> parse 결과를 한 번만 정리(normalize)해서 모든 sink에 나눠 주는 파이프라인
+    게시판마다 한 번 크롤링한 결과로 DB 저장과 내보내기를 함께 처리한다.
+    """
+
+    def __init__(self, sinks):
+        self.sinks = list(sinks)
+
+    def process(self, board, notices):
+        """sink 이름별 처리 결과 반환 (예: {'db': 3, 'export': 15})"""
+        normalized = [normalize_notice(notice, position) for position, notice in enumerate(notices)]
+        return {sink.name: sink.write(board, normalized) for sink in self.sinks}
+
+    def close(self):
+        for sink in self.sinks:
+            sink.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
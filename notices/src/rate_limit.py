@@ -0,0 +1,44 @@
+from django.conf import settings
+from django.core.cache import caches
+from urllib.parse import urlsplit
+import time
+
+PERIODS = {'s': 1, 'm': 60, 'h': 3600}
+
+
+def parse_rate(value):
+    """'30/m' 형식의 한도를 (요청 수, 기간(초))로 변환 (비어 있으면 None = 제한 없음)"""
+    if not value:
+        return None
+    count, _, unit = str(value).partition('/')
+    if unit[:1] not in PERIODS:
+        raise ValueError(f"알 수 없는 요청 한도 형식: {value} (예: 30/m)")
+    return int(count), PERIODS[unit[:1]]
+
+
+def reserve_host_slot(url, rate=None, now=None):
+    """
+    url의 호스트에 요청 한 번을 예약하고, 바로 보내도 되면 0, 아니면 기다려야 할 시간(초)을 반환
+    고정 구간 카운터는 CRAWL_RATE_LIMIT_CACHE_ALIAS 캐시에 있으므로 한도는 그 캐시를 같이 보는 범위에서만 지켜진다.
+    기본 LocMemCache는 프로세스마다 따로 세므로 워커 N개면 실제 한도는 N배가 되고, FileBasedCache는 incr이
+    원자적이지 않아 동시에 부르면 덜 셀 수 있다. 워커 전체에 한도를 걸려면 Redis나 memcached 캐시를 지정해야 한다.
+    한도를 넘었으면 반환된 시간만큼 기다린 뒤 다시 불러야 한다.
+    """
+    limit = parse_rate(rate if rate is not None else getattr(settings, 'CRAWL_HOST_RATE_LIMIT', None))
+    if limit is None:
+        return 0
+    count, period = limit
+    now = time.time() if now is None else now
+    window = int(now // period)
+    key = f'notices:host-rate:{urlsplit(url).netloc}:{period}:{window}'
+    cache = caches[getattr(settings, 'CRAWL_RATE_LIMIT_CACHE_ALIAS', 'default')]
+    cache.add(key, 0, timeout=period * 2)
+    try:
+        used = cache.incr(key)
+    except ValueError:
+        # 그 사이 만료된 경우
+        cache.set(key, 1, timeout=period * 2)
+        used = 1
+    if used <= count:
+        return 0
+    return (window + 1) * period - now
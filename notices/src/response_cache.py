@@ -0,0 +1,178 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import F, Value
+from django.db.models.functions import Greatest
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.http import http_date, parse_http_date_safe
+from notices.models import DataVersion
+from collections import OrderedDict
+from functools import wraps
+import hashlib
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+def _cache():
+    return caches[getattr(settings, 'RESPONSE_CACHE_ALIAS', 'default')]
+
+
+def get_data_version():
+    """
+    현재 데이터 버전 (밀리초 타임스탬프)
+    크롤링/가져오기로 데이터가 바뀔 때마다 올라가고, 캐시 키와 Last-Modified에 쓰인다.
+    DB의 DataVersion 행에 두어서 다른 프로세스(import worker, crawl_notices, 다른 gunicorn worker)가 올린 버전도 바로 보인다.
+    """
+    version = DataVersion.objects.filter(pk=1).values_list('version', flat=True).first()
+    if version is None:
+        version = DataVersion.objects.get_or_create(pk=1, defaults={'version': int(time.time() * 1000)})[0].version
+    return version
+
+
+def bump_data_version():
+    """데이터가 바뀌었음을 알리고 새 버전 반환 (지금 시각과 현재 버전 + 1 중 큰 값)"""
+    DataVersion.objects.get_or_create(pk=1)
+    DataVersion.objects.filter(pk=1).update(version=Greatest(F('version') + 1, Value(int(time.time() * 1000))))
+    version = get_data_version()
+    logger.info(f"응답 캐시 데이터 버전 갱신: {version}")
+    return version
+
+
+class LRUCache:
+    """크기 제한과 TTL이 있는 프로세스 내 LRU 캐시"""
+
+    def __init__(self, maxsize=256, ttl=300):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is not None:
+                value, expires_at = item
+                if expires_at > time.monotonic():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+                self.evictions += 1
+            self.misses += 1
+            return None
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + self.ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class ResponseCache:
+    """
+    API 응답 캐시
+    프로세스 내 LRU를 먼저 보고, 없으면 Django 캐시(로컬 메모리/파일)를 본다.
+    키에 데이터 버전이 들어 있어서 버전이 오르면 예전 응답은 자연스럽게 쓰이지 않는다.
+    """
+
+    def __init__(self, maxsize=256, ttl=300):
+        self.local = LRUCache(maxsize=maxsize, ttl=ttl)
+        self.ttl = ttl
+        self.shared_hits = 0
+
+    def get(self, key):
+        entry = self.local.get(key)
+        if entry is None:
+            entry = _cache().get(key)
+            if entry is not None:
+                self.shared_hits += 1
+                self.local.set(key, entry)
+        return entry
+
+    def set(self, key, entry):
+        self.local.set(key, entry)
+        _cache().set(key, entry, timeout=self.ttl)
+
+    def clear(self):
+        self.local.clear()
+
+    def stats(self):
+        return {
+            'hits': self.local.hits,
+            'shared_hits': self.shared_hits,
+            'misses': self.local.misses - self.shared_hits,
+            'evictions': self.local.evictions,
+            'size': len(self.local),
+            'data_version': get_data_version(),
+        }
+
+
+response_cache = ResponseCache(
+    maxsize=getattr(settings, 'RESPONSE_CACHE_MAX_ENTRIES', 256),
+    ttl=getattr(settings, 'RESPONSE_CACHE_TTL', 300),
+)
+
+
+def cached_api_response(endpoint, params):
+    """
+    GET API 응답을 (endpoint, URL 경로 인자, 쿼리 파라미터, 데이터 버전) 기준으로 캐시하는 데코레이터
+    본문 해시로 만든 ETag와 데이터 버전 시각의 Last-Modified를 붙이고, 조건부 요청이 현재 응답과 같으면 304를 돌려준다.
+    상태 코드 200 응답만 캐시하고, 304는 같은 요청이 200으로 캐시되어 있을 때(파라미터가 올바를 때)만 돌려준다.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(req, *args, **kwargs):
+            if req.method != 'GET':
+                return view(req, *args, **kwargs)
+
+            version = get_data_version()
+            raw_key = '|'.join(
+                [endpoint, str(version)]
+                + [f'{name}={value}' for name, value in sorted(kwargs.items())]
+                + [req.GET.get(name, '') for name in params]
+            )
+            key = f'notices:response:{endpoint}:{hashlib.sha1(raw_key.encode("utf-8")).hexdigest()}'
+            last_modified = version // 1000
+
+            entry = response_cache.get(key)
+            if entry is None:
+                # 조건부 요청이어도 캐시에 없으면 뷰를 먼저 실행해서 파라미터를 검증한다
+                # (잘못된 요청은 ETag/Last-Modified가 맞아도 304가 아니라 뷰의 오류 응답을 돌려준다)
+                response = view(req, *args, **kwargs)
+                if response.status_code != 200:
+                    return response
+                entry = (response.content, response['Content-Type'])
+                response_cache.set(key, entry)
+            content, content_type = entry
+            # ETag는 본문에서 만들어서, 버전을 늦게 본 프로세스도 내용이 바뀌었으면 304를 주지 않는다
+            etag = f'"{hashlib.sha1(content).hexdigest()}"'
+
+            if_none_match = req.headers.get('If-None-Match')
+            if_modified_since = parse_http_date_safe(req.headers.get('If-Modified-Since', ''))
+            if (if_none_match and etag in [tag.strip() for tag in if_none_match.split(',')]) or \
+                    (not if_none_match and if_modified_since and if_modified_since >= last_modified):
+                response = HttpResponseNotModified()
+            else:
+                response = HttpResponse(content, content_type=content_type)
+
+            response['ETag'] = etag
+            response['Last-Modified'] = http_date(last_modified)
+            # 매번 서버에 재검증을 요청하게 해서 데이터가 바뀌면 바로 반영되도록 한다
+            response['Cache-Control'] = 'no-cache'
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,152 @@
+from django.conf import settings
+from django.db.models import Count, Max, Q, Sum
+from django.utils import timezone
+from notices.models import BoardCrawlState, Notice, NoticeBoard, NoticeDailyCount
+from datetime import timedelta
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 최근 빈도(크롤러가 실제로 새 글을 발견한 시각 기준)와 장기 빈도(작성일 기준)를 보는 기간
+SHORT_WINDOW_DAYS = 7
+LONG_WINDOW_DAYS = 56
+
+# 새 글이 나오면 주기를 이 비율로 줄이고, 나오지 않으면 이 비율로 늘려서 빈도로 정한 주기까지 되돌린다
+TIGHTEN_FACTOR = 0.5
+RELAX_FACTOR = 1.5
+
+
+class BoardSchedule:
+    """게시판 하나의 크롤링 계획"""
+
+    def __init__(self, board, rate_per_day, interval, next_run_at, last_new_at=None, now=None):
+        self.board = board
+        self.rate_per_day = rate_per_day    # 하루 평균 새 글 수 (추정)
+        self.interval = interval            # timedelta
+        self.next_run_at = next_run_at      # None이면 아직 크롤링한 적 없음 (바로 실행)
+        self.last_new_at = last_new_at      # 마지막으로 새 글을 발견한 시각
+        self.now = now
+
+    @property
+    def due(self):
+        return self.next_run_at is None or self.next_run_at <= self.now
+
+    def as_dict(self):
+        return {
+            'board': self.board.name,
+            'rate_per_day': round(self.rate_per_day, 2),
+            'interval_minutes': round(self.interval.total_seconds() / 60, 1),
+            'next_run_at': self.next_run_at.isoformat() if self.next_run_at else None,
+            'last_new_at': self.last_new_at.isoformat() if self.last_new_at else None,
+            'due': self.due,
+        }
+
+
+class CrawlScheduler:
+    """
+    게시판별 크롤링 주기를 글이 올라오는 빈도로 정하는 스케줄러
+    - 빈도: 최근 SHORT_WINDOW_DAYS일 동안 크롤러가 발견한 새 글(crawled_at)과
+      LONG_WINDOW_DAYS일 동안의 작성일(published_date, NoticeDailyCount) 중 큰 쪽
+    - 기본 주기: 크롤링 한 번에 새 글이 target_per_crawl개쯤 나오는 간격을 [min_interval, max_interval]로 자른 값
+    - 크롤링 결과를 record_crawl로 알려 주면, 새 글이 있던 게시판은 주기를 줄이고
+      없던 게시판은 기본 주기까지 천천히 늘린다 (BoardCrawlState.crawl_interval/next_crawl_at에 저장)
+    """
+
+    def __init__(self, min_interval=None, max_interval=None, target_per_crawl=None):
+        self.min_interval = timedelta(
+            minutes=min_interval if min_interval is not None else getattr(settings, 'CRAWL_MIN_INTERVAL_MINUTES', 15)
+        )
+        self.max_interval = timedelta(
+            minutes=max_interval if max_interval is not None else getattr(settings, 'CRAWL_MAX_INTERVAL_MINUTES', 1440)
+        )
+        self.target_per_crawl = (
+            target_per_crawl if target_per_crawl is not None
+            else getattr(settings, 'CRAWL_TARGET_POSTS_PER_CRAWL', 0.5)
+        )
+
+    def clamp(self, interval):
+        return max(self.min_interval, min(self.max_interval, interval))
+
+    def posting_rates(self, boards, now=None):
+        """게시판 id별 (하루 평균 새 글 수, 마지막으로 새 글을 발견한 시각)"""
+        now = now or timezone.now()
+        board_ids = [board.id for board in boards]
+        today = timezone.localdate(now)
+        short_since = now - timedelta(days=SHORT_WINDOW_DAYS)
+        # 오늘을 포함해서 정확히 N일
+        short_since_date = today - timedelta(days=SHORT_WINDOW_DAYS - 1)
+        long_since = today - timedelta(days=LONG_WINDOW_DAYS - 1)
+
+        long_counts = dict(
+            NoticeDailyCount.objects.filter(board_id__in=board_ids, published_date__gte=long_since)
+            .values('board_id').annotate(total=Sum('count')).values_list('board_id', 'total')
+        )
+        recent = {
+            row['board_id']: row
+            for row in Notice.objects.filter(board_id__in=board_ids)
+            .values('board_id')
+            .annotate(
+                # backfill로 나중에 채운 옛 글은 빼고, 최근에 올라와서 크롤러가 발견한 글만 센다
+                found=Count('id', filter=Q(crawled_at__gte=short_since, published_date__gte=short_since_date)),
+                last_new_at=Max('crawled_at'),
+            )
+        }
+        rates = {}
+        for board_id in board_ids:
+            row = recent.get(board_id, {})
+            rate = max(
+                (long_counts.get(board_id) or 0) / LONG_WINDOW_DAYS,
+                row.get('found', 0) / SHORT_WINDOW_DAYS,
+            )
+            rates[board_id] = (rate, row.get('last_new_at'))
+        return rates
+
+    def base_interval(self, rate_per_day):
+        """하루 rate_per_day개 글이 올라오는 게시판의 기본 주기"""
+        if rate_per_day <= 0:
+            return self.max_interval
+        return self.clamp(timedelta(days=self.target_per_crawl / rate_per_day))
+
+    def next_interval(self, current, base, new_count):
+        """이번 크롤링에서 새 글이 new_count개 나왔을 때 다음 주기"""
+        if new_count > 0:
+            return self.clamp(min(current or base, base) * TIGHTEN_FACTOR)
+        if not current or current >= base:
+            return base
+        return self.clamp(min(base, current * RELAX_FACTOR))
+
+    def record_crawl(self, board, new_count, now=None):
+        """크롤링이 끝난 게시판의 다음 주기와 다음 실행 시각 저장"""
+        now = now or timezone.now()
+        rate, last_new_at = self.posting_rates([board], now)[board.id]
+        state, _ = BoardCrawlState.objects.get_or_create(board=board)
+        current = timedelta(seconds=state.crawl_interval) if state.crawl_interval else None
+        interval = self.next_interval(current, self.base_interval(rate), new_count)
+        state.crawl_interval = int(interval.total_seconds())
+        state.next_crawl_at = now + interval
+        state.save(update_fields=['crawl_interval', 'next_crawl_at'])
+        logger.info(f"{board.name} 다음 크롤링: {interval} 뒤 (하루 {rate:.2f}개, 새 글 {new_count}개)")
+        return BoardSchedule(board, rate, interval, state.next_crawl_at, last_new_at, now)
+
+    def plan(self, boards=None, now=None):
+        """게시판별 크롤링 계획 (다음 실행 시각 순, 아직 크롤링하지 않은 게시판이 먼저)"""
+        now = now or timezone.now()
+        boards = list(boards if boards is not None else NoticeBoard.objects.filter(is_active=True))
+        states = {state.board_id: state for state in BoardCrawlState.objects.filter(board__in=boards)}
+        rates = self.posting_rates(boards, now)
+        schedules = []
+        for board in boards:
+            rate, last_new_at = rates[board.id]
+            state = states.get(board.id)
+            if state is not None and state.crawl_interval:
+                interval = timedelta(seconds=state.crawl_interval)
+            else:
+                interval = self.base_interval(rate)
+            next_run_at = state.next_crawl_at if state is not None else None
+            schedules.append(BoardSchedule(board, rate, interval, next_run_at, last_new_at, now))
+        schedules.sort(key=lambda schedule: (schedule.next_run_at is not None, schedule.next_run_at or now))
+        return schedules
+
+    def due_boards(self, boards=None, now=None):
+        """지금 크롤링할 차례인 게시판 목록"""
+        return [schedule.board for schedule in self.plan(boards, now) if schedule.due]
@@ -0,0 +1,123 @@
+from django.db import connection, transaction
+from django.db.models import Q
+from notices.models import Notice
+import logging
+
+logger = logging.getLogger(__name__)
+
+FTS_TABLE = 'notices_notice_fts'
+
+# trigram 토크나이저는 3글자보다 짧은 검색어를 색인으로 찾을 수 없다
+MIN_FTS_TERM_LENGTH = 3
+
+# bm25 가중치 (title, author, board_name): 제목 일치를 가장 높게 본다
+BM25_WEIGHTS = (10.0, 2.0, 1.0)
+
+RESULT_FIELDS = ('id', 'title', 'url', 'author', 'view_count', 'is_important', 'published_date', 'board_id', 'board__name')
+
+
+def search_index_available():
+    """FTS5 검색 테이블을 쓸 수 있는지 (SQLite이고 마이그레이션이 적용되었는지)"""
+    if connection.vendor != 'sqlite':
+        return False
+    return FTS_TABLE in connection.introspection.table_names()
+
+
+def build_match_query(terms):
+    """
+    검색어 목록을 FTS5 MATCH 식으로 변환
+    단어마다 큰따옴표로 감싸서 FTS 문법 문자가 해석되지 않게 하고, 모든 단어가 들어 있는 글만 찾는다.
+    """
+    return ' '.join('"' + term.replace('"', '""') + '"' for term in terms)
+
+
+def _like_pattern(term):
+    escaped = term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f'%{escaped}%'
+
+
+def search_notices(q, board_id=None, date_from=None, date_to=None, limit=20, offset=0, use_index=True):
+    """
+    공지사항 검색 결과 (rows, total_count, backend) 반환
+    3글자 이상인 검색어가 있으면 FTS5 색인에서 bm25 순으로 찾고('fts', 짧은 검색어는 찾은 글 안에서 LIKE로 거른다),
+    검색어가 모두 짧거나 FTS5를 쓸 수 없으면 LIKE로 찾아 최신순으로 정렬한다('like').
+    use_index=False면 항상 LIKE로 찾는다 (벤치마크 비교용).
+    """
+    terms = q.split()
+    if not terms:
+        return [], 0, None
+    long_terms = [term for term in terms if len(term) >= MIN_FTS_TERM_LENGTH]
+    if use_index and long_terms and search_index_available():
+        short_terms = [term for term in terms if len(term) < MIN_FTS_TERM_LENGTH]
+        ids, total = _fts_search(long_terms, short_terms, board_id, date_from, date_to, limit, offset)
+        rows = {row['id']: row for row in Notice.objects.filter(id__in=ids).values(*RESULT_FIELDS)}
+        return [rows[notice_id] for notice_id in ids if notice_id in rows], total, 'fts'
+
+    queryset = Notice.objects.filter(board__is_active=True)
+    for term in terms:
+        queryset = queryset.filter(Q(title__icontains=term) | Q(author__icontains=term) | Q(board__name__icontains=term))
+    if board_id:
+        queryset = queryset.filter(board_id=board_id)
+    if date_from:
+        queryset = queryset.filter(published_date__gte=date_from)
+    if date_to:
+        queryset = queryset.filter(published_date__lte=date_to)
+    total = queryset.count()
+    rows = list(queryset.order_by('-published_date', 'display_order', 'id').values(*RESULT_FIELDS)[offset:offset + limit])
+    return rows, total, 'like'
+
+
+def _fts_search(terms, short_terms, board_id, date_from, date_to, limit, offset):
+    """FTS5 색인에서 조건에 맞는 공지사항 id를 순위대로 찾고 (ids, 전체 개수) 반환"""
+    where = [f'{FTS_TABLE} MATCH %s', 'b.is_active']
+    params = [build_match_query(terms)]
+    for term in short_terms:
+        where.append(
+            "(n.title LIKE %s ESCAPE '\\' OR n.author LIKE %s ESCAPE '\\' OR b.name LIKE %s ESCAPE '\\')"
+        )
+        params.extend([_like_pattern(term)] * 3)
+    if board_id:
+        where.append('n.board_id = %s')
+        params.append(board_id)
+    if date_from:
+        where.append('n.published_date >= %s')
+        params.append(date_from.isoformat())
+    if date_to:
+        where.append('n.published_date <= %s')
+        params.append(date_to.isoformat())
+    source = (
+        f'FROM {FTS_TABLE} '
+        f'JOIN notices_notice n ON n.id = {FTS_TABLE}.rowid '
+        f'JOIN notices_noticeboard b ON b.id = n.board_id '
+        f'WHERE {" AND ".join(where)}'
+    )
+    weights = ', '.join(str(weight) for weight in BM25_WEIGHTS)
+    with connection.cursor() as cursor:
+        cursor.execute(f'SELECT COUNT(*) {source}', params)
+        total = cursor.fetchone()[0]
+        cursor.execute(
+            f'SELECT n.id {source} '
+            f'ORDER BY bm25({FTS_TABLE}, {weights}), n.published_date DESC, n.id '
+            f'LIMIT %s OFFSET %s',
+            params + [limit, offset],
+        )
+        ids = [row[0] for row in cursor.fetchall()]
+    return ids, total
+
+
+def rebuild_search_index():
+    """검색 색인을 Notice 테이블에서 다시 만들고 색인된 행 수 반환 (트리거가 빠졌던 데이터 복구용)"""
+    if not search_index_available():
+        raise RuntimeError('FTS5 검색 테이블이 없습니다. SQLite에서 migrate를 먼저 실행하세요.')
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE}')
+        cursor.execute(
+            f'INSERT INTO {FTS_TABLE}(rowid, title, author, board_name) '
+            f'SELECT n.id, n.title, n.author, b.name '
+            f'FROM notices_notice n JOIN notices_noticeboard b ON b.id = n.board_id'
+        )
+        indexed = cursor.rowcount
+        # 세그먼트를 하나로 합쳐서 이후 검색이 빠르게
+        cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('optimize')")
+    logger.info(f"검색 색인 재생성: {indexed}건")
+    return indexed
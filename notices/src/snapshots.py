@@ -0,0 +1,197 @@
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils import timezone
+from notices.models import NoticeBoard
+from notices.views import board_counts_by_category, board_preview
+from whitenoise.middleware import WhiteNoiseMiddleware
+from whitenoise.responders import IsDirectoryError, MissingFileError
+from whitenoise.string_utils import ensure_leading_trailing_slash
+from collections import defaultdict
+from datetime import date, timedelta
+from pathlib import Path
+import gzip
+import hashlib
+import json
+import logging
+import os
+import re
+import uuid
+
+try:
+    import brotli
+except ImportError:  # 없으면 .gz만 만든다 (brotli extra로 설치)
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+INDEX_NAME = 'index.json'
+# 날짜별 스냅샷 파일 이름: 2025-03-04.<내용 해시 12자리>.json (내용이 바뀌면 이름도 바뀐다)
+SNAPSHOT_NAME_RE = re.compile(r'(\d{4}-\d{2}-\d{2})\.([0-9a-f]{12})\.json')
+# 날짜마다 남겨 두는 이전 버전 수 (index.json을 늦게 받은 브라우저가 바로 전 파일을 요청할 수 있다)
+KEEP_VERSIONS = 2
+
+
+def snapshot_dir():
+    return Path(getattr(settings, 'SNAPSHOT_DIR', 'snapshots'))
+
+
+def snapshot_window(today=None, days=None):
+    """스냅샷을 만드는 날짜 범위 (first, last) - 오늘부터 SNAPSHOT_DAYS일 전까지"""
+    today = today or timezone.localdate()
+    days = days or getattr(settings, 'SNAPSHOT_DAYS', 7)
+    return today - timedelta(days=days - 1), today
+
+
+def build_snapshot(target_date):
+    """
+    날짜 하나의 대시보드 데이터
+    categories는 /api/v1/notice-counts/, previews[게시판 URL]은 /api/v1/notice-preview/ 응답과 같다 (모든 활성 게시판).
+    """
+    categories = board_counts_by_category(target_date)
+    boards = {board.url: board for board in NoticeBoard.objects.filter(is_active=True)}
+    previews = {
+        board['url']: board_preview(boards[board['url']], target_date)
+        for category in categories for board in category['boards']
+    }
+    return {'date': target_date.isoformat(), 'categories': categories, 'previews': previews}
+
+
+def _write_atomic(path, content):
+    part = path.with_name(f'.{path.name}.{uuid.uuid4().hex}.part')
+    part.write_bytes(content)
+    os.replace(part, path)
+
+
+def write_snapshot(target_date, directory=None):
+    """
+    날짜의 스냅샷을 내용 해시가 들어간 이름으로 저장하고 파일 이름 반환
+    압축본(.gz, brotli가 설치되어 있으면 .br)을 먼저 쓰므로 .json이 보이는 시점에는 압축본도 있다.
+    내용이 같으면 파일을 다시 쓰지 않고 수정 시각만 바꾼다 (index.json이 가장 최근 파일을 가리키게).
+    """
+    directory = directory or snapshot_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    content = json.dumps(
+        build_snapshot(target_date), ensure_ascii=False, separators=(',', ':'), cls=DjangoJSONEncoder,
+    ).encode('utf-8')
+    name = f'{target_date.isoformat()}.{hashlib.sha1(content).hexdigest()[:12]}.json'
+    path = directory / name
+    if path.exists():
+        os.utime(path)
+        return name
+    _write_atomic(path.with_name(f'{name}.gz'), gzip.compress(content, compresslevel=9, mtime=0))
+    if brotli is not None:
+        _write_atomic(path.with_name(f'{name}.br'), brotli.compress(content))
+    _write_atomic(path, content)
+    return name
+
+
+def _remove_snapshot(path):
+    for variant in (path, path.with_name(f'{path.name}.gz'), path.with_name(f'{path.name}.br')):
+        variant.unlink(missing_ok=True)
+
+
+def update_index(directory=None, today=None, days=None):
+    """
+    디렉터리의 스냅샷으로 index.json({날짜: 가장 최근 파일 이름})을 다시 만들고 반환
+    범위를 벗어난 날짜의 파일과 날짜별 KEEP_VERSIONS개를 넘는 이전 버전은 지운다.
+    """
+    directory = directory or snapshot_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    first, last = snapshot_window(today, days)
+    versions = defaultdict(list)
+    for path in directory.iterdir():
+        match = SNAPSHOT_NAME_RE.fullmatch(path.name)
+        if match is None:
+            continue
+        try:
+            versions[date.fromisoformat(match.group(1))].append((path.stat().st_mtime_ns, path))
+        except (ValueError, FileNotFoundError):
+            continue
+
+    index = {}
+    for target_date, paths in versions.items():
+        paths.sort(reverse=True)
+        if not first <= target_date <= last:
+            for _, path in paths:
+                _remove_snapshot(path)
+            continue
+        index[target_date.isoformat()] = paths[0][1].name
+        for _, path in paths[KEEP_VERSIONS:]:
+            _remove_snapshot(path)
+
+    data = {'generated_at': timezone.now().isoformat(), 'dates': dict(sorted(index.items()))}
+    _write_atomic(directory / INDEX_NAME, json.dumps(data, separators=(',', ':')).encode('utf-8'))
+    return data
+
+
+def refresh_snapshots(dates=None, today=None, days=None, directory=None):
+    """
+    dates(없으면 범위 안의 모든 날짜) 중 범위 안의 날짜만 스냅샷을 다시 만들고 index.json을 갱신
+    만든 파일 이름 목록 반환
+    """
+    first, last = snapshot_window(today, days)
+    if dates is None:
+        dates = [first + timedelta(days=offset) for offset in range((last - first).days + 1)]
+    names = [
+        write_snapshot(target_date, directory)
+        for target_date in sorted(set(dates)) if first <= target_date <= last
+    ]
+    if names:
+        update_index(directory, today, days)
+        logger.info(f"대시보드 스냅샷 {len(names)}개 갱신: {', '.join(names)}")
+    return names
+
+
+def schedule_snapshot_refresh(dates):
+    """
+    저장 트랜잭션이 커밋된 뒤 바뀐 날짜의 스냅샷을 다시 만든다
+    스냅샷은 없어도 화면이 API로 대신 조회하므로, 실패해도 저장은 실패로 만들지 않는다.
+    """
+    dates = set(dates)
+    if not dates:
+        return
+
+    def refresh():
+        try:
+            refresh_snapshots(dates)
+        except Exception:
+            logger.exception("대시보드 스냅샷 갱신 실패")
+
+    transaction.on_commit(refresh)
+
+
+class SnapshotWhiteNoiseMiddleware(WhiteNoiseMiddleware):
+    """
+    정적 파일과 함께 SNAPSHOT_DIR의 대시보드 스냅샷을 SNAPSHOT_URL 아래에서 서빙하는 WhiteNoise
+    스냅샷은 서버가 떠 있는 동안 새로 생기므로 이 경로만 요청마다 파일을 찾는다 (WhiteNoise는 시작할 때 목록을 만든다).
+    이름에 내용 해시가 들어간 날짜별 파일은 immutable로 오래 캐시하고, index.json은 WHITENOISE_MAX_AGE를 따른다.
+    """
+
+    def __init__(self, get_response=None, settings=settings):
+        # 부모 __init__이 정적 파일을 등록하면서 immutable_file_test를 호출하므로 먼저 설정
+        self.snapshot_prefix = ensure_leading_trailing_slash(getattr(settings, 'SNAPSHOT_URL', '/snapshots/'))
+        self.snapshot_root = os.path.abspath(snapshot_dir())
+        super().__init__(get_response, settings)
+
+    def __call__(self, request):
+        if request.path_info.startswith(self.snapshot_prefix):
+            static_file = self.find_snapshot(request.path_info)
+            if static_file is not None:
+                return self.serve(static_file, request)
+            return self.get_response(request)
+        return super().__call__(request)
+
+    def find_snapshot(self, url):
+        name = url[len(self.snapshot_prefix):]
+        if name != INDEX_NAME and not SNAPSHOT_NAME_RE.fullmatch(name):
+            return None
+        try:
+            return self.get_static_file(os.path.join(self.snapshot_root, name), url)
+        except (MissingFileError, IsDirectoryError):
+            return None
+
+    def immutable_file_test(self, path, url):
+        if url.startswith(self.snapshot_prefix):
+            return bool(SNAPSHOT_NAME_RE.fullmatch(url[len(self.snapshot_prefix):]))
+        return super().immutable_file_test(path, url)
@@ -0,0 +1,55 @@
+from django.db import transaction
+from django.db.models import Count, Q
+from notices.models import Notice, NoticeDailyCount
+from collections import defaultdict
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 한 번에 다시 계산할 (board, date) 조합 수 (SQL 파라미터 수 제한 대비)
+REFRESH_CHUNK_SIZE = 200
+
+def _count_rows(queryset):
+    """Notice 쿼리셋을 (board, published_date, is_important)별로 센 NoticeDailyCount 목록"""
+    return [
+        NoticeDailyCount(
+            board_id=row['board_id'],
+            published_date=row['published_date'],
+            is_important=row['is_important'],
+            count=row['total'],
+        )
+        for row in queryset.order_by().values('board_id', 'published_date', 'is_important').annotate(total=Count('id'))
+    ]
+
+
+def refresh_daily_counts(keys):
+    """
+    (board_id, published_date) 목록에 해당하는 집계만 다시 계산
+    저장/수정된 공지사항이 속한 날짜만 갱신하므로 전체 재계산보다 훨씬 가볍다.
+    """
+    keys = sorted(set(keys))
+    refreshed = 0
+    for start in range(0, len(keys), REFRESH_CHUNK_SIZE):
+        # 게시판별로 날짜를 묶어서 (board_id = ? AND published_date IN (...)) 인덱스 조회가 되게 한다
+        dates_by_board = defaultdict(list)
+        for board_id, published_date in keys[start:start + REFRESH_CHUNK_SIZE]:
+            dates_by_board[board_id].append(published_date)
+        condition = Q()
+        for board_id, dates in dates_by_board.items():
+            condition |= Q(board_id=board_id, published_date__in=dates)
+        rows = _count_rows(Notice.objects.filter(condition))
+        with transaction.atomic():
+            NoticeDailyCount.objects.filter(condition).delete()
+            NoticeDailyCount.objects.bulk_create(rows)
+        refreshed += len(rows)
+    return refreshed
+
+
+def rebuild_daily_counts():
+    """집계 테이블 전체를 Notice 테이블에서 다시 만든다 (백필용)"""
+    rows = _count_rows(Notice.objects.all())
+    with transaction.atomic():
+        NoticeDailyCount.objects.all().delete()
+        NoticeDailyCount.objects.bulk_create(rows, batch_size=1000)
+    logger.info(f"일별 집계 재생성: {len(rows)}건")
+    return len(rows)
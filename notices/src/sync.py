@@ -0,0 +1,255 @@
+from notices.src.ingest import notice_digest
+from notices.src.jsonstream import iter_export_file
+from notices.src.pipeline import normalize_notice
+from datetime import date
+from itertools import chain, islice
+from urllib.parse import urlencode
+import gzip
+import hashlib
+import json
+import logging
+import time
+import urllib3
+
+logger = logging.getLogger(__name__)
+
+# 동기화 목록 요청 한 번에 넣는 게시판 수 (GET URL 길이 제한)
+MANIFEST_BATCH_SIZE = 50
+
+
+class SyncResult:
+    """동기화 결과 (파일의 공지사항 수 / 서버와 같아서 뺀 수 / 파일 안 중복 / 보낸 수 등)"""
+
+    def __init__(self):
+        self.total = 0
+        self.unchanged = 0
+        self.duplicates = 0
+        self.skipped = 0        # 서버에 없는 게시판의 글 (보내도 저장되지 않으므로 보내지 않음)
+        self.sent = 0
+        self.payload_bytes = 0
+        self.upload_bytes = 0   # 압축 후 실제로 보낸 크기
+        self.chunks = 0
+        self.chunks_resumed = 0     # 서버에 이미 저장되어 있어서 건너뛴 조각
+        self.manifest_entries = 0
+        self.response = None    # 조각별 ImportDataView 응답의 합계 (보낸 게 없거나 dry_run이면 None)
+
+    def as_dict(self):
+        return {
+            'total': self.total,
+            'unchanged': self.unchanged,
+            'duplicates': self.duplicates,
+            'skipped': self.skipped,
+            'sent': self.sent,
+            'payload_bytes': self.payload_bytes,
+            'upload_bytes': self.upload_bytes,
+            'chunks': self.chunks,
+            'chunks_resumed': self.chunks_resumed,
+            'manifest_entries': self.manifest_entries,
+            'response': self.response,
+        }
+
+
+class DeltaSyncClient:
+    """
+    크롤링 결과 파일을 서버에 저장된 내용과 비교해서 새 글과 바뀐 글만 /api/v1/import-data/로 보내는 클라이언트
+    1. 파일을 한 번 훑어서 게시판별 가장 오래된 날짜를 구하고
+    2. 게시판 여러 개씩 묶어서 그 날짜 이후의 {natural_key: content_hash} 목록(/api/v1/sync-manifest/)을 받은 뒤
+    3. 파일을 다시 읽으면서 해시가 다른 공지사항만 NDJSON으로 보낸다 (보낼 글을 메모리에 모아 두지 않는다).
+    보내는 양과 서버의 저장 시간이 전체 글 수가 아니라 바뀐 글 수에 비례한다.
+    보낼 글은 chunk_size개씩 gzip으로 압축한 조각으로 나눠 보내고, 실패한 뒤 다시 보내면 저장된 조각은 건너뛴다.
+    async_import면 서버가 조각을 대기열에 넣고 202로 바로 응답하게 하고(Prefer: respond-async),
+    다 보낸 뒤 작업 상태(/api/v1/import-jobs/<id>/)를 확인해서 저장이 끝날 때까지 기다린다.
+    """
+
+    def __init__(self, base_url, token, http=None, timeout=60.0, retries=3, chunk_size=1000, compress=True,
+                 async_import=False, poll_interval=2.0, wait_timeout=900.0):
+        self.base_url = base_url.rstrip('/')
+        self.chunk_size = chunk_size
+        self.compress = compress
+        self.async_import = async_import
+        self.poll_interval = poll_interval
+        self.wait_timeout = wait_timeout
+        self.headers = {'Authorization': f'Bearer {token}'}
+        # import-data는 같은 내용을 다시 받아도 결과가 같으므로 POST도 재시도한다
+        self.http = http or urllib3.PoolManager(
+            timeout=urllib3.Timeout(total=timeout),
+            retries=urllib3.Retry(
+                total=retries, backoff_factor=1.0, status_forcelist=(502, 503, 504), allowed_methods=None,
+            ),
+        )
+
+    def request(self, method, path, **kwargs):
+        url = f'{self.base_url}{path}'
+        response = self.http.request(method, url, headers={**self.headers, **kwargs.pop('headers', {})}, **kwargs)
+        if response.status >= 400:
+            raise urllib3.exceptions.HTTPError(f"HTTP {response.status}: {url} {response.data[:200]!r}")
+        return json.loads(response.data)
+
+    def manifests(self, since_by_board):
+        """
+        서버에 저장된 게시판별 {natural_key: content_hash} (서버에 없는 게시판이면 None)
+        MANIFEST_BATCH_SIZE개씩 묶어 요청하고, 묶음 안에서 가장 오래된 날짜 이후 글을 받는다.
+        """
+        board_names = list(since_by_board)
+        manifests = {}
+        for start in range(0, len(board_names), MANIFEST_BATCH_SIZE):
+            batch = board_names[start:start + MANIFEST_BATCH_SIZE]
+            fields = [('board', board_name) for board_name in batch]
+            days = [since_by_board[board_name] for board_name in batch]
+            if None not in days:
+                fields.append(('since', min(days).isoformat()))
+            boards = self.request('GET', '/api/v1/sync-manifest/', fields=fields)['boards']
+            for board_name in batch:
+                manifests[board_name] = boards.get(board_name)
+        return manifests
+
+    def scan(self, path):
+        """게시판별로 파일에 들어 있는 가장 오래된 날짜 (날짜를 알 수 없는 글이 있으면 None = 전체)"""
+        since = {}
+        for record in iter_export_file(path):
+            if not isinstance(record, dict) or not record.get('board_name'):
+                continue
+            value = normalize_notice(record).get('date')
+            try:
+                day = date.fromisoformat(value)
+            except (TypeError, ValueError):
+                day = None
+            board_name = record['board_name']
+            if board_name not in since:
+                since[board_name] = day
+            elif since[board_name] is not None:
+                since[board_name] = None if day is None else min(since[board_name], day)
+        return since
+
+    def changed_records(self, path, manifests, result):
+        """manifests({게시판: {natural_key: content_hash}})와 다른 공지사항만 반환"""
+        seen = set()
+        for record in iter_export_file(path):
+            result.total += 1
+            if not isinstance(record, dict) or record.get('board_name') not in manifests:
+                yield record
+                continue
+            manifest = manifests[record['board_name']]
+            if manifest is None:
+                result.skipped += 1
+                continue
+            try:
+                key, content_hash = notice_digest(normalize_notice(record))
+            except (KeyError, TypeError, ValueError):
+                # 형식이 잘못된 글은 그대로 보내서 서버가 건너뛴 수에 집계하게 한다
+                yield record
+                continue
+            board_name = record['board_name']
+            if (board_name, key) in seen:
+                result.duplicates += 1
+                continue
+            seen.add((board_name, key))
+            if manifest.get(key) == content_hash:
+                result.unchanged += 1
+                continue
+            yield record
+
+    def encoded_records(self, path, manifests, result):
+        """보낼 공지사항을 NDJSON 줄로 하나씩 만들면서 보낸 수와 크기를 result에 더한다"""
+        for record in self.changed_records(path, manifests, result):
+            line = json.dumps(record, ensure_ascii=False, separators=(',', ':')).encode('utf-8') + b'\n'
+            result.sent += 1
+            result.payload_bytes += len(line)
+            yield line
+
+    def sync(self, path, full=False, dry_run=False, batch_id=None):
+        """
+        path의 크롤링 결과를 서버와 동기화하고 SyncResult 반환
+        full이면 비교하지 않고 모두 보내고, dry_run이면 보낼 양만 계산한다.
+        batch_id를 주지 않으면 보낼 내용의 해시를 쓰므로, 같은 내용을 다시 보내면 서버에 저장된 조각은 건너뛴다.
+        """
+        result = SyncResult()
+        manifests = {}
+        if not full:
+            manifests = self.manifests(self.scan(path))
+            result.manifest_entries = sum(len(manifest) for manifest in manifests.values() if manifest)
+
+        lines = self.encoded_records(path, manifests, result)
+        if batch_id is None or dry_run:
+            # 내용 해시와 보낼 양을 먼저 한 번 훑어서 구하고, 보낼 때 파일을 다시 읽는다 (숫자는 이미 셌다)
+            digest = hashlib.sha1()
+            for line in lines:
+                digest.update(line)
+            batch_id = batch_id or digest.hexdigest()[:16]
+            lines = self.encoded_records(path, manifests, SyncResult()) if result.sent else ()
+        if not dry_run:
+            result.response = self.upload(lines, result, batch_id)
+        logger.info(
+            f"동기화: {result.total}개 중 {result.sent}개 전송 "
+            f"(변경 없음 {result.unchanged}, 중복 {result.duplicates}, 없는 게시판 {result.skipped}, "
+            f"{result.payload_bytes} bytes)"
+        )
+        return result
+
+    def upload(self, lines, result, batch_id):
+        """
+        NDJSON 줄들을 읽어 가면서 chunk_size개씩 보내고 조각별 응답의 합계 반환 (보낼 줄이 없으면 None)
+        서버에 이미 저장된(또는 대기 중인) batch_id의 조각은 건너뛴다.
+        """
+        lines = iter(lines)
+        chunks = iter(lambda: list(islice(lines, self.chunk_size)), [])
+        first = next(chunks, None)
+        if first is None:
+            return None
+        status = self.request('GET', '/api/v1/import-data/', fields={'batch': batch_id})
+        held = set(status['chunks']) | set(status.get('pending', []))
+
+        totals = dict.fromkeys(('received', 'created', 'updated', 'unchanged', 'skipped'), 0)
+        jobs = []
+        for sequence, chunk in enumerate(chain([first], chunks)):
+            result.chunks += 1
+            if sequence in held:
+                result.chunks_resumed += 1
+                continue
+            body = b''.join(chunk)
+            headers = {'Content-Type': 'application/x-ndjson'}
+            if self.compress:
+                body = gzip.compress(body)
+                headers['Content-Encoding'] = 'gzip'
+            if self.async_import:
+                headers['Prefer'] = 'respond-async'
+            result.upload_bytes += len(body)
+            response = self.request(
+                'POST', f"/api/v1/import-data/?{urlencode({'batch': batch_id, 'chunk': sequence})}",
+                body=body, headers=headers,
+            )
+            if 'job_id' in response:
+                jobs.append(response['job_id'])
+                continue
+            for key in totals:
+                totals[key] += response.get(key, 0)
+        for job in self.wait_for_jobs(jobs):
+            for key in totals:
+                totals[key] += job[key]
+        logger.info(
+            f"업로드 {batch_id}: 조각 {result.chunks}개 ({result.chunks_resumed}개 이미 저장됨), {result.upload_bytes} bytes"
+        )
+        return {'batch': batch_id, **totals}
+
+    def wait_for_jobs(self, job_ids):
+        """비동기 가져오기 작업이 모두 끝날 때까지 기다리고 작업 상태 목록 반환 (실패한 작업이 있으면 HTTPError)"""
+        deadline = time.monotonic() + self.wait_timeout
+        finished = {}
+        while len(finished) < len(job_ids):
+            for job_id in job_ids:
+                if job_id in finished:
+                    continue
+                job = self.request('GET', f'/api/v1/import-jobs/{job_id}/')
+                if job['status'] == 'failed':
+                    raise urllib3.exceptions.HTTPError(f"가져오기 작업 #{job_id} 실패: {job['error']}")
+                if job['status'] == 'done':
+                    finished[job_id] = job
+            if len(finished) < len(job_ids):
+                if time.monotonic() > deadline:
+                    raise urllib3.exceptions.HTTPError(
+                        f"가져오기 작업 {len(job_ids) - len(finished)}개가 {self.wait_timeout:.0f}초 안에 끝나지 않았습니다."
+                    )
+                time.sleep(self.poll_interval)
+        if finished:
+            logger.info(f"가져오기 작업 {len(finished)}개 완료")
+        return [finished[job_id] for job_id in job_ids]
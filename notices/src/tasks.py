@@ -1,19 +1,64 @@
-from celery import shared_task
+from celery import chord, current_app, shared_task
+from celery.signals import worker_process_shutdown
+from celery.utils.time import get_exponential_backoff_interval
 from django.utils import timezone
-from notices.models import Notice, NoticeBoard, NoticeCategory
-from notices.src.crawler import crawl_notices
+from notices.models import BoardCrawlState, NoticeBoard, NoticeCategory, notice_article_id
+from notices.src.crawler import crawl_board_pages, crawl_notices, load_board_urls
+from notices.src.fetchers import HttpStatusError, create_fetcher
+from notices.src.import_jobs import run_import_job
+from notices.src.pipeline import CrawlPipeline, DatabaseSink
+from notices.src.ingest import build_notice, bulk_upsert_notices
+from notices.src.rate_limit import reserve_host_slot
+from notices.src.scheduler import CrawlScheduler
+from notices.src.response_cache import bump_data_version
+from notices.src.snapshots import refresh_snapshots, schedule_snapshot_refresh
+from urllib.parse import urlsplit
 import logging
-import json
+import threading
+import time
+import urllib3
 
 logger = logging.getLogger(__name__)
 
+# 게시판 크롤링 작업 재시도: 일시적인 네트워크/HTTP 오류만, 지수 백오프(최대 CRAWL_RETRY_BACKOFF_MAX초)와 지터
+CRAWL_RETRY_EXCEPTIONS = (urllib3.exceptions.HTTPError, OSError)
+CRAWL_MAX_RETRIES = 3
+CRAWL_RETRY_BACKOFF = 5
+CRAWL_RETRY_BACKOFF_MAX = 300
+# 작업에서 쓰는 fetcher의 HTTP 연결/읽기 제한 시간 (초)
+CRAWL_REQUEST_TIMEOUT = 30.0
+
+def is_transient_error(error):
+    """다시 시도하면 될 수 있는 오류인지 (연결/읽기 실패, 429/5xx 응답)"""
+    if isinstance(error, HttpStatusError):
+        return error.transient
+    return isinstance(error, CRAWL_RETRY_EXCEPTIONS)
+
+# 워커 프로세스마다 백엔드별 fetcher 하나 (HTTP 커넥션 풀과 headless Chrome을 작업끼리 재사용)
+_worker_fetchers = {}
+_worker_fetchers_lock = threading.Lock()
+
+def worker_fetcher(backend):
+    """이 프로세스의 crawl_board_task들이 같이 쓰는 fetcher (처음 쓸 때 만들고 워커가 끝날 때 닫는다)"""
+    with _worker_fetchers_lock:
+        fetcher = _worker_fetchers.get(backend)
+        if fetcher is None:
+            fetcher = _worker_fetchers[backend] = create_fetcher(backend, timeout=CRAWL_REQUEST_TIMEOUT)
+        return fetcher
+
+@worker_process_shutdown.connect
+def close_worker_fetchers(**kwargs):
+    with _worker_fetchers_lock:
+        for fetcher in _worker_fetchers.values():
+            fetcher.close()
+        _worker_fetchers.clear()
+
 def setup_initial_data():
     """
     초기 데이터 설정: NoticeCategory, NoticeBoard
     """
     # URL 정보 파일 읽어오기
-    with open('notices/src/urls.json', 'r', encoding='utf-8') as f:
-        urls = json.load(f)
+    urls = load_board_urls()
 
     created_count = 0
     for category_name, boards in urls.items():
@@ -23,10 +68,13 @@ def setup_initial_data():
         if created:
             created_count += 1
         for board_name, board_url in boards.items():
-            board, created = NoticeBoard.objects.get_or_create(
+            # URL 파일이 바뀌면 (BOARD_URLS_FILE로 테스트 서버를 가리키는 경우 등) 기존 게시판 URL도 따라간다
+            # is_active는 새로 만들 때만 정하고, 관리자가 끈 게시판은 다시 켜지 않는다
+            board, created = NoticeBoard.objects.update_or_create(
                 category=category,
                 name=board_name,
-                defaults={
+                defaults={'url': board_url},
+                create_defaults={
                     'url': board_url,
                     'is_active': True
                 }
@@ -36,33 +84,204 @@ def setup_initial_data():
 
     return created_count
 
-def crawl_board_notices(board):
+def crawl_board_notices(board, pool=None, fetcher=None):
     """
-    특정 게시판의 공지사항을 크롤링하는 함수
+    특정 게시판의 공지사항을 크롤링하고 새로 추가된 개수를 반환하는 함수
     """
-    new_notices_count = 0
     try:
-        notices = crawl_notices(board_name=board.name)
-        from datetime import datetime
-        for notice in notices:
-            # 공지사항이 이미 존재하는지 확인
-            if not Notice.objects.filter(title=notice['title'], url=notice['url']).exists():
-                # 날짜 포맷 변환 (예: '2025.07.29' -> '2025-07-29')
-                date_str = notice['date']
-                try:
-                    if date_str and '.' in date_str:
-                        date_obj = datetime.strptime(date_str, '%Y.%m.%d')
-                        date_str = date_obj.strftime('%Y-%m-%d')
-                except Exception as e:
-                    logger.warning(f"날짜 변환 실패: {date_str} ({e})")
-                Notice.objects.create(
-                    board=board,
-                    title=notice['title'],
-                    url=notice['url'],
-                    published_date=date_str,
-                    display_order=notice.get('display_order', 0),
-                )
-                new_notices_count += 1
+        notices = crawl_notices(board_name=board.name, pool=pool, fetcher=fetcher)
     except Exception as e:
         logger.error(f"{board.name} 크롤링 중 오류 발생: {e}")
-    return new_notices_count
\ No newline at end of file
+        return 0
+    created = CrawlPipeline([DatabaseSink()]).process(board, notices)['db'].created
+    record_crawl_state(board, max((notice_article_id(notice.get('url')) or 0 for notice in notices), default=0))
+    return created
+
+def crawl_states(boards):
+    """게시판 이름별 크롤링 상태 ({이름: BoardCrawlState}, 상태가 없는 게시판은 빠짐)"""
+    return {
+        state.board.name: state
+        for state in BoardCrawlState.objects.filter(board__in=boards).select_related('board')
+    }
+
+def record_crawl_state(board, max_article_id=0, pages=None):
+    """
+    저장이 끝난 뒤 게시판 크롤링 상태 갱신
+    게시글 번호는 줄어들지 않게 하고(고정글만 읽은 경우 등), 마지막 크롤링 시각을 남긴다.
+    pages(crawl_board_pages 결과)를 넘기면 첫 페이지의 ETag/Last-Modified/tbody 해시도 저장한다.
+    """
+    state, _ = BoardCrawlState.objects.get_or_create(board=board)
+    state.max_article_id = max(state.max_article_id, max_article_id or 0)
+    state.last_crawled_at = timezone.now()
+    fields = ['max_article_id', 'last_crawled_at']
+    if pages is not None:
+        # 304면 서버가 준 새 검증자만 반영하고, 해시/크기는 이전 값을 그대로 둔다
+        state.etag = pages.etag or (state.etag if pages.unchanged == 'not_modified' else '')
+        state.last_modified = pages.last_modified or (state.last_modified if pages.unchanged == 'not_modified' else '')
+        if pages.content_hash:
+            state.content_hash = pages.content_hash
+            state.content_length = pages.content_length
+        fields += ['etag', 'last_modified', 'content_hash', 'content_length']
+    state.save(update_fields=fields)
+    return state
+
+def save_board_notices(board, notices):
+    """
+    정리된(normalize_notice) 공지사항을 게시글 번호 기준으로 일괄 upsert
+    생성/갱신/변경 없음 개수를 IngestResult로 반환
+    """
+    rows = []
+    skipped = 0
+    for notice in notices:
+        if not notice.get('title') or not notice.get('url') or not notice.get('date'):
+            skipped += 1
+            continue
+        try:
+            rows.append(build_notice(board, notice))
+        except (TypeError, ValueError) as e:
+            logger.warning(f"{board.name} 공지사항 변환 실패: {e}, 데이터: {notice}")
+            skipped += 1
+    result = bulk_upsert_notices(rows)
+    result.skipped += skipped
+    if result.created or result.updated:
+        bump_data_version()
+        schedule_snapshot_refresh(result.dates)
+    return result
+
+def crawl_report(board, status, pages=None, saved=None, error=None, retries=0):
+    """crawl_board_task 결과 (chord로 모으기 위해 JSON으로 직렬화되는 dict)"""
+    saved = saved.as_dict() if saved is not None else {'created': 0, 'updated': 0, 'unchanged': 0, 'skipped': 0}
+    return {
+        'board': board.name,
+        'status': status,   # 'ok', 'unchanged'(304/해시 일치로 건너뜀), 'error'
+        **saved,
+        'pages': pages.pages if pages else 0,
+        'bytes': pages.bytes_downloaded if pages else 0,
+        'reason': pages.unchanged if pages else None,
+        'error': error,
+        'retries': retries,
+    }
+
+@shared_task(bind=True, max_retries=None, acks_late=True)
+def crawl_board_task(self, board_id, max_pages=3, force=False, backend='auto', failures=0):
+    """
+    게시판 하나를 증분 크롤링해서 저장하는 Celery 작업 (crawl_notices 명령의 게시판 하나 처리와 같다)
+    - 호스트별 요청 한도(CRAWL_HOST_RATE_LIMIT)를 넘으면 다음 구간까지 미뤄서 다시 실행한다.
+      (워커 사이에서 나눠 쓰려면 공유 캐시가 필요하다, notices.src.rate_limit 참고)
+    - 일시적인 네트워크/HTTP 오류는 지수 백오프로 CRAWL_MAX_RETRIES번까지 다시 시도한다.
+      그래도 실패하거나 다른 오류(브라우저, 파싱, 저장 등)가 나면 예외 대신 오류 결과를 돌려줘서
+      chord의 다른 게시판 결과 집계가 막히지 않게 한다.
+    - fetcher(와 브라우저 풀)는 워커 프로세스마다 하나를 만들어 작업끼리 재사용한다 (worker_fetcher).
+    """
+    board = NoticeBoard.objects.get(pk=board_id)
+    wait = reserve_host_slot(board.url)
+    if wait:
+        if self.request.is_eager:
+            time.sleep(wait)
+        else:
+            raise self.retry(countdown=wait)
+
+    state = None if force else BoardCrawlState.objects.filter(board=board).first()
+    try:
+        pages = crawl_board_pages(
+            worker_fetcher(backend),
+            board.name,
+            board.url,
+            high_water_mark=state.max_article_id if state else 0,
+            max_pages=max_pages,
+            validators={'etag': state.etag, 'last_modified': state.last_modified} if state else None,
+            content_hash=state.content_hash if state else None,
+        )
+    except Exception as e:
+        if not is_transient_error(e):
+            logger.exception(f"{board.name} 크롤링 실패")
+            return crawl_report(board, 'error', error=str(e), retries=failures)
+        if failures < CRAWL_MAX_RETRIES:
+            countdown = get_exponential_backoff_interval(
+                CRAWL_RETRY_BACKOFF, failures, CRAWL_RETRY_BACKOFF_MAX, full_jitter=True
+            )
+            logger.warning(f"{board.name} 크롤링 실패, {countdown}초 뒤 다시 시도 ({failures + 1}/{CRAWL_MAX_RETRIES}): {e}")
+            raise self.retry(
+                exc=e, countdown=countdown,
+                kwargs={'max_pages': max_pages, 'force': force, 'backend': backend, 'failures': failures + 1},
+            )
+        logger.error(f"{board.name} 크롤링 실패 (재시도 {failures}회): {e}")
+        return crawl_report(board, 'error', error=str(e), retries=failures)
+
+    try:
+        if pages.unchanged:
+            record_crawl_state(board, pages=pages)
+            CrawlScheduler().record_crawl(board, 0)
+            return crawl_report(board, 'unchanged', pages, retries=failures)
+        saved = CrawlPipeline([DatabaseSink()]).process(board, pages.rows)['db']
+        record_crawl_state(board, pages.max_article_id, pages=pages)
+        CrawlScheduler().record_crawl(board, saved.created)
+    except Exception as e:
+        logger.exception(f"{board.name} 저장 실패")
+        return crawl_report(board, 'error', pages, error=str(e), retries=failures)
+    return crawl_report(board, 'ok', pages, saved, retries=failures)
+
+@shared_task
+def summarize_crawl_run(reports):
+    """chord 콜백: 게시판별 crawl_board_task 결과를 한 번의 크롤링 보고서로 합친다"""
+    summary = {
+        'boards': len(reports),
+        'created': sum(report['created'] for report in reports),
+        'updated': sum(report['updated'] for report in reports),
+        'unchanged': sum(report['unchanged'] for report in reports),
+        'skipped': sum(report['skipped'] for report in reports),
+        'pages': sum(report['pages'] for report in reports),
+        'bytes': sum(report['bytes'] for report in reports),
+        'boards_unchanged': sum(report['status'] == 'unchanged' for report in reports),
+        'retries': sum(report['retries'] for report in reports),
+        'errors': {report['board']: report['error'] for report in reports if report['status'] == 'error'},
+        'reports': reports,
+    }
+    logger.info(
+        f"크롤링 완료: 게시판 {summary['boards']}개, {summary['created']}개 추가, {summary['updated']}개 갱신, "
+        f"변경 없는 게시판 {summary['boards_unchanged']}개, 실패 {len(summary['errors'])}개"
+    )
+    return summary
+
+def uses_local_broker(app=None):
+    """
+    브로커가 프로세스 안의 메모리 브로커(memory://)인지
+    이 경우 다른 프로세스의 워커가 작업을 받을 수 없으므로 보낸 작업은 영원히 끝나지 않는다.
+    """
+    app = app or current_app
+    return urlsplit(app.conf.broker_url or '').scheme == 'memory'
+
+def dispatch_crawl(boards, max_pages=3, force=False, backend='auto', eager=False):
+    """
+    게시판마다 crawl_board_task를 보내고, 모두 끝나면 summarize_crawl_run으로 결과를 합치는 chord 실행
+    AsyncResult를 반환하고, .get()하면 summarize_crawl_run의 보고서가 나온다.
+    eager면 브로커를 거치지 않고 이 프로세스에서 바로 실행한다.
+    """
+    header = [
+        crawl_board_task.s(board.id, max_pages=max_pages, force=force, backend=backend)
+        for board in boards
+    ]
+    if not header:
+        return summarize_crawl_run.apply(args=([],)) if eager else summarize_crawl_run.delay([])
+    if eager:
+        return chord(header, summarize_crawl_run.s()).apply()
+    return chord(header)(summarize_crawl_run.s())
+
+@shared_task
+def crawl_due_boards(max_pages=3):
+    """크롤링할 차례가 된 게시판만 dispatch_crawl로 보낸다 (beat로 몇 분마다 실행, 보낸 게시판 이름 반환)"""
+    boards = CrawlScheduler().due_boards()
+    if boards:
+        dispatch_crawl(boards, max_pages=max_pages)
+    return [board.name for board in boards]
+
+@shared_task(acks_late=True)
+def run_import_job_task(job_id=None):
+    """비동기 가져오기 작업 하나를 처리 (IMPORT_WORKER=celery, 처리한 작업 상태 반환)"""
+    job = run_import_job(job_id)
+    return job.as_dict() if job is not None else None
+
+@shared_task
+def refresh_snapshots_task():
+    """최근 SNAPSHOT_DAYS일의 대시보드 스냅샷을 다시 만든다 (beat로 매시간 실행, 만든 파일 이름 반환)"""
+    return refresh_snapshots()
@@ -3,6 +3,14 @@ const previewArea = document.getElementById('preview-area');
 let showPreviewTimer;
 let hidePreviewTimer;
 
+// 기간 API로 미리 받아 둔 날짜별 게시판 공지 개수 (날짜 -> notice-counts 응답 형태)
+const noticeCountsByDate = new Map();
+
+// 서버가 미리 만들어 둔 날짜별 대시보드 스냅샷 (개수 + 미리보기, 없으면 API로 조회)
+const SNAPSHOT_URL = '/snapshots/';
+let snapshotIndexPromise = null;
+const snapshotsByDate = new Map();
+
 // 초기 렌더링 및 날짜 입력 필드 설정
 document.addEventListener('DOMContentLoaded', () => {
   const noticeDateInput = document.getElementById('notice-date-input');
@@ -20,7 +28,13 @@ document.addEventListener('DOMContentLoaded', () => {
   noticeDateInput.max = todayFormatted;
   noticeDateInput.min = pastDateFormatted;
 
-  renderNoticeList(todayFormatted);
+  // 5일치 스냅샷이 모두 있으면 그대로 쓰고, 없는 날이 있으면 기간 API로 한 번에 받아 두고 렌더링 (실패하면 하루씩 조회)
+  loadSnapshotIndex()
+    .then(index => {
+      const missing = datesBetween(pastDate, today).some(date => !index.dates[date]);
+      return missing ? prefetchNoticeCounts(pastDateFormatted, todayFormatted) : null;
+    })
+    .finally(() => renderNoticeList(todayFormatted));
 
   noticeDateInput.addEventListener('change', (event) => {
     renderNoticeList(event.target.value);
@@ -72,12 +86,16 @@ document.addEventListener('mouseover', async (event) => {
       const selectedDateInput = document.getElementById('notice-date-input');
       const selectedDateString = selectedDateInput.value; // 선택된 날짜 문자열 가져오기
 
-      // Django API 호출로 미리보기 데이터 가져오기
-      const response = await fetch(`/api/v1/notice-preview/?url=${encodeURIComponent(boardUrl)}&date=${selectedDateString}`);
-      if (!response.ok) {
-        throw new Error('API 호출 실패');
+      // 스냅샷에 미리보기가 있으면 쓰고, 없으면 Django API 호출로 미리보기 데이터 가져오기
+      const snapshot = await loadSnapshot(selectedDateString);
+      let data = snapshot && snapshot.previews[boardUrl];
+      if (!data) {
+        const response = await fetch(`/api/v1/notice-preview/?url=${encodeURIComponent(boardUrl)}&date=${selectedDateString}`);
+        if (!response.ok) {
+          throw new Error('API 호출 실패');
+        }
+        data = await response.json();
       }
-      const data = await response.json();
 
       let previewContent = `<h3>${data.board_name}</h3><ul>`;
 
@@ -121,6 +139,77 @@ function formatDate(date) {
   return `${year}-${month}-${day}`;
 }
 
+// start부터 end까지의 날짜 목록 (YYYY-MM-DD)
+function datesBetween(start, end) {
+  const dates = [];
+  const current = new Date(start);
+  while (formatDate(current) <= formatDate(end)) {
+    dates.push(formatDate(current));
+    current.setDate(current.getDate() + 1);
+  }
+  return dates;
+}
+
+// 스냅샷 목록 (날짜 -> 파일 이름)을 한 번만 받아 온다 (실패하면 빈 목록)
+function loadSnapshotIndex() {
+  if (!snapshotIndexPromise) {
+    snapshotIndexPromise = fetch(`${SNAPSHOT_URL}index.json`)
+      .then(response => (response.ok ? response.json() : { dates: {} }))
+      .catch(() => ({ dates: {} }));
+  }
+  return snapshotIndexPromise;
+}
+
+// 날짜의 스냅샷 (없거나 받아 오지 못하면 null)
+// 파일 이름에 내용 해시가 들어 있어서 브라우저가 오래 캐시한다
+async function loadSnapshot(dateString) {
+  if (snapshotsByDate.has(dateString)) {
+    return snapshotsByDate.get(dateString);
+  }
+  const index = await loadSnapshotIndex();
+  const name = index.dates && index.dates[dateString];
+  if (!name) {
+    return null;
+  }
+  try {
+    const response = await fetch(`${SNAPSHOT_URL}${name}`);
+    if (!response.ok) {
+      throw new Error('스냅샷 로딩 실패');
+    }
+    const snapshot = await response.json();
+    snapshotsByDate.set(dateString, snapshot);
+    return snapshot;
+  } catch (error) {
+    return null;
+  }
+}
+
+// 기간 내 모든 날짜의 게시판별 공지사항 개수를 한 번에 가져와서 날짜별로 저장
+async function prefetchNoticeCounts(startDate, endDate) {
+  try {
+    const response = await fetch(`/api/v1/notice-counts/range/?start=${startDate}&end=${endDate}`);
+    if (!response.ok) {
+      throw new Error('API 호출 실패');
+    }
+    const data = await response.json();
+
+    data.dates.forEach(date => {
+      noticeCountsByDate.set(date, {
+        categories: data.categories.map(category => ({
+          name: category.name,
+          boards: category.boards.map(board => ({
+            name: board.name,
+            url: board.url,
+            count: board.counts[date]
+          }))
+        }))
+      });
+    });
+  } catch (error) {
+    noticeCountsByDate.clear();
+  }
+}
+
 // 여러 게시판의 공지사항 개수를 가져와서 웹 페이지에 동적으로 렌더링하는 함수
 async function renderNoticeList(dateString = null) {
   const noticeBoardListContainer = document.querySelector('#notice-category-section .board-list');
@@ -135,13 +224,19 @@ async function renderNoticeList(dateString = null) {
     const filterDate = dateString ? new Date(dateString) : today;
     const dateStr = formatDate(filterDate);
 
-    // Django API 호출로 모든 데이터 한번에 가져오기
-    const response = await fetch(`/api/v1/notice-counts/?date=${dateStr}`);
+    // 스냅샷 -> 미리 받아 둔 데이터 순서로 찾고, 없으면 Django API 호출로 해당 날짜 데이터 가져오기
+    let data = await loadSnapshot(dateStr);
+    if (!data) {
+      data = noticeCountsByDate.get(dateStr);
+    }
+    if (!data) {
+      const response = await fetch(`/api/v1/notice-counts/?date=${dateStr}`);
 
-    if (!response.ok) {
-      throw new Error('API 호출 실패');
+      if (!response.ok) {
+        throw new Error('API 호출 실패');
+      }
+      data = await response.json();
     }
-    const data = await response.json();
 
     // 각 카테고리별로 렌더링
     data.categories.forEach(category => {
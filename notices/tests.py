@@ -1,3 +1,1580 @@
-from django.test import TestCase
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.db.models import F
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django.utils.http import http_date
+from unittest import mock
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from types import SimpleNamespace
+from urllib.parse import urlsplit
+from notices.src.async_crawl import stream_crawl
+from notices.src.backfill import backfill_board
+from notices.src.benchmark import BenchmarkSuite, build_report, compare_reports, generate_notice_rows, run_benchmarks
+from notices.src.browser_pool import BrowserPool
+from notices.src.crawler import board_page_url, crawl_board_pages, crawl_notices, parse_notice_rows
+from notices.src.fetchers import AutoFetcher, FetchResult, Fetcher, HttpFetcher, HttpStatusError, create_fetcher
+from notices.src.fixture_server import KnuFixtureServer
+from notices.src.parsers import available_parsers, get_parser, tbody_hash
+from notices.src.import_jobs import requeue_stale_jobs, run_import_job
+from notices.src.ingest import notice_digest
+from notices.src.jsonstream import NdjsonWriter, iter_export_file, iter_json_array, iter_ndjson
+from notices.src.pipeline import CrawlPipeline, DatabaseSink, JsonExportSink, create_export_sink, normalize_notice
+from notices.models import BoardCrawlState, DataVersion, ImportJob, Notice, NoticeBoard, NoticeCategory, NoticeDailyCount, notice_article_id
+from notices.src.summary import rebuild_daily_counts
+from notices.src.response_cache import LRUCache
+from notices.src.search import rebuild_search_index, search_notices
+from notices.src.snapshots import refresh_snapshots
+from notices.src.rate_limit import reserve_host_slot
+from notices.src.scheduler import CrawlScheduler
+from notices.src.sync import DeltaSyncClient
+from notices.src.tasks import CRAWL_MAX_RETRIES, close_worker_fetchers, dispatch_crawl, setup_initial_data
+from knu_notice.celery import app as celery_app
+from datetime import date, timedelta
+import functools
+import gzip
+import io
+import json
+import re
+import tempfile
+import threading
+import time
+import tracemalloc
+import urllib3
 
-# Create your tests here.
+FIXTURES_DIR = Path(__file__).resolve().parent / 'fixtures'
+
+
+class FakeDriver:
+    """WebDriver 대역 (Chrome 없이 풀 동작 확인용)"""
+
+    def __init__(self):
+        self.healthy = True
+        self.quit_called = False
+        self.visited = []
+
+    def get(self, url):
+        self.visited.append(url)
+
+    @property
+    def page_source(self):
+        return "<html></html>"
+
+    def execute_script(self, script):
+        if not self.healthy:
+            raise RuntimeError("session deleted")
+        return 1
+
+    def quit(self):
+        self.quit_called = True
+
+
+class BrowserPoolTests(SimpleTestCase):
+    def setUp(self):
+        self.drivers = []
+
+    def factory(self):
+        driver = FakeDriver()
+        self.drivers.append(driver)
+        return driver
+
+    def test_reuses_driver_across_leases(self):
+        with BrowserPool(size=1, driver_factory=self.factory) as pool:
+            for i in range(5):
+                with pool.lease() as driver:
+                    driver.get(f"https://example.com/{i}")
+        self.assertEqual(len(self.drivers), 1)
+        self.assertTrue(self.drivers[0].quit_called)
+
+    def test_recycles_after_max_pages(self):
+        with BrowserPool(size=1, max_pages=2, driver_factory=self.factory) as pool:
+            for i in range(5):
+                with pool.lease() as driver:
+                    driver.get(f"https://example.com/{i}")
+        self.assertEqual(len(self.drivers), 3)
+        self.assertEqual(pool.recycled_count, 2)
+
+    def test_recycles_after_crash_or_failed_health_check(self):
+        with BrowserPool(size=1, driver_factory=self.factory) as pool:
+            with self.assertRaises(ValueError):
+                with pool.lease():
+                    raise ValueError("boom")
+            with pool.lease():
+                pass
+            self.drivers[-1].healthy = False
+            with pool.lease():
+                pass
+        self.assertEqual(len(self.drivers), 3)
+        self.assertTrue(all(d.quit_called for d in self.drivers))
+
+
+class FixtureServer:
+    """저장해 둔 게시판 HTML을 내려주는 로컬 서버"""
+
+    def __enter__(self):
+        handler = functools.partial(QuietHandler, directory=str(FIXTURES_DIR))
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def url(self, name):
+        return f"http://127.0.0.1:{self.server.server_port}/{name}"
+
+    def __exit__(self, exc_type, exc, tb):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+class StaticFetcher(Fetcher):
+    """Selenium 대신 고정 HTML을 돌려주는 fetcher"""
+    name = 'selenium'
+
+    def __init__(self, html):
+        super().__init__()
+        self.html = html
+        self.requested = []
+
+    def fetch(self, url, validators=None):
+        self.requested.append(url)
+        return FetchResult(url, self.html, self.name)
+
+
+class FetcherTests(SimpleTestCase):
+    def parse(self, html):
+        return parse_notice_rows(html, '학생소식')
+
+    def test_http_fetcher_parses_fixture_rows(self):
+        with FixtureServer() as server, HttpFetcher() as fetcher:
+            result, rows = fetcher.fetch_rows(server.url('board_list.html'), self.parse, key='학생소식')
+        self.assertEqual(result.backend, 'http')
+        self.assertEqual(len(rows), 15)
+        self.assertEqual(rows[0]['url'], '/bbs/KNU/2132/412197/artclView.do')
+        self.assertEqual(rows[0]['date'], '2025-07-29')
+        self.assertEqual(fetcher.stats, {'학생소식': 'http'})
+
+    def test_auto_fetcher_falls_back_only_without_rows(self):
+        rendered = (FIXTURES_DIR / 'board_list.html').read_text(encoding='utf-8')
+        fallback = StaticFetcher(rendered)
+        with FixtureServer() as server:
+            fetcher = AutoFetcher(primary=HttpFetcher(), fallback=fallback)
+            _, rows = fetcher.fetch_rows(server.url('board_list.html'), self.parse, key='학생소식')
+            self.assertEqual(len(rows), 15)
+            _, rows = fetcher.fetch_rows(server.url('board_list_script.html'), self.parse, key='행정소식')
+            self.assertEqual(len(rows), 15)
+            fetcher.close()
+        self.assertEqual(fetcher.stats, {'학생소식': 'http', '행정소식': 'selenium'})
+        self.assertEqual(fallback.requested, [server.url('board_list_script.html')])
+
+    def test_auto_fetcher_does_not_launch_browser_for_errors_or_empty_pages(self):
+        fallback = StaticFetcher('')
+        with FixtureServer() as server:
+            fetcher = AutoFetcher(primary=HttpFetcher(retries=0), fallback=fallback)
+            with self.assertRaises(HttpStatusError) as raised:
+                fetcher.fetch_rows(server.url('missing.html'), self.parse)
+            self.assertEqual(raised.exception.status, 404)
+            self.assertFalse(raised.exception.transient)
+            fetcher.close()
+
+        # 표는 있지만 행이 없는 페이지 (마지막 페이지 뒤)
+        empty = (FIXTURES_DIR / 'board_list_script.html').read_text(encoding='utf-8').replace(
+            "<script>jf_loadBoardList('KNU', '2132');</script>", '')
+        fetcher = AutoFetcher(primary=StaticFetcher(empty), fallback=fallback)
+        self.assertEqual(fetcher.fetch_rows('http://a/?page=9', self.parse)[1], [])
+        self.assertEqual(fallback.requested, [])
+
+
+class SlowFetcher(StaticFetcher):
+    """URL에 따라 응답을 지연시키는 fetcher"""
+
+    def __init__(self, html, delays):
+        super().__init__(html)
+        self.delays = delays
+
+    def fetch(self, url, validators=None):
+        time.sleep(self.delays.get(url, 0))
+        return super().fetch(url)
+
+
+class AsyncCrawlTests(SimpleTestCase):
+    def setUp(self):
+        self.html = (FIXTURES_DIR / 'board_list.html').read_text(encoding='utf-8')
+
+    def test_results_stream_in_completion_order(self):
+        fetcher = SlowFetcher(self.html, {'http://a/slow': 0.3})
+        boards = [('느림', 'http://a/slow'), ('빠름1', 'http://a/fast1'), ('빠름2', 'http://b/fast2')]
+        started = time.perf_counter()
+        results = list(stream_crawl(boards, fetcher, concurrency=3))
+        self.assertLess(time.perf_counter() - started, 0.6)
+        self.assertEqual(results[-1].board_name, '느림')
+        self.assertTrue(all(r.ok and len(r.notices) == 15 for r in results))
+
+    def test_request_timeout_and_deadline(self):
+        # 제한 시간을 넘긴 요청이 끝날 때까지 기다리지 않는다
+        fetcher = SlowFetcher(self.html, {'http://a/slow': 3.0})
+        started = time.perf_counter()
+        results = {
+            r.board_name: r for r in stream_crawl(
+                [('느림', 'http://a/slow'), ('빠름', 'http://a/fast')], fetcher, request_timeout=0.1)
+        }
+        self.assertLess(time.perf_counter() - started, 1.0)
+        self.assertFalse(results['느림'].ok)
+        self.assertTrue(results['빠름'].ok)
+
+        started = time.perf_counter()
+        results = list(stream_crawl([('느림', 'http://a/slow')], fetcher, deadline=0.2))
+        self.assertLess(time.perf_counter() - started, 1.0)
+        self.assertEqual(len(results), 1)
+        self.assertIn('제한 시간', results[0].error)
+
+
+    def test_timed_out_requests_keep_their_host_slot(self):
+        # 제한 시간을 넘긴 요청도 스레드가 끝날 때까지 호스트 슬롯을 차지한다
+        fetcher = SlowFetcher(self.html, {f'http://a/{i}': 0.3 for i in range(6)})
+        active = []
+        peak = []
+        lock = threading.Lock()
+        original = fetcher.fetch
+
+        def tracked_fetch(url, validators=None):
+            with lock:
+                active.append(url)
+                peak.append(len(active))
+            try:
+                return original(url, validators)
+            finally:
+                with lock:
+                    active.remove(url)
+
+        fetcher.fetch = tracked_fetch
+        results = list(stream_crawl(
+            [(f'게시판{i}', f'http://a/{i}') for i in range(6)], fetcher, concurrency=2, request_timeout=0.05))
+        self.assertEqual(len(results), 6)
+        self.assertTrue(all(not r.ok for r in results))
+        # 결과를 버린 뒤에도 남은 요청이 끝나기를 기다렸다가 보낸다
+        time.sleep(0.4)
+        self.assertLessEqual(max(peak), 2)
+
+class CrawlPipelineTests(TestCase):
+    def setUp(self):
+        category = NoticeCategory.objects.create(name='공지사항')
+        self.board = NoticeBoard.objects.create(
+            category=category, name='학생소식', url='https://www.kongju.ac.kr/KNU/16909/subview.do')
+        html = (FIXTURES_DIR / 'board_list.html').read_text(encoding='utf-8')
+        self.rows = parse_notice_rows(html, '학생소식')
+
+    def test_single_parse_result_fans_out_to_db_and_export(self):
+        with tempfile.NamedTemporaryFile(suffix='.json') as f:
+            with CrawlPipeline([DatabaseSink(), JsonExportSink(f.name)]) as pipeline:
+                counts = pipeline.process(self.board, self.rows)
+                again = pipeline.process(self.board, self.rows)
+            exported = json.load(open(f.name, encoding='utf-8'))['notices']
+
+        # 상단 고정 공지 2건은 목록에 한 번 더 나오므로 게시글 번호 기준으로 합쳐진다
+        self.assertEqual(counts['db'].as_dict(), {'created': 13, 'updated': 0, 'unchanged': 0, 'skipped': 2})
+        self.assertEqual(counts['export'], 15)
+        self.assertEqual(again['db'].as_dict(), {'created': 0, 'updated': 0, 'unchanged': 13, 'skipped': 2})
+        self.assertEqual(Notice.objects.count(), 13)
+        self.assertEqual(len(exported), 30)
+        self.assertEqual(exported[0]['view_count'], 870)
+        self.assertEqual([n['display_order'] for n in exported[:3]], [0, 1, 2])
+
+    def test_ndjson_export_is_written_per_board(self):
+        path = Path(tempfile.mkdtemp()) / 'crawled.ndjson.gz'
+        with CrawlPipeline([DatabaseSink(), create_export_sink(str(path))]) as pipeline:
+            pipeline.process(self.board, self.rows)
+            # 닫기 전에도 끝난 게시판까지는 읽을 수 있다
+            self.assertEqual(len(list(iter_export_file(path))), 15)
+            pipeline.process(self.board, self.rows)
+        exported = list(iter_export_file(path))
+        self.assertEqual(len(exported), 30)
+        self.assertEqual(exported[0], normalize_notice(self.rows[0], 0) | {'crawled_at': exported[0]['crawled_at']})
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            self.assertEqual(f.readline().count('\n'), 1)
+            self.assertNotIn(': ', f.readline())
+
+    def test_ndjson_reader_and_legacy_converter(self):
+        stream = io.BytesIO('{"a": 1}\n\n{"b": "가나다"}\r\n{"c": [1,\n'.encode('utf-8'))
+        with self.assertRaisesRegex(json.JSONDecodeError, '4번째 줄'):
+            list(iter_ndjson(stream, chunk_size=3))
+        stream = io.BytesIO('{"a": 1}\n\n{"b": "가나다"}'.encode('utf-8'))
+        self.assertEqual(list(iter_ndjson(stream, chunk_size=3)), [{'a': 1}, {'b': '가나다'}])
+
+        source = Path(__file__).resolve().parent.parent / 'crawled_data.json'
+        destination = Path(tempfile.mkdtemp()) / 'crawled.ndjson.gz'
+        stdout = io.StringIO()
+        call_command('convert_export', str(source), str(destination), stdout=stdout)
+        self.assertIn('120개 공지사항 변환', stdout.getvalue())
+        self.assertEqual(list(iter_export_file(destination)), json.loads(source.read_text(encoding='utf-8'))['notices'])
+        self.assertLess(destination.stat().st_size, source.stat().st_size / 5)
+        with self.assertRaises(CommandError):
+            call_command('convert_export', str(source), str(destination.with_suffix('.json')))
+
+    def test_json_reader_parses_large_value_in_few_passes(self):
+        body = '가' * (3 * 1024 * 1024)
+        document = json.dumps({'meta': {'rows': 2}, 'notices': [{'title': body}, 12345]}, ensure_ascii=False)
+        # 버퍼를 두 배씩 늘리므로 3MB짜리 값도 4KB 조각마다 다시 파싱하지 않는다
+        with mock.patch('notices.src.jsonstream._decoder.raw_decode', wraps=json.JSONDecoder().raw_decode) as decode:
+            rows = list(iter_json_array(io.BytesIO(document.encode('utf-8')), 'notices', chunk_size=4096))
+        self.assertEqual(rows, [{'title': body}, 12345])
+        self.assertLess(decode.call_count, 30)
+
+    def test_stream_readers_handle_long_lines_and_stop_at_errors(self):
+        long_line = json.dumps({'title': '가' * 100000}, ensure_ascii=False)
+        stream = io.BytesIO(f'{long_line}\n{{"a": 1}}\n{long_line}'.encode('utf-8'))
+        self.assertEqual([len(str(row)) for row in iter_ndjson(stream, chunk_size=1000)],
+                         [len(str(json.loads(long_line))), 8, len(str(json.loads(long_line)))])
+
+        # 잘못된 값은 나머지 본문을 끝까지 읽지 않고 바로 오류
+        rows = ''.join(json.dumps({'title': str(n)}) + ', ' for n in range(10000))
+        stream = io.BytesIO(('{"notices": [{"title": nope}, ' + rows + '1]}').encode('utf-8'))
+        with self.assertRaisesRegex(json.JSONDecodeError, 'Expecting value'):
+            list(iter_json_array(stream, 'notices', chunk_size=64))
+        self.assertLess(stream.tell(), 1024)
+        # 버퍼 끝에서 잘린 토큰은 더 읽어서 마저 파싱한다
+        for document in ('{"notices": [true, -Infinity, "\\u00e9", 1.5e3]}', '{"notices": [null]}'):
+            self.assertEqual(list(iter_json_array(io.BytesIO(document.encode()), 'notices', chunk_size=1)),
+                             json.loads(document)['notices'])
+
+    def test_changed_rows_are_updated(self):
+        DatabaseSink().write(self.board, [normalize_notice(row, i) for i, row in enumerate(self.rows)])
+        hashes = dict(Notice.objects.values_list('natural_key', 'content_hash'))
+
+        # 조회수와 목록 위치만 바뀐 글은 변경 없음으로 보고 다시 쓰지 않는다
+        volatile = [dict(normalize_notice(row, i + 5), view_count=999) for i, row in enumerate(self.rows[:3])]
+        result = DatabaseSink().write(self.board, volatile)
+        self.assertEqual((result.created, result.updated, result.unchanged), (0, 0, 3))
+        self.assertFalse(Notice.objects.filter(view_count=999).exists())
+        self.assertEqual(dict(Notice.objects.values_list('natural_key', 'content_hash')), hashes)
+
+        # 내용이 바뀌면 조회수와 목록 위치도 같이 갱신한다
+        changed = [dict(row, title='[수정] ' + row['title'], view_count='999') for row in self.rows[:3]]
+        result = CrawlPipeline([DatabaseSink()]).process(self.board, changed)['db']
+        self.assertEqual((result.created, result.updated, result.unchanged), (0, 3, 0))
+        self.assertEqual(Notice.objects.filter(view_count=999).count(), 3)
+        self.assertEqual(Notice.objects.get(natural_key='412197').display_order, 0)
+
+
+@override_settings(IMPORT_BATCH_SIZE=4)
+class ImportDataViewTests(TestCase):
+    def setUp(self):
+        category = NoticeCategory.objects.create(name='공지사항')
+        NoticeBoard.objects.create(category=category, name='학생소식', url='https://www.kongju.ac.kr/KNU/16909/subview.do')
+        NoticeBoard.objects.create(category=category, name='행정소식', url='https://www.kongju.ac.kr/KNU/16910/subview.do')
+        self.notices = json.loads((Path(__file__).resolve().parent.parent / 'crawled_data.json').read_text(encoding='utf-8'))['notices']
+        env = mock.patch.dict('os.environ', {'CRAWL_AUTH_TOKEN': 'secret'})
+        env.start()
+        self.addCleanup(env.stop)
+
+    def post(self, payload):
+        return self.client.post(
+            '/api/v1/import-data/', data=payload, content_type='application/json',
+            HTTP_AUTHORIZATION='Bearer secret',
+        )
+
+    def test_streams_batches_and_reports_summary(self):
+        body = self.post(json.dumps({'notices': self.notices}, ensure_ascii=False)).json()
+        self.assertTrue(body['success'])
+        self.assertEqual(body['received'], 120)
+        self.assertEqual(body['created'], Notice.objects.count())
+        self.assertEqual(set(Notice.objects.values_list('board__name', flat=True)), {'학생소식', '행정소식'})
+        self.assertIn('rows_per_second', body)
+        # 프로세스 평생 최대치가 아니라 이 요청 동안 할당한 메모리
+        self.assertGreater(body['peak_memory_kb'], 0)
+        self.assertLess(body['peak_memory_kb'], 50 * 1024)
+        self.assertFalse(tracemalloc.is_tracing())
+
+        again = self.post(json.dumps({'notices': self.notices}, ensure_ascii=False)).json()
+        self.assertEqual(again['created'], 0)
+        self.assertEqual(again['unchanged'], body['created'])
+
+    def test_accepts_ndjson_stream(self):
+        body = ''.join(json.dumps(notice, ensure_ascii=False) + '\n' for notice in self.notices)
+        response = self.client.post(
+            '/api/v1/import-data/', data=body, content_type='application/x-ndjson',
+            HTTP_AUTHORIZATION='Bearer secret',
+        ).json()
+        self.assertEqual((response['received'], response['created']), (120, Notice.objects.count()))
+        bad = self.client.post(
+            '/api/v1/import-data/', data=body + '{"title": \n', content_type='application/x-ndjson',
+            HTTP_AUTHORIZATION='Bearer secret',
+        )
+        self.assertEqual(bad.status_code, 400)
+
+    def test_accepts_gzip_body(self):
+        body = gzip.compress(json.dumps({'notices': self.notices}, ensure_ascii=False).encode('utf-8'))
+        response = self.client.post(
+            '/api/v1/import-data/', data=body, content_type='application/json',
+            HTTP_AUTHORIZATION='Bearer secret', HTTP_CONTENT_ENCODING='gzip',
+        )
+        self.assertEqual(response.json()['created'], Notice.objects.count())
+        for data, encoding, status in ((body[:len(body) // 2], 'gzip', 400), (b'not gzip', 'gzip', 400), (body, 'br', 415)):
+            response = self.client.post(
+                '/api/v1/import-data/', data=data, content_type='application/json',
+                HTTP_AUTHORIZATION='Bearer secret', HTTP_CONTENT_ENCODING=encoding,
+            )
+            self.assertEqual(response.status_code, status)
+
+    def test_chunks_are_saved_once(self):
+        lines = [json.dumps(notice, ensure_ascii=False) + '\n' for notice in self.notices]
+
+        def post_chunk(sequence, body):
+            return self.client.post(
+                f'/api/v1/import-data/?batch=b1&chunk={sequence}', data=body, content_type='application/x-ndjson',
+                HTTP_AUTHORIZATION='Bearer secret',
+            )
+
+        first = post_chunk(0, ''.join(lines[:60])).json()
+        self.assertEqual((first['duplicate'], first['chunks']), (False, [0]))
+        saved = Notice.objects.count()
+        again = post_chunk(0, ''.join(lines[:60])).json()
+        self.assertEqual((again['duplicate'], again['chunks']), (True, [0]))
+        self.assertEqual(Notice.objects.count(), saved)
+
+        # 중간에 JSON 오류가 난 조각은 통째로 저장되지 않고 기록도 남지 않는다
+        self.assertEqual(post_chunk(1, ''.join(lines[60:]) + '{"title": \n').status_code, 400)
+        self.assertEqual(post_chunk(2, '').status_code, 400)
+        status = self.client.get('/api/v1/import-data/', {'batch': 'b1'}, HTTP_AUTHORIZATION='Bearer secret').json()
+        self.assertEqual(status['chunks'], [0])
+        self.assertEqual(Notice.objects.count(), saved)
+
+        self.assertEqual(post_chunk(1, ''.join(lines[60:])).json()['chunks'], [0, 1])
+        self.assertEqual(self.client.post(
+            '/api/v1/import-data/?batch=b1&chunk=-1', data='', content_type='application/x-ndjson',
+            HTTP_AUTHORIZATION='Bearer secret',
+        ).status_code, 400)
+
+    def test_rejects_bad_payloads(self):
+        self.assertEqual(self.post('{"notices": [').status_code, 400)
+        self.assertEqual(self.post('{"notices": []}').status_code, 400)
+        response = self.client.post('/api/v1/import-data/', data='{}', content_type='application/json')
+        self.assertEqual(response.status_code, 401)
+
+
+class TestClientHttp:
+    """DeltaSyncClient가 쓰는 urllib3 request()를 Django 테스트 클라이언트로 처리하는 대역"""
+
+    def __init__(self, client):
+        self.client = client
+        self.sent = []
+
+    def request(self, method, url, fields=None, body=None, headers=None):
+        path = urlsplit(url).path
+        headers = dict(headers or {})
+        content_type = headers.pop('Content-Type', None)
+        extra = {f"HTTP_{name.upper().replace('-', '_')}": value for name, value in headers.items()}
+        if method == 'GET':
+            response = self.client.get(path, fields, **extra)
+        else:
+            path = f'{path}?{urlsplit(url).query}'
+            response = self.client.post(path, data=body, content_type=content_type, **extra)
+        self.sent.append((method, path, len(body or b'')))
+        return SimpleNamespace(status=response.status_code, data=response.content)
+
+
+class DeltaSyncTests(TestCase):
+    def setUp(self):
+        category = NoticeCategory.objects.create(name='공지사항')
+        NoticeBoard.objects.create(category=category, name='학생소식', url='https://www.kongju.ac.kr/KNU/16909/subview.do')
+        NoticeBoard.objects.create(category=category, name='행정소식', url='https://www.kongju.ac.kr/KNU/16910/subview.do')
+        self.notices = json.loads((Path(__file__).resolve().parent.parent / 'crawled_data.json').read_text(encoding='utf-8'))['notices']
+        env = mock.patch.dict('os.environ', {'CRAWL_AUTH_TOKEN': 'secret'})
+        env.start()
+        self.addCleanup(env.stop)
+        self.http = TestClientHttp(self.client)
+        self.sync_client = DeltaSyncClient('http://testserver/', 'secret', http=self.http)
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def export(self, notices):
+        path = Path(self.tmp.name) / 'crawled_data.ndjson.gz'
+        with NdjsonWriter(path) as writer:
+            writer.write_many(notices)
+        return path
+
+    def test_sends_only_new_and_changed_notices(self):
+        path = self.export(self.notices)
+        first = self.sync_client.sync(path)
+        self.assertEqual(first.total, 120)
+        # 게시판별 동기화 목록은 한 번에 묶어서 받는다
+        self.assertEqual([path for _, path, _ in self.http.sent].count('/api/v1/sync-manifest/'), 1)
+        # 서버에 없는 게시판의 글은 보내지 않는다
+        self.assertEqual(first.sent + first.duplicates, first.total - first.skipped)
+        self.assertGreater(first.skipped, 0)
+        self.assertEqual(first.response['created'], Notice.objects.count())
+        # 서버가 저장한 해시와 크롤러가 계산한 해시가 같다
+        notice = Notice.objects.order_by('id').first()
+        row = next(n for n in self.notices if notice_digest(normalize_notice(n))[0] == notice.natural_key)
+        self.assertEqual(notice_digest(normalize_notice(row))[1], notice.content_hash)
+
+        posts = len(self.http.sent)
+        again = self.sync_client.sync(path)
+        self.assertEqual((again.sent, again.unchanged, again.response), (0, first.sent, None))
+        self.assertEqual(again.manifest_entries, Notice.objects.count())
+        self.assertNotIn('POST', [method for method, _, _ in self.http.sent[posts:]])
+
+        changed = [dict(self.notices[0], title='[수정] ' + self.notices[0]['title'])] + self.notices[1:]
+        new = dict(self.notices[0], title='새 공지', url='https://www.kongju.ac.kr/bbs/KNU/2132/999999/artclView.do')
+        delta = self.sync_client.sync(self.export([new] + changed))
+        self.assertEqual(delta.sent, 2)
+        self.assertEqual((delta.response['created'], delta.response['updated']), (1, 1))
+        self.assertLess(delta.payload_bytes, first.payload_bytes / 10)
+
+    def test_chunked_gzip_upload_resumes_after_failure(self):
+        path = self.export(self.notices)
+        client = DeltaSyncClient('http://testserver/', 'secret', http=self.http, chunk_size=20)
+        original = client.request
+        calls = []
+
+        def fail_third_chunk(method, path, **kwargs):
+            if 'chunk=2' in path:
+                raise urllib3.exceptions.HTTPError('connection reset')
+            calls.append(path)
+            return original(method, path, **kwargs)
+
+        with mock.patch.object(client, 'request', side_effect=fail_third_chunk):
+            with self.assertRaises(urllib3.exceptions.HTTPError):
+                client.sync(path, full=True, batch_id='backfill-1')
+        saved = Notice.objects.count()
+        self.assertEqual(
+            self.client.get('/api/v1/import-data/', {'batch': 'backfill-1'}, HTTP_AUTHORIZATION='Bearer secret').json()['chunks'],
+            [0, 1],
+        )
+
+        resumed = client.sync(path, full=True, batch_id='backfill-1')
+        self.assertEqual((resumed.chunks, resumed.chunks_resumed), (6, 2))
+        self.assertLess(resumed.upload_bytes, resumed.payload_bytes / 2)
+        self.assertEqual(resumed.response['created'] + saved, Notice.objects.count())
+        self.assertEqual(resumed.response['updated'], 0)
+
+    def test_manifest_requires_token_and_board(self):
+        self.assertEqual(self.client.get('/api/v1/sync-manifest/', {'board': '학생소식'}).status_code, 401)
+        auth = {'HTTP_AUTHORIZATION': 'Bearer secret'}
+        self.assertEqual(self.client.get('/api/v1/sync-manifest/', **auth).status_code, 400)
+        self.assertEqual(
+            self.client.get('/api/v1/sync-manifest/', {'board': '학생소식', 'since': '2025.01.01'}, **auth).status_code, 400
+        )
+        body = self.client.get('/api/v1/sync-manifest/', {'board': ['학생소식', '없는게시판']}, **auth).json()
+        self.assertEqual(body['boards'], {'학생소식': {}})
+
+
+class ImportJobTests(TestCase):
+    def setUp(self):
+        category = NoticeCategory.objects.create(name='공지사항')
+        NoticeBoard.objects.create(category=category, name='학생소식', url='https://www.kongju.ac.kr/KNU/16909/subview.do')
+        NoticeBoard.objects.create(category=category, name='행정소식', url='https://www.kongju.ac.kr/KNU/16910/subview.do')
+        self.notices = json.loads((Path(__file__).resolve().parent.parent / 'crawled_data.json').read_text(encoding='utf-8'))['notices']
+        env = mock.patch.dict('os.environ', {'CRAWL_AUTH_TOKEN': 'secret'})
+        env.start()
+        self.addCleanup(env.stop)
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        overrides = self.settings(IMPORT_SPOOL_DIR=self.tmp.name, IMPORT_WORKER='command')
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        self.body = ''.join(json.dumps(notice, ensure_ascii=False) + '\n' for notice in self.notices)
+
+    def post_async(self, body, path='/api/v1/import-data/', **extra):
+        return self.client.post(
+            path, data=body, content_type='application/x-ndjson',
+            HTTP_AUTHORIZATION='Bearer secret', HTTP_PREFER='respond-async', **extra,
+        )
+
+    def job_status(self, job_id):
+        return self.client.get(f'/api/v1/import-jobs/{job_id}/', HTTP_AUTHORIZATION='Bearer secret').json()
+
+    def test_spools_and_returns_202_then_worker_saves(self):
+        response = self.post_async(gzip.compress(self.body.encode('utf-8')), HTTP_CONTENT_ENCODING='gzip')
+        self.assertEqual(response.status_code, 202)
+        job = response.json()
+        self.assertEqual(response['Location'], f"/api/v1/import-jobs/{job['job_id']}/")
+        self.assertEqual(job['status'], 'queued')
+        self.assertEqual(Notice.objects.count(), 0)
+        self.assertEqual(len(list(Path(self.tmp.name).glob('*.body'))), 1)
+        self.assertEqual(self.job_status(job['job_id'])['queue_position'], 0)
+
+        out = io.StringIO()
+        call_command('import_worker', '--once', stdout=out)
+        self.assertIn(f"작업 #{job['job_id']} done", out.getvalue())
+        status = self.job_status(job['job_id'])
+        self.assertEqual((status['status'], status['received']), ('done', 120))
+        self.assertEqual(status['created'], Notice.objects.count())
+        self.assertIsNotNone(status['rows_per_second'])
+        self.assertEqual(list(Path(self.tmp.name).iterdir()), [])
+
+    def test_failed_job_keeps_spool_and_reports_error(self):
+        with self.settings(IMPORT_ASYNC=True):
+            job_id = self.client.post(
+                '/api/v1/import-data/', data=self.body + '{"title": \n', content_type='application/x-ndjson',
+                HTTP_AUTHORIZATION='Bearer secret',
+            ).json()['job_id']
+            self.assertEqual(self.client.post(
+                '/api/v1/import-data/', data='x', content_type='text/plain', HTTP_AUTHORIZATION='Bearer secret',
+            ).status_code, 415)
+        call_command('import_worker', '--once', stdout=io.StringIO())
+        status = self.job_status(job_id)
+        self.assertEqual(status['status'], 'failed')
+        self.assertIn('121번째 줄', status['error'])
+        self.assertEqual(len(list(Path(self.tmp.name).glob('*.body'))), 1)
+        self.assertEqual(self.client.get('/api/v1/import-jobs/999/', HTTP_AUTHORIZATION='Bearer secret').status_code, 404)
+
+    def test_async_chunks_are_pending_until_saved(self):
+        path = '/api/v1/import-data/?batch=b2&chunk=0'
+        self.assertEqual(self.post_async(self.body, path).status_code, 202)
+        again = self.post_async(self.body, path).json()
+        self.assertEqual((again['duplicate'], again['chunks'], again['pending']), (True, [], [0]))
+        self.assertEqual(ImportJob.objects.count(), 1)
+
+        previous = celery_app.conf.CELERY_TASK_ALWAYS_EAGER
+        celery_app.conf.CELERY_TASK_ALWAYS_EAGER = True
+        self.addCleanup(setattr, celery_app.conf, 'CELERY_TASK_ALWAYS_EAGER', previous)
+        with override_settings(IMPORT_WORKER='celery'):
+            with self.captureOnCommitCallbacks(execute=True):
+                self.assertEqual(self.post_async(self.body, '/api/v1/import-data/?batch=b2&chunk=1').status_code, 202)
+        self.assertEqual(ImportJob.objects.get(sequence=1).status, 'done')
+        run_import_job()
+        status = self.client.get('/api/v1/import-data/', {'batch': 'b2'}, HTTP_AUTHORIZATION='Bearer secret').json()
+        self.assertEqual((status['chunks'], status['pending']), ([0, 1], []))
+
+    def test_sync_client_waits_for_async_jobs(self):
+        export = Path(self.tmp.name) / 'export.ndjson'
+        export.write_text(self.body, encoding='utf-8')
+        client = DeltaSyncClient('http://testserver/', 'secret', http=TestClientHttp(self.client),
+                                 chunk_size=50, async_import=True, poll_interval=0)
+        with mock.patch('notices.src.sync.time.sleep', side_effect=lambda seconds: run_import_job()):
+            result = client.sync(export)
+        self.assertEqual(result.chunks, 1)
+        self.assertEqual(result.response['created'], Notice.objects.count())
+        self.assertEqual(set(ImportJob.objects.values_list('status', flat=True)), {'done'})
+
+    def test_requeues_only_jobs_without_recent_heartbeat(self):
+        now = timezone.now()
+        long_ago, recently = now - timedelta(hours=2), now - timedelta(minutes=1)
+        alive = ImportJob.objects.create(status=ImportJob.RUNNING, started_at=long_ago, heartbeat_at=recently)
+        dead = ImportJob.objects.create(status=ImportJob.RUNNING, started_at=long_ago, heartbeat_at=long_ago)
+        legacy = ImportJob.objects.create(status=ImportJob.RUNNING, started_at=long_ago)
+        self.assertEqual(requeue_stale_jobs(now), 2)
+        statuses = dict(ImportJob.objects.values_list('id', 'status'))
+        self.assertEqual(
+            [statuses[job.id] for job in (alive, dead, legacy)],
+            [ImportJob.RUNNING, ImportJob.QUEUED, ImportJob.QUEUED],
+        )
+
+        # 배치를 저장할 때마다 heartbeat가 갱신된다
+        job_id = self.post_async(self.body).json()['job_id']
+        ticks = iter(now + timedelta(seconds=second) for second in range(1000))
+        with override_settings(IMPORT_BATCH_SIZE=50):
+            with mock.patch('notices.src.import_jobs.timezone.now', side_effect=lambda: next(ticks)):
+                run_import_job(job_id)
+        job = ImportJob.objects.get(id=job_id)
+        self.assertEqual(job.status, ImportJob.DONE)
+        self.assertLess(job.started_at, job.heartbeat_at)
+        self.assertLess(job.heartbeat_at, job.finished_at)
+
+
+class NoticeDataTestCase(TestCase):
+    """학생소식 게시판에 fixture 공지사항을 저장해 둔 상태에서 시작하는 테스트"""
+
+    def setUp(self):
+        notice_category = NoticeCategory.objects.create(name='공지사항')
+        gomnaru = NoticeCategory.objects.create(name='곰나루광장')
+        self.board = NoticeBoard.objects.create(
+            category=notice_category, name='학생소식', url='https://www.kongju.ac.kr/KNU/16909/subview.do')
+        NoticeBoard.objects.create(category=gomnaru, name='자취하숙', url='https://www.kongju.ac.kr/KNU/16926/subview.do')
+        html = (FIXTURES_DIR / 'board_list.html').read_text(encoding='utf-8')
+        self.rows = parse_notice_rows(html, '학생소식')
+        DatabaseSink().write(self.board, [normalize_notice(row, i) for i, row in enumerate(self.rows)])
+
+    def counts(self, date):
+        response = self.client.get('/api/v1/notice-counts/', {'date': date})
+        self.assertEqual(response.status_code, 200)
+        return {
+            board['name']: board['count']
+            for category in response.json()['categories'] for board in category['boards']
+        }
+
+    def expected(self, date):
+        return Notice.objects.filter(board=self.board, published_date=date, is_important=False).count()
+
+
+class NoticeCountsTests(NoticeDataTestCase):
+    def test_served_from_summary_in_one_query(self):
+        # 응답 캐시의 데이터 버전 조회 1번 + 집계 테이블 조회 1번
+        with self.assertNumQueries(2):
+            counts = self.counts('2025-07-29')
+        self.assertEqual(counts, {'학생소식': self.expected('2025-07-29'), '자취하숙': 0})
+        self.assertGreater(counts['학생소식'], 0)
+
+    def test_falls_back_to_group_by_without_summary(self):
+        NoticeDailyCount.objects.all().delete()
+        with self.assertNumQueries(3):
+            counts = self.counts('2025-07-29')
+        self.assertEqual(counts['학생소식'], self.expected('2025-07-29'))
+
+    def test_summary_follows_date_changes_and_rebuild(self):
+        moved = [dict(normalize_notice(row, i), date='2025-08-01') for i, row in enumerate(self.rows[:3])]
+        DatabaseSink().write(self.board, moved)
+        for date in ('2025-07-29', '2025-08-01', '2025-07-28'):
+            self.assertEqual(self.counts(date)['학생소식'], self.expected(date))
+
+        before = set(NoticeDailyCount.objects.values_list('board_id', 'published_date', 'is_important', 'count'))
+        rebuild_daily_counts()
+        after = set(NoticeDailyCount.objects.values_list('board_id', 'published_date', 'is_important', 'count'))
+        self.assertEqual(before, after)
+
+
+class ResponseCacheTests(NoticeDataTestCase):
+    def test_second_request_hits_cache_and_revalidates(self):
+        first = self.client.get('/api/v1/notice-counts/', {'date': '2025-07-29'})
+        # 캐시된 응답은 데이터 버전만 DB에서 확인한다
+        with self.assertNumQueries(1):
+            second = self.client.get('/api/v1/notice-counts/', {'date': '2025-07-29'})
+        self.assertEqual(first.content, second.content)
+        self.assertEqual(first['ETag'], second['ETag'])
+
+        not_modified = self.client.get(
+            '/api/v1/notice-counts/', {'date': '2025-07-29'}, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(not_modified.status_code, 304)
+
+    def test_ingest_invalidates_cached_responses(self):
+        before = self.client.get('/api/v1/notice-counts/', {'date': '2025-07-29'})
+        moved = [dict(normalize_notice(row, i), date='2025-08-01') for i, row in enumerate(self.rows[:3])]
+        DatabaseSink().write(self.board, moved)
+        after = self.client.get('/api/v1/notice-counts/', {'date': '2025-07-29'}, HTTP_IF_NONE_MATCH=before['ETag'])
+        self.assertEqual(after.status_code, 200)
+        self.assertNotEqual(before['ETag'], after['ETag'])
+        self.assertEqual(self.counts('2025-07-29')['학생소식'], self.expected('2025-07-29'))
+
+    def test_version_bumped_elsewhere_is_seen_and_etag_follows_body(self):
+        before = self.client.get('/api/v1/notice-counts/', {'date': '2025-07-29'})
+        # 다른 프로세스(import worker 등)가 데이터를 바꾸고 DB의 버전만 올린 경우
+        NoticeDailyCount.objects.filter(board=self.board, published_date='2025-07-29').update(count=999)
+        DataVersion.objects.update(version=F('version') + 1000)
+        after = self.client.get('/api/v1/notice-counts/', {'date': '2025-07-29'}, HTTP_IF_NONE_MATCH=before['ETag'])
+        self.assertEqual(after.status_code, 200)
+        self.assertEqual(self.counts('2025-07-29')['학생소식'], 999)
+
+        # 버전만 오르고 본문이 같으면 ETag도 같아서 304
+        DataVersion.objects.update(version=F('version') + 1000)
+        again = self.client.get('/api/v1/notice-counts/', {'date': '2025-07-29'}, HTTP_IF_NONE_MATCH=after['ETag'])
+        self.assertEqual(again.status_code, 304)
+
+    def test_conditional_request_validates_params_first(self):
+        # 파라미터가 잘못되면 If-Modified-Since가 최신이어도 304가 아니라 400
+        future = http_date(time.time() + 3600)
+        self.assertEqual(
+            self.client.get('/api/v1/notice-counts/', {'date': '2025-13-45'}, HTTP_IF_MODIFIED_SINCE=future).status_code,
+            400,
+        )
+        self.assertEqual(
+            self.client.get('/api/v1/notice-preview/', {'url': 'x', 'date': '2025-07-29'},
+                            HTTP_IF_MODIFIED_SINCE=future).status_code,
+            404,
+        )
+        # 캐시가 비어 있어도 올바른 요청은 뷰를 실행한 뒤 304로 답한다
+        first = self.client.get('/api/v1/notice-counts/', {'date': '2025-07-29'})
+        with mock.patch('notices.src.response_cache.response_cache.get', return_value=None):
+            not_modified = self.client.get(
+                '/api/v1/notice-counts/', {'date': '2025-07-29'}, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(not_modified.status_code, 304)
+
+    def test_errors_are_not_cached(self):
+        self.assertEqual(self.client.get('/api/v1/notice-counts/').status_code, 400)
+        self.assertEqual(self.client.get('/api/v1/notice-preview/', {'url': 'x', 'date': '2025-07-29'}).status_code, 404)
+        self.assertEqual(self.client.get('/api/v1/notice-preview/', {'url': 'x', 'date': '2025-07-29'}).status_code, 404)
+
+    def test_lru_bounds_and_ttl(self):
+        lru = LRUCache(maxsize=2, ttl=60)
+        lru.set('a', 1)
+        lru.set('b', 2)
+        lru.get('a')
+        lru.set('c', 3)
+        self.assertIsNone(lru.get('b'))
+        self.assertEqual((lru.get('a'), lru.get('c')), (1, 3))
+        self.assertEqual(lru.evictions, 1)
+
+        expired = LRUCache(maxsize=2, ttl=0)
+        expired.set('a', 1)
+        self.assertIsNone(expired.get('a'))
+        self.assertEqual((expired.misses, expired.evictions), (1, 1))
+
+
+class NoticeCountsRangeTests(NoticeDataTestCase):
+    def get(self, start, end):
+        return self.client.get('/api/v1/notice-counts/range/', {'start': start, 'end': end})
+
+    def test_window_matches_single_day_counts(self):
+        with self.assertNumQueries(3):
+            body = self.get('2025-07-25', '2025-07-29').json()
+        self.assertEqual(body['dates'], ['2025-07-25', '2025-07-26', '2025-07-27', '2025-07-28', '2025-07-29'])
+        boards = {b['name']: b['counts'] for c in body['categories'] for b in c['boards']}
+        for date in body['dates']:
+            self.assertEqual(boards['학생소식'][date], self.expected(date))
+            self.assertEqual(boards['자취하숙'][date], 0)
+
+        NoticeDailyCount.objects.all().delete()
+        fallback = self.get('2025-07-25', '2025-07-30').json()
+        self.assertEqual(
+            {b['name']: b['counts'] for c in fallback['categories'] for b in c['boards']}['학생소식']['2025-07-29'],
+            self.expected('2025-07-29'))
+
+    @override_settings(NOTICE_COUNTS_MAX_RANGE_DAYS=7)
+    def test_rejects_invalid_or_too_long_ranges(self):
+        self.assertEqual(self.get('2025-07-01', '2025-07-07').status_code, 200)
+        self.assertEqual(self.get('2025-07-01', '2025-07-08').status_code, 400)
+        self.assertEqual(self.get('2025-07-08', '2025-07-01').status_code, 400)
+        self.assertEqual(self.get('2025-07-01', 'tomorrow').status_code, 400)
+
+
+
+class SnapshotTests(NoticeDataTestCase):
+    def setUp(self):
+        super().setUp()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        overrides = self.settings(SNAPSHOT_DIR=self.tmp.name, SNAPSHOT_DAYS=5)
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        self.today = date(2025, 7, 29)
+
+    def index(self):
+        return json.loads((Path(self.tmp.name) / 'index.json').read_text(encoding='utf-8'))['dates']
+
+    def fetch(self, name, **extra):
+        response = self.client.get(f'/snapshots/{name}', **extra)
+        content = b''.join(response.streaming_content) if response.status_code == 200 else b''
+        response.close()
+        return response, content
+
+    def test_snapshot_matches_live_apis_and_is_served_precompressed(self):
+        names = refresh_snapshots([date(2025, 7, 29), date(2025, 7, 28), date(2025, 1, 1)], today=self.today)
+        self.assertEqual(len(names), 2)
+        self.assertEqual(sorted(self.index()), ['2025-07-28', '2025-07-29'])
+        name = self.index()['2025-07-29']
+        self.assertTrue((Path(self.tmp.name) / f'{name}.gz').exists())
+
+        snapshot = json.loads((Path(self.tmp.name) / name).read_text(encoding='utf-8'))
+        live = self.client.get('/api/v1/notice-counts/', {'date': '2025-07-29'}).json()
+        self.assertEqual(snapshot['categories'], live['categories'])
+        # 새 글이 없는 게시판도 미리보기 API와 같은 내용을 담는다
+        urls = [board['url'] for category in live['categories'] for board in category['boards']]
+        self.assertEqual(len(urls), 2)
+        self.assertEqual(snapshot['previews'], {
+            url: self.client.get('/api/v1/notice-preview/', {'url': url, 'date': '2025-07-29'}).json() for url in urls
+        })
+
+        response, content = self.fetch(name, HTTP_ACCEPT_ENCODING='gzip, br')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('immutable', response['Cache-Control'])
+        self.assertEqual(json.loads(gzip.decompress(content)), snapshot)
+
+        response, content = self.fetch('index.json')
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('immutable', response['Cache-Control'])
+        self.assertEqual(json.loads(content)['dates']['2025-07-29'], name)
+        self.assertEqual(self.fetch('2025-07-29.000000000000.json')[0].status_code, 404)
+        self.assertEqual(self.fetch(f'{name}.gz')[0].status_code, 404)
+
+    def test_content_addressed_versions_rotate(self):
+        first = refresh_snapshots([self.today], today=self.today)[0]
+        self.assertEqual(refresh_snapshots([self.today], today=self.today), [first])
+
+        names = [first]
+        for title in ('바뀐 제목', '또 바뀐 제목'):
+            row = self.rows[1]
+            DatabaseSink().write(self.board, [dict(normalize_notice(row, 1), title=title, date='2025-07-29')])
+            names += refresh_snapshots([self.today], today=self.today)
+            self.assertEqual(self.index()['2025-07-29'], names[-1])
+        self.assertEqual(len(set(names)), 3)
+        remaining = sorted(path.name for path in Path(self.tmp.name).glob('2025-07-29.*.json'))
+        self.assertEqual(remaining, sorted(names[1:]))
+
+        # 범위를 벗어난 날짜의 스냅샷은 지운다
+        refresh_snapshots([self.today + timedelta(days=5)], today=self.today + timedelta(days=5))
+        self.assertEqual(list(self.index()), ['2025-08-03'])
+        self.assertFalse(list(Path(self.tmp.name).glob('2025-07-29.*')))
+
+    def test_ingest_refreshes_changed_dates_after_commit(self):
+        today = timezone.localdate()
+        row = dict(normalize_notice(self.rows[0], 0), date=today.isoformat(), title='오늘 올라온 공지')
+        with self.captureOnCommitCallbacks(execute=True):
+            DatabaseSink().write(self.board, [row])
+        snapshot = json.loads((Path(self.tmp.name) / self.index()[today.isoformat()]).read_text(encoding='utf-8'))
+        self.assertEqual(
+            [notice['title'] for notice in snapshot['previews'][self.board.url]['notices']], ['오늘 올라온 공지'])
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            DatabaseSink().write(self.board, [row])
+        self.assertEqual(callbacks, [])
+
+class QueryPlanTests(TestCase):
+    """
+    view와 저장 경로가 실제로 실행하는 쿼리의 EXPLAIN QUERY PLAN을 확인
+    공지사항/집계 테이블을 통째로 훑는(SCAN) 쿼리가 생기면 실패한다.
+    """
+    BIG_TABLES = ('notices_notice', 'notices_noticedailycount')
+    SUMMARY_PROBE = 'EXISTS(SELECT 1 AS "a" FROM "notices_noticedailycount" LIMIT 1)'
+
+    @classmethod
+    def setUpTestData(cls):
+        category = NoticeCategory.objects.create(name='공지사항')
+        cls.boards = [
+            NoticeBoard.objects.create(category=category, name=f'게시판{i}', url=f'https://www.kongju.ac.kr/KNU/{16900 + i}/subview.do')
+            for i in range(4)
+        ]
+        start = date(2025, 1, 1)
+        Notice.objects.bulk_create([
+            Notice(
+                board=board, natural_key=str(board.id * 100000 + n), title=f'공지 {n}',
+                url=f'/bbs/KNU/{board.id}/{board.id * 100000 + n}/artclView.do',
+                published_date=start + timedelta(days=n % 200), display_order=n % 15,
+                is_important=n % 20 == 0,
+            )
+            for board in cls.boards for n in range(2000)
+        ], batch_size=1000)
+        rebuild_daily_counts()
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+    def assert_no_full_scans(self, func):
+        with CaptureQueriesContext(connection) as ctx:
+            func()
+        checked = 0
+        for query in ctx.captured_queries:
+            sql = query['sql']
+            if not sql.lstrip().upper().startswith(('SELECT', 'UPDATE', 'DELETE')):
+                continue
+            with connection.cursor() as cursor:
+                cursor.execute('EXPLAIN QUERY PLAN ' + sql)
+                plan = [row[-1] for row in cursor.fetchall()]
+            checked += 1
+            if self.SUMMARY_PROBE in sql:
+                # 집계 테이블 존재 확인(EXISTS ... LIMIT 1)은 첫 행에서 끝나므로 SCAN이어도 허용
+                plan.remove(next(d for d in plan if d.startswith('SCAN notices_noticedailycount')))
+            for detail in plan:
+                for table in self.BIG_TABLES:
+                    if re.match(rf'SCAN {table}\b', detail):
+                        self.fail(f"전체 스캔: {detail}\nSQL: {sql}\nPLAN: {plan}")
+        self.assertGreater(checked, 0)
+
+    def test_notice_counts(self):
+        self.assert_no_full_scans(lambda: self.client.get('/api/v1/notice-counts/', {'date': '2025-03-01'}))
+
+    def test_notice_counts_fallback(self):
+        NoticeDailyCount.objects.all().delete()
+        self.assert_no_full_scans(lambda: self.client.get('/api/v1/notice-counts/', {'date': '2025-03-02'}))
+
+    def test_notice_counts_range(self):
+        self.assert_no_full_scans(
+            lambda: self.client.get('/api/v1/notice-counts/range/', {'start': '2025-03-01', 'end': '2025-03-05'}))
+
+    def test_notice_counts_range_fallback(self):
+        NoticeDailyCount.objects.all().delete()
+        self.assert_no_full_scans(
+            lambda: self.client.get('/api/v1/notice-counts/range/', {'start': '2025-03-06', 'end': '2025-03-10'}))
+
+    def test_notice_preview(self):
+        self.assert_no_full_scans(lambda: self.client.get(
+            '/api/v1/notice-preview/', {'url': self.boards[0].url, 'date': '2025-03-01'}))
+
+    def test_board_notices_deep_page(self):
+        board = self.boards[2]
+        first = self.client.get(f'/api/v1/boards/{board.id}/notices/', {'limit': 50}).json()
+        self.assert_no_full_scans(lambda: self.client.get(
+            f'/api/v1/boards/{board.id}/notices/', {'limit': 50, 'cursor': first['next_cursor']}))
+
+    def test_ingest(self):
+        rows = [
+            {'title': f'공지 {n}', 'url': f'/bbs/KNU/{self.boards[1].id}/{self.boards[1].id * 100000 + n}/artclView.do',
+             'date': '2025-08-01', 'view_count': 5}
+            for n in range(30)
+        ]
+        self.assert_no_full_scans(lambda: DatabaseSink().write(self.boards[1], [normalize_notice(r, i) for i, r in enumerate(rows)]))
+
+
+class BoardNoticesTests(NoticeDataTestCase):
+    def url(self):
+        return f'/api/v1/boards/{self.board.id}/notices/'
+
+    def test_keyset_pages_cover_all_rows_in_order(self):
+        expected = list(
+            Notice.objects.filter(board=self.board, is_important=False)
+            .order_by('-published_date', 'display_order', 'id').values_list('id', flat=True)
+        )
+        seen = []
+        params = {'limit': 4}
+        while True:
+            with self.assertNumQueries(4):
+                body = self.client.get(self.url(), params).json()
+            self.assertEqual(body['total_count'], len(expected))
+            seen.extend(row['id'] for row in body['notices'])
+            if not body['next_cursor']:
+                break
+            params['cursor'] = body['next_cursor']
+        self.assertEqual(seen, expected)
+
+    def test_date_filter_and_preview_totals(self):
+        body = self.client.get(self.url(), {'date': '2025-07-29', 'limit': 2}).json()
+        self.assertEqual(body['total_count'], self.expected('2025-07-29'))
+        self.assertTrue(all(row['published_date'] == '2025-07-29' for row in body['notices']))
+
+        preview = self.client.get('/api/v1/notice-preview/', {'url': self.board.url, 'date': '2025-07-29'}).json()
+        self.assertEqual(preview['total_count'], self.expected('2025-07-29'))
+        self.assertLessEqual(len(preview['notices']), 5)
+
+    def test_rejects_bad_cursor_and_unknown_board(self):
+        self.assertEqual(self.client.get(self.url(), {'cursor': '!!!'}).status_code, 400)
+        self.assertEqual(self.client.get(self.url(), {'limit': 'many'}).status_code, 400)
+        self.assertEqual(self.client.get('/api/v1/boards/9999/notices/').status_code, 404)
+
+
+class SearchTests(NoticeDataTestCase):
+    def search(self, **params):
+        response = self.client.get('/api/v1/search/', params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def titles(self, body):
+        return sorted(row['title'] for row in body['notices'])
+
+    def test_fts_matches_like_fallback(self):
+        body = self.search(q='등록금 분할납부', limit=50)
+        self.assertEqual(body['backend'], 'fts')
+        self.assertGreater(body['total_count'], 0)
+        rows, total, backend = search_notices('등록금 분할납부', limit=50, use_index=False)
+        self.assertEqual(backend, 'like')
+        self.assertEqual(body['total_count'], total)
+        self.assertEqual(self.titles(body), sorted(row['title'] for row in rows))
+
+        # 짧은 검색어가 섞이면 FTS로 찾은 글 안에서 LIKE로 거른다
+        mixed = self.search(q='등록금 신청', limit=50)
+        rows, total, _ = search_notices('등록금 신청', limit=50, use_index=False)
+        self.assertEqual((mixed['backend'], mixed['total_count']), ('fts', total))
+        self.assertEqual(self.titles(mixed), sorted(row['title'] for row in rows))
+
+        # 모두 3글자보다 짧으면 LIKE로 찾는다
+        short = self.search(q='안내')
+        self.assertEqual(short['backend'], 'like')
+        self.assertEqual(short['total_count'], Notice.objects.filter(title__contains='안내').count())
+
+    def test_index_follows_upserts_deletes_and_board_renames(self):
+        renamed = [dict(normalize_notice(row, i), title='도서관 야간 개방 안내') for i, row in enumerate(self.rows[:1])]
+        DatabaseSink().write(self.board, renamed)
+        self.assertEqual(self.search(q='야간 개방')['total_count'], 1)
+
+        # ORM으로 직접 바꾼 경우는 응답 캐시 버전이 오르지 않으므로 검색 함수로 확인
+        Notice.objects.filter(title='도서관 야간 개방 안내').delete()
+        self.assertEqual(search_notices('야간 개방')[1], 0)
+
+        self.board.name = '학생소식게시판'
+        self.board.save()
+        board_total = Notice.objects.filter(board=self.board).count()
+        self.assertEqual(search_notices('소식게시판')[1], board_total)
+        self.assertEqual(rebuild_search_index(), Notice.objects.count())
+        self.assertEqual(search_notices('소식게시판')[1:], (board_total, 'fts'))
+
+    def test_filters_and_pagination(self):
+        everything = self.search(q='2025학년도', limit=50)
+        first = self.search(q='2025학년도', limit=2, page=1)
+        second = self.search(q='2025학년도', limit=2, page=2)
+        self.assertTrue(first['has_next'])
+        self.assertEqual(first['notices'] + second['notices'], everything['notices'][:4])
+
+        dated = self.search(q='2025학년도', **{'from': '2025-07-29', 'to': '2025-07-29'})
+        self.assertTrue(all(row['published_date'] == '2025-07-29' for row in dated['notices']))
+        other_board = NoticeBoard.objects.get(name='자취하숙')
+        self.assertEqual(self.search(q='2025학년도', board=other_board.id)['total_count'], 0)
+
+        self.assertEqual(self.client.get('/api/v1/search/').status_code, 400)
+        self.assertEqual(self.client.get('/api/v1/search/', {'q': '안내', 'page': 'x'}).status_code, 400)
+
+
+class BenchmarkTests(TestCase):
+    def test_generator_is_deterministic_and_skewed(self):
+        boards = ['학생소식', '행정소식', '행사안내']
+        first = list(generate_notice_rows(boards, 300, seed=7))
+        self.assertEqual(first, list(generate_notice_rows(boards, 300, seed=7)))
+        per_board = [sum(row['board_name'] == name for row in first) for name in boards]
+        self.assertGreater(per_board[0], per_board[2])
+        self.assertEqual(len({row['url'] for row in first}), 300)
+
+    def test_run_report_and_compare(self):
+        outcome = run_benchmarks(200, repeat=2, import_rows=20)
+        self.assertEqual(Notice.objects.count(), 0)
+        self.assertEqual(set(outcome['scenarios']), set(BenchmarkSuite.SCENARIOS))
+        for result in outcome['scenarios'].values():
+            self.assertLessEqual(result['p50_ms'], result['p95_ms'])
+        # 데이터 버전 조회 1번은 캐시된 응답에도 남는다
+        self.assertEqual(outcome['scenarios']['notice_counts']['queries'], 2)
+        self.assertEqual(outcome['scenarios']['notice_counts_cached']['queries'], 1)
+
+        report = build_report({200: outcome}, repeat=2, seed=0)
+        slower = json.loads(json.dumps(report))
+        slower['runs']['200']['scenarios']['notice_preview']['p95_ms'] *= 2
+        lines, regressions = compare_reports(slower, report)
+        self.assertEqual(len(lines), len(BenchmarkSuite.SCENARIOS))
+        self.assertEqual(len(regressions), 1)
+        self.assertIn('notice_preview', regressions[0])
+
+
+class KnuFixtureServerTests(SimpleTestCase):
+    def setUp(self):
+        html = (FIXTURES_DIR / 'board_list.html').read_text(encoding='utf-8')
+        self.rows = parse_notice_rows(html, '학생소식')
+        for row in self.rows[:2]:
+            row['is_important'] = True
+
+    def test_crawl_notices_through_url_mapping(self):
+        with KnuFixtureServer(self.rows, {'학생소식': '공지사항'}, pages=3) as server, HttpFetcher() as fetcher:
+            urls = server.board_urls()
+            self.assertEqual(list(urls), ['공지사항'])
+            with tempfile.NamedTemporaryFile('w', suffix='.json', encoding='utf-8', delete=False) as f:
+                json.dump(urls, f, ensure_ascii=False)
+            self.addCleanup(Path(f.name).unlink)
+            with override_settings(BOARD_URLS_FILE=f.name):
+                first = crawl_notices('학생소식', fetcher=fetcher)
+            self.assertEqual(len(first), 2 + 15)
+            self.assertEqual(sum(row['is_important'] for row in first), 2)
+            self.assertEqual(
+                {row['title'] for row in first if not row['is_important']},
+                {row['title'] for row in self.rows[2:]},
+            )
+
+            # 다음 페이지는 고정글만 같고 나머지는 게시글 번호가 다른 글
+            second = fetcher.fetch_rows(
+                dict(server.page_urls())['학생소식 (2)'], lambda html: parse_notice_rows(html, '학생소식'))[1]
+            self.assertEqual([row['url'] for row in second[:2]], [row['url'] for row in first[:2]])
+            self.assertFalse({row['url'] for row in second[2:]} & {row['url'] for row in first[2:]})
+
+            article = fetcher.fetch(server.url(first[2]['url']))
+            self.assertIn(first[2]['title'], article.html)
+            self.assertEqual(server.stats['requests'], 3)
+
+    def test_latency_and_errors(self):
+        with KnuFixtureServer(self.rows, latency=0.05, error_rate=1.0) as server, HttpFetcher(retries=0) as fetcher:
+            started = time.perf_counter()
+            with self.assertRaises(Exception):
+                fetcher.fetch(server.page_urls()[0][1])
+            self.assertGreaterEqual(time.perf_counter() - started, 0.05)
+            self.assertEqual(server.stats['errors'], 1)
+
+
+
+class SetupInitialDataTests(TestCase):
+    def test_board_urls_follow_url_file(self):
+        board = NoticeBoard.objects.create(
+            category=NoticeCategory.objects.create(name='공지사항'), name='학생소식',
+            url='https://www.kongju.ac.kr/old', is_active=False,
+        )
+        with tempfile.NamedTemporaryFile('w', suffix='.json', encoding='utf-8', delete=False) as f:
+            json.dump({'공지사항': {'학생소식': 'http://127.0.0.1:8000/board/1', '행사안내': 'http://127.0.0.1:8000/board/2'}}, f)
+        self.addCleanup(Path(f.name).unlink)
+        with override_settings(BOARD_URLS_FILE=f.name):
+            self.assertEqual(setup_initial_data(), 1)
+        board.refresh_from_db()
+        self.assertEqual(board.url, 'http://127.0.0.1:8000/board/1')
+        # 관리자가 끈 게시판은 그대로 두고, 새 게시판만 활성으로 만든다
+        self.assertFalse(board.is_active)
+        self.assertTrue(NoticeBoard.objects.get(name='행사안내').is_active)
+
+class NoticeParserTests(SimpleTestCase):
+    def parse_all(self, html):
+        return {
+            name: [{key: value for key, value in row.items() if key != 'crawled_at'}
+                   for row in get_parser(name).parse(html, '학생소식')]
+            for name in available_parsers()
+        }
+
+    def assert_identical(self, html):
+        results = self.parse_all(html)
+        expected = results.pop('soup')
+        for name, rows in results.items():
+            self.assertEqual(rows, expected, name)
+        return expected
+
+    def test_backends_match_on_fixtures(self):
+        self.assertEqual(len(self.assert_identical((FIXTURES_DIR / 'board_list.html').read_text(encoding='utf-8'))), 15)
+        self.assertEqual(self.assert_identical((FIXTURES_DIR / 'board_list_script.html').read_text(encoding='utf-8')), [])
+
+        rows = self.assert_identical((FIXTURES_DIR / 'board_list_edge_cases.html').read_text(encoding='utf-8'))
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(rows[0]['title'], 'A & B장학금 안내')
+        self.assertEqual(rows[0]['author'], '학생복지과')
+        self.assertTrue(rows[0]['is_important'])
+        self.assertIsNone(rows[1]['url'])
+        self.assertIsNone(rows[2]['title'])
+
+        server = KnuFixtureServer(generate_notice_rows(['학생소식'], 60), pages=3)
+        for body in server.pages_cache.values():
+            self.assert_identical(body.decode('utf-8'))
+
+    def test_parser_selection(self):
+        self.assertEqual(get_parser('stream').name, 'stream')
+        self.assertEqual(get_parser().name, 'soup')
+        with override_settings(NOTICE_PARSER='stream'):
+            self.assertEqual(get_parser().name, 'stream')
+        with self.assertRaises(ValueError):
+            get_parser('regex')
+
+
+class IncrementalCrawlTests(TestCase):
+    def setUp(self):
+        rows = list(generate_notice_rows(['학생소식', '행정소식'], 120, seed=3))
+        for row in rows:
+            row['is_important'] = False
+        # 실제 게시판처럼 최신 글(큰 번호)이 앞에 오게
+        rows.sort(key=lambda row: row['num'], reverse=True)
+        rows[0]['is_important'] = True
+        self.rows = rows
+        self.server = KnuFixtureServer(rows, {'학생소식': '공지사항', '행정소식': '공지사항'}, pages=4).start()
+        self.addCleanup(self.server.stop)
+        self.fetcher = HttpFetcher()
+        self.addCleanup(self.fetcher.close)
+        self.url = self.server.board_urls()['공지사항']['학생소식']
+
+    def page_ids(self, page):
+        url = board_page_url(self.url, page)
+        rows = self.fetcher.fetch_rows(url, lambda html: parse_notice_rows(html, '학생소식'))[1]
+        return [notice_article_id(row['url']) for row in rows if not row['is_important']]
+
+    def test_stops_at_high_water_mark(self):
+        first = crawl_board_pages(self.fetcher, '학생소식', self.url, high_water_mark=0, max_pages=4)
+        self.assertEqual((first.pages, first.reached_known), (1, False))
+        self.assertEqual(first.max_article_id, max(self.page_ids(1) + [notice_article_id(first.rows[0]['url'])]))
+
+        known = self.page_ids(2)[5]
+        pages = crawl_board_pages(self.fetcher, '학생소식', self.url, high_water_mark=known, max_pages=4)
+        self.assertEqual((pages.pages, pages.reached_known), (2, True))
+        # 고정글은 첫 페이지의 것만 남는다
+        self.assertEqual(sum(row['is_important'] for row in pages.rows), 1)
+        self.assertEqual(len(pages.rows), 1 + 15 * 2)
+
+        everything = crawl_board_pages(self.fetcher, '학생소식', self.url, high_water_mark=1, max_pages=3)
+        self.assertEqual((everything.pages, everything.reached_known), (3, False))
+
+    def test_unchanged_first_page_is_not_parsed(self):
+        first = crawl_board_pages(self.fetcher, '학생소식', self.url)
+        self.assertTrue(first.etag and first.last_modified and first.content_hash)
+        self.assertEqual(first.content_length, first.bytes_downloaded)
+
+        # ETag가 같으면 서버가 본문 없이 304로 답한다
+        validators = {'etag': first.etag, 'last_modified': first.last_modified}
+        with mock.patch('notices.src.crawler.parse_notice_rows') as parse:
+            pages = crawl_board_pages(self.fetcher, '학생소식', self.url, validators=validators)
+        parse.assert_not_called()
+        self.assertEqual((pages.unchanged, pages.rows, pages.bytes_downloaded), ('not_modified', [], 0))
+        self.assertEqual(self.server.stats['not_modified'], 1)
+
+        # 조건부 요청을 지원하지 않는 서버라도 tbody 해시가 같으면 파싱하지 않는다
+        self.server.conditional = False
+        with mock.patch('notices.src.crawler.parse_notice_rows') as parse:
+            pages = crawl_board_pages(self.fetcher, '학생소식', self.url, validators=validators,
+                                      content_hash=first.content_hash)
+        parse.assert_not_called()
+        self.assertEqual(pages.unchanged, 'same_hash')
+        self.assertEqual(pages.content_hash, first.content_hash)
+
+        # 목록 밖(배너 등)만 바뀐 경우는 같은 해시, 게시물 행이 바뀌면 다른 해시
+        html = self.fetcher.fetch(self.url).html
+        self.assertEqual(tbody_hash(html.replace('<div id="container">', '<div id="container"><p>배너</p>')),
+                         first.content_hash)
+        self.assertNotEqual(tbody_hash(html.replace('<td class="td-access">', '<td class="td-access">1', 1)),
+                            first.content_hash)
+        self.assertIsNone(tbody_hash('<html><body>로그인이 필요합니다</body></html>'))
+
+    def test_command_records_state_and_skips_known_pages(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.json', encoding='utf-8', delete=False) as f:
+            json.dump(self.server.board_urls(), f, ensure_ascii=False)
+        self.addCleanup(Path(f.name).unlink)
+        output = Path(tempfile.mkdtemp()) / 'crawled.json'
+
+        def crawl():
+            stdout = io.StringIO()
+            with override_settings(BOARD_URLS_FILE=f.name):
+                call_command('crawl_notices', backend='http', output=str(output), max_pages=4, stdout=stdout)
+            return stdout.getvalue()
+
+        crawl()
+        states = {state.board.name: state for state in BoardCrawlState.objects.select_related('board')}
+        self.assertEqual(set(states), {'학생소식', '행정소식'})
+        stored_ids = Notice.objects.filter(board__name='학생소식').values_list('natural_key', flat=True)
+        self.assertEqual(states['학생소식'].max_article_id, max(int(key) for key in stored_ids))
+        self.assertIsNotNone(states['학생소식'].last_crawled_at)
+        notice_count = Notice.objects.count()
+
+        # 두 번째 실행: 목록이 그대로라서 두 게시판 모두 304로 끝나고 파싱/저장을 하지 않는다
+        second = crawl()
+        self.assertIn('건너뛴 게시판 2개 (304 2개, 해시 일치 0개)', second)
+        self.assertNotIn('절약 0 bytes', second)
+        self.assertEqual(Notice.objects.count(), notice_count)
+
+        # 새 글이 하나 올라오면 그 게시판만 다시 읽고, 1페이지에서 이미 본 글이 나오므로 나머지 페이지는 건너뛴다
+        self.server.load([self.new_row(self.rows)] + self.rows)
+        third = crawl()
+        self.assertIn('목록 페이지 2개 읽음, 3개 건너뜀', third)
+        self.assertIn('건너뛴 게시판 1개 (304 1개', third)
+        self.assertEqual(Notice.objects.count(), notice_count + 1)
+        self.assertEqual(
+            BoardCrawlState.objects.get(board__name='학생소식').max_article_id,
+            notice_article_id(self.new_row(self.rows)['url']),
+        )
+
+    def new_row(self, rows):
+        row = dict(next(row for row in rows if row['board_name'] == '학생소식'))
+        article_id = notice_article_id(row['url']) + 1000
+        row.update(
+            title='새로 올라온 공지', num=str(article_id), is_important=False,
+            url=row['url'].replace(f"/{notice_article_id(row['url'])}/", f'/{article_id}/'),
+        )
+        return row
+
+
+class BackfillTests(TestCase):
+    def setUp(self):
+        rows = list(generate_notice_rows(['학생소식'], 100, seed=5))
+        for row in rows:
+            row['is_important'] = False
+        rows.sort(key=lambda row: (row['date'], int(row['num'])), reverse=True)
+        rows[0]['is_important'] = True
+        self.rows = rows
+        self.server = KnuFixtureServer(rows, {'학생소식': '공지사항'}, pages=4).start()
+        self.addCleanup(self.server.stop)
+        self.fetcher = HttpFetcher(retries=0)
+        self.addCleanup(self.fetcher.close)
+        category = NoticeCategory.objects.create(name='공지사항')
+        self.board = NoticeBoard.objects.create(
+            category=category, name='학생소식', url=self.server.board_urls()['공지사항']['학생소식']
+        )
+
+    def stored_keys(self):
+        return set(Notice.objects.filter(board=self.board).values_list('natural_key', flat=True))
+
+    def served_keys(self, rows):
+        return {str(notice_article_id(row['url'])) for row in rows}
+
+    def test_resumes_from_checkpoint(self):
+        first = backfill_board(self.board, self.fetcher, max_pages=3, workers=2, window=2)
+        self.assertEqual((first.stop_reason, first.pages, first.last_page), ('max_pages', 3, 3))
+        state = BoardCrawlState.objects.get(board=self.board)
+        self.assertEqual((state.backfill_page, state.backfill_complete), (3, False))
+        # 고정글 1개 + 3페이지 x 15개
+        self.assertEqual(self.stored_keys(), self.served_keys(self.rows[:46]))
+        self.assertEqual(state.max_article_id, max(int(key) for key in self.stored_keys()))
+
+        # 중간에 요청이 실패하면 저장된 곳까지만 기록하고, 다음 실행이 그 다음 페이지부터 이어서 읽는다
+        self.server.error_rate = 1.0
+        failed = backfill_board(self.board, self.fetcher, max_pages=10, workers=2, window=2)
+        self.assertEqual((failed.stop_reason, failed.pages), ('error', 0))
+        self.assertEqual(BoardCrawlState.objects.get(board=self.board).backfill_page, 3)
+
+        self.server.error_rate = 0.0
+        requests = self.server.stats['requests']
+        resumed = backfill_board(self.board, self.fetcher, max_pages=10, workers=2, window=2)
+        self.assertEqual((resumed.start_page, resumed.stop_reason, resumed.last_page), (4, 'end', 5))
+        self.assertEqual(self.server.stats['requests'] - requests, 2)
+        self.assertEqual(self.stored_keys(), self.served_keys(self.rows[:61]))
+        self.assertTrue(BoardCrawlState.objects.get(board=self.board).backfill_complete)
+
+        self.assertEqual(backfill_board(self.board, self.fetcher).stop_reason, 'done')
+        # 목록 순서: 페이지 순서대로, 고정글은 1페이지 것만
+        titles = list(Notice.objects.filter(board=self.board, is_important=False).order_by('display_order')
+                      .values_list('natural_key', flat=True))
+        self.assertEqual(titles, [str(notice_article_id(row['url'])) for row in self.rows[1:61]])
+
+    def test_crawl_after_backfill_keeps_display_order(self):
+        backfill_board(self.board, self.fetcher, max_pages=3, workers=2, window=2)
+        orders = dict(Notice.objects.filter(board=self.board).values_list('natural_key', 'display_order'))
+
+        # 증분 크롤링이 같은 페이지를 다시 읽어도 표시 순서가 같아서 다시 쓰지 않는다
+        pages = crawl_board_pages(self.fetcher, self.board.name, self.board.url, high_water_mark=1, max_pages=3)
+        self.assertEqual(pages.pages, 3)
+        saved = CrawlPipeline([DatabaseSink()]).process(self.board, pages.rows)['db']
+        self.assertEqual((saved.created, saved.updated), (0, 0))
+        self.assertEqual(dict(Notice.objects.filter(board=self.board).values_list('natural_key', 'display_order')), orders)
+        self.assertEqual([row['display_order'] for row in pages.rows], sorted(orders.values()))
+
+    def test_stops_at_until_date_and_rereads_partial_page(self):
+        until = date.fromisoformat(self.rows[25]['date'])
+        progress = backfill_board(self.board, self.fetcher, until=until, max_pages=10, workers=2, window=3)
+        self.assertEqual(progress.stop_reason, 'until')
+        expected = [row for row in self.rows[:61] if row['is_important'] or date.fromisoformat(row['date']) >= until]
+        self.assertEqual(self.stored_keys(), self.served_keys(expected))
+        # 일부만 저장한 페이지는 완료로 기록하지 않는다
+        state = BoardCrawlState.objects.get(board=self.board)
+        self.assertEqual(state.backfill_page, progress.last_page - 1)
+
+        earlier = backfill_board(self.board, self.fetcher, max_pages=10, workers=2, window=3)
+        self.assertEqual((earlier.start_page, earlier.stop_reason), (progress.last_page, 'end'))
+        self.assertEqual(self.stored_keys(), self.served_keys(self.rows[:61]))
+
+    def test_command_parses_in_process_pool(self):
+        stdout = io.StringIO()
+        with tempfile.NamedTemporaryFile('w', suffix='.json', encoding='utf-8', delete=False) as f:
+            json.dump(self.server.board_urls(), f, ensure_ascii=False)
+        self.addCleanup(Path(f.name).unlink)
+        with override_settings(BOARD_URLS_FILE=f.name):
+            call_command('backfill', board=['학생소식'], max_pages=2, workers=2, processes=1, stdout=stdout)
+        self.assertIn('학생소식: 1~2페이지 31개 추가, 0개 갱신 (페이지 한도에서 멈춤)', stdout.getvalue())
+        self.assertEqual(self.stored_keys(), self.served_keys(self.rows[:31]))
+
+
+class CeleryCrawlTests(TestCase):
+    def setUp(self):
+        # 브로커/워커 없이 이 프로세스에서 바로 실행 (Django 설정 이름공간이라 CELERY_ 이름으로 바꿔야 한다)
+        previous = celery_app.conf.CELERY_TASK_ALWAYS_EAGER
+        celery_app.conf.CELERY_TASK_ALWAYS_EAGER = True
+        self.addCleanup(setattr, celery_app.conf, 'CELERY_TASK_ALWAYS_EAGER', previous)
+        # 작업끼리 재사용하는 fetcher는 테스트마다 새로 만든다
+        self.addCleanup(close_worker_fetchers)
+
+        rows = list(generate_notice_rows(['학생소식', '행정소식'], 60, seed=7))
+        self.server = KnuFixtureServer(rows, {'학생소식': '공지사항', '행정소식': '공지사항'}).start()
+        self.addCleanup(self.server.stop)
+        category = NoticeCategory.objects.create(name='공지사항')
+        for name, url in self.server.board_urls()['공지사항'].items():
+            NoticeBoard.objects.create(category=category, name=name, url=url)
+
+    def test_chord_aggregates_board_reports(self):
+        report = dispatch_crawl(NoticeBoard.objects.all(), backend='http').get()
+        self.assertEqual((report['boards'], report['errors'], report['boards_unchanged']), (2, {}, 0))
+        self.assertEqual(report['created'], Notice.objects.count())
+        self.assertEqual({board['board'] for board in report['reports']}, {'학생소식', '행정소식'})
+        self.assertEqual(set(BoardCrawlState.objects.values_list('board__name', flat=True)), {'학생소식', '행정소식'})
+
+        again = dispatch_crawl(NoticeBoard.objects.all(), backend='http').get()
+        self.assertEqual((again['created'], again['boards_unchanged']), (0, 2))
+
+    def test_retries_with_backoff_then_reports_error(self):
+        self.server.error_rate = 1.0
+        fetcher = HttpFetcher(retries=0)
+        self.addCleanup(fetcher.close)
+        with mock.patch('notices.src.tasks.worker_fetcher', lambda backend: fetcher):
+            report = dispatch_crawl(NoticeBoard.objects.all(), backend='http').get()
+        # 실패한 게시판도 chord 보고서에 오류로 들어간다
+        self.assertEqual(set(report['errors']), {'학생소식', '행정소식'})
+        self.assertEqual(report['retries'], 2 * CRAWL_MAX_RETRIES)
+        self.assertEqual(self.server.stats['requests'], 2 * (CRAWL_MAX_RETRIES + 1))
+        self.assertFalse(Notice.objects.exists())
+
+    def test_other_errors_are_reported_without_retry(self):
+        class BrokenFetcher(Fetcher):
+            def fetch(self, url, validators=None):
+                raise RuntimeError('chrome not reachable')
+
+        with mock.patch('notices.src.tasks.worker_fetcher', lambda backend: BrokenFetcher()):
+            report = dispatch_crawl(NoticeBoard.objects.all(), backend='http').get()
+        self.assertEqual(report['errors'], {'학생소식': 'chrome not reachable', '행정소식': 'chrome not reachable'})
+        self.assertEqual(report['retries'], 0)
+
+        # 404 같은 HTTP 오류도 다시 시도하지 않는다
+        board = NoticeBoard.objects.get(name='학생소식')
+        board.url = self.server.url('/KNU/404/subview.do')
+        board.save()
+        report = dispatch_crawl([board], backend='http').get()
+        self.assertIn('HTTP 404', report['errors']['학생소식'])
+        self.assertEqual(report['retries'], 0)
+
+    def test_fetcher_is_reused_across_tasks(self):
+        with mock.patch('notices.src.tasks.create_fetcher', wraps=create_fetcher) as created:
+            dispatch_crawl(NoticeBoard.objects.all(), backend='http').get()
+            dispatch_crawl(NoticeBoard.objects.all(), backend='http').get()
+        self.assertEqual(created.call_count, 1)
+
+    def test_host_rate_limit(self):
+        url = self.server.url('/KNU/20000/subview.do')
+        now = 1_000_000 * 60 + 10
+        self.assertEqual([reserve_host_slot(url, '2/m', now=now) for _ in range(2)], [0, 0])
+        self.assertEqual(reserve_host_slot(url, '2/m', now=now), 50)
+        self.assertEqual(reserve_host_slot('http://other.example/KNU/1/subview.do', '2/m', now=now), 0)
+        self.assertEqual(reserve_host_slot(url, '2/m', now=now + 50), 0)
+        self.assertEqual(reserve_host_slot(url, ''), 0)
+        with self.assertRaises(ValueError):
+            reserve_host_slot(url, '2/week')
+
+    def test_command_dispatches_to_celery(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.json', encoding='utf-8', delete=False) as f:
+            json.dump(self.server.board_urls(), f, ensure_ascii=False)
+        self.addCleanup(Path(f.name).unlink)
+        stdout = io.StringIO()
+        with override_settings(BOARD_URLS_FILE=f.name):
+            call_command('crawl_notices', celery=True, backend='http', stdout=stdout)
+        self.assertIn(f'Successfully crawled {Notice.objects.count()} new notices', stdout.getvalue())
+        self.assertIn('게시판 2개, 목록 페이지 2개', stdout.getvalue())
+
+
+    def test_command_runs_locally_with_memory_broker(self):
+        # 기본 설정(메모리 브로커, eager 아님)에서 워커를 기다리며 멈추지 않고 이 프로세스에서 실행한다
+        celery_app.conf.CELERY_TASK_ALWAYS_EAGER = False
+        with tempfile.NamedTemporaryFile('w', suffix='.json', encoding='utf-8', delete=False) as f:
+            json.dump(self.server.board_urls(), f, ensure_ascii=False)
+        self.addCleanup(Path(f.name).unlink)
+        stdout = io.StringIO()
+        with override_settings(BOARD_URLS_FILE=f.name):
+            call_command('crawl_notices', celery=True, backend='http', deadline=30, stdout=stdout)
+        self.assertIn('메모리 브로커', stdout.getvalue())
+        self.assertIn(f'Successfully crawled {Notice.objects.count()} new notices', stdout.getvalue())
+        self.assertGreater(Notice.objects.count(), 0)
+
+class CrawlSchedulerTests(TestCase):
+    def setUp(self):
+        category = NoticeCategory.objects.create(name='공지사항')
+        self.busy = NoticeBoard.objects.create(category=category, name='학생소식', url='http://example.com/1')
+        self.quiet = NoticeBoard.objects.create(category=category, name='분실물센터', url='http://example.com/2')
+        self.now = timezone.now()
+        today = timezone.localdate(self.now)
+        # 최근 14일 동안 하루 3개씩
+        Notice.objects.bulk_create([
+            Notice(board=self.busy, title=f'공지 {day}-{index}', url=f'/bbs/KNU/1/{day * 10 + index}/artclView.do',
+                   published_date=today - timedelta(days=day), natural_key=str(day * 10 + index))
+            for day in range(14) for index in range(3)
+        ])
+        rebuild_daily_counts()
+        self.scheduler = CrawlScheduler(min_interval=15, max_interval=1440, target_per_crawl=0.5)
+
+    def test_interval_follows_posting_rate(self):
+        rates = self.scheduler.posting_rates([self.busy, self.quiet], self.now)
+        # 최근 7일에 발견한 21개 (작성일 기준 56일 평균보다 크다)
+        self.assertEqual(rates[self.busy.id][0], 3)
+        self.assertEqual(rates[self.quiet.id], (0, None))
+        self.assertEqual(self.scheduler.base_interval(3), timedelta(hours=4))
+        self.assertEqual(self.scheduler.base_interval(0), timedelta(days=1))
+        self.assertEqual(self.scheduler.base_interval(1000), timedelta(minutes=15))
+
+    def test_tightens_after_activity_and_relaxes_back(self):
+        intervals = [
+            self.scheduler.record_crawl(self.busy, new_count, self.now).interval
+            for new_count in (2, 0, 0, 0)
+        ]
+        self.assertEqual(intervals, [timedelta(hours=2), timedelta(hours=3), timedelta(hours=4), timedelta(hours=4)])
+        state = BoardCrawlState.objects.get(board=self.busy)
+        self.assertEqual((state.crawl_interval, state.next_crawl_at), (4 * 3600, self.now + timedelta(hours=4)))
+        self.assertEqual(self.scheduler.record_crawl(self.quiet, 0, self.now).interval, timedelta(days=1))
+        # 조용하던 게시판도 새 글이 나오면 바로 줄인다
+        self.assertEqual(self.scheduler.record_crawl(self.quiet, 1, self.now).interval, timedelta(hours=12))
+
+    def test_plan_and_due_boards(self):
+        new_board = NoticeBoard.objects.create(category=self.busy.category, name='자취하숙', url='http://example.com/3')
+        self.scheduler.record_crawl(self.busy, 0, self.now)
+        self.scheduler.record_crawl(self.quiet, 0, self.now)
+
+        plan = self.scheduler.plan(now=self.now)
+        # 아직 크롤링하지 않은 게시판이 먼저, 그다음 다음 실행 시각 순
+        self.assertEqual([schedule.board.name for schedule in plan], ['자취하숙', '학생소식', '분실물센터'])
+        self.assertEqual(self.scheduler.due_boards(now=self.now), [new_board])
+        self.assertEqual(
+            self.scheduler.due_boards(now=self.now + timedelta(hours=5)), [new_board, self.busy]
+        )
+
+        stdout = io.StringIO()
+        call_command('crawl_schedule', stdout=stdout)
+        self.assertIn('자취하숙: 하루 0.00개, 주기 1440분, 다음 아직 크롤링하지 않음 (지금 차례)', stdout.getvalue())
+        self.assertIn('학생소식: 하루 3.00개, 주기 240분', stdout.getvalue())
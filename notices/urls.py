@@ -1,14 +1,19 @@
 from django.urls import path, include
 from . import views
-from .src.import_views import ImportDataView
+from .src.import_views import ImportDataView, ImportJobView, SyncManifestView
 
 app_name = "notices"
 
 # API v1 패턴들
 api_v1_patterns = [
     path('notice-counts/', views.get_notice_counts, name='notice_counts'),
+    path('notice-counts/range/', views.get_notice_counts_range, name='notice_counts_range'),
     path('notice-preview/', views.get_notice_preview, name='notice_preview'),
+    path('boards/<int:board_id>/notices/', views.get_board_notices, name='board_notices'),
+    path('search/', views.search, name='search'),
     path('import-data/', ImportDataView.as_view(), name='import_data'),
+    path('import-jobs/<int:job_id>/', ImportJobView.as_view(), name='import_job'),
+    path('sync-manifest/', SyncManifestView.as_view(), name='sync_manifest'),
     path('debug-notices/', views.debug_notices, name='debug_notices'),
 ]
 
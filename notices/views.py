@@ -3,6 +3,7 @@ from django.views.decorators.csrf import csrf_exempt
 def debug_notices(req):
     """DB에 저장된 Notice, NoticeBoard, NoticeCategory의 개수와 일부 샘플 데이터를 반환"""
     from .models import Notice, NoticeBoard, NoticeCategory
+    from .src.response_cache import response_cache
     data = {
         'notice_count': Notice.objects.count(),
         'notice_sample': list(Notice.objects.all().order_by('-id').values('id','title','published_date','board__name')[:5]),
@@ -10,13 +11,21 @@ def debug_notices(req):
         'board_sample': list(NoticeBoard.objects.all().order_by('-id').values('id','name','url')[:5]),
         'category_count': NoticeCategory.objects.count(),
         'category_sample': list(NoticeCategory.objects.all().order_by('-id').values('id','name')[:5]),
+        'response_cache': response_cache.stats(),
     }
     logger.info(f"[DEBUG-NOTICES] {data}")
     return JsonResponse(data)
+from django.conf import settings
 from django.http import JsonResponse, HttpResponseNotAllowed
+from django.db.models import Count, Exists, F, FilteredRelation, Q, Sum
+from django.db.models.functions import Coalesce
 from datetime import datetime, timedelta
 from django.shortcuts import render
-from .models import NoticeCategory, Notice, NoticeBoard
+from .models import Notice, NoticeBoard, NoticeDailyCount
+from .src.response_cache import cached_api_response
+from .src.search import search_notices
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+import binascii
 import logging
 
 logger = logging.getLogger(__name__)
@@ -31,6 +40,7 @@ def index(req):
     }
     return render(req, 'index.html', context)
 
+@cached_api_response('notice-counts', ('date',))
 def get_notice_counts(req):
     """날짜별 모든 게시판의 공지사항 개수를 반환 (GET only)"""
     if req.method != 'GET':
@@ -48,25 +58,123 @@ def get_notice_counts(req):
         logger.exception("날짜 처리 중 오류")
         return JsonResponse({'error': 'Internal Server Error'}, status=500)
     
-    categories_data = []
-    categories = NoticeCategory.objects.all()
-    
-    for category in categories:
-        boards_data = []
-        for board in category.boards.filter(is_active=True):
-            notice_count = board.notices.filter(published_date=target_date, is_important=False).count()
-            boards_data.append({
-                'name': board.name,
-                'url': board.url,
-                'count': notice_count
-            })
-
-        categories_data.append({
-            'name': category.name,
-            'boards': boards_data
+    return JsonResponse({'categories': board_counts_by_category(target_date)})
+
+def board_counts_by_category(target_date):
+    """
+    날짜별 활성 게시판의 일반 공지 개수를 카테고리별로 묶어서 반환
+    일별 집계 테이블(NoticeDailyCount)에서 쿼리 한 번으로 가져오고,
+    집계 테이블이 비어 있으면 Notice 테이블 GROUP BY 한 번으로 대신 계산한다.
+    """
+    boards = list(
+        NoticeBoard.objects.filter(is_active=True)
+        .select_related('category')
+        .annotate(
+            day_count=FilteredRelation(
+                'daily_counts',
+                condition=Q(daily_counts__published_date=target_date, daily_counts__is_important=False),
+            ),
+            notice_count=Coalesce(F('day_count__count'), 0),
+            has_summary=Exists(NoticeDailyCount.objects.all()),
+        )
+        .order_by('category_id', 'id')
+    )
+
+    counts = None
+    if boards and not boards[0].has_summary:
+        counts = dict(
+            Notice.objects.filter(published_date=target_date, is_important=False)
+            .order_by()
+            .values_list('board_id')
+            .annotate(total=Count('id'))
+        )
+
+    categories = {}
+    for board in boards:
+        category = categories.setdefault(board.category_id, {'name': board.category.name, 'boards': []})
+        category['boards'].append({
+            'name': board.name,
+            'url': board.url,
+            'count': board.notice_count if counts is None else counts.get(board.id, 0)
         })
-    return JsonResponse({'categories': categories_data})
+    return list(categories.values())
+
+@cached_api_response('notice-counts-range', ('start', 'end'))
+def get_notice_counts_range(req):
+    """기간(start~end) 동안 날짜별, 게시판별 공지사항 개수를 한 번에 반환 (GET only)"""
+    if req.method != 'GET':
+        return HttpResponseNotAllowed(['GET'])
+
+    start_str = req.GET.get('start')
+    end_str = req.GET.get('end')
+    if not start_str or not end_str:
+        return JsonResponse({'error': '시작 날짜와 종료 날짜가 필요합니다'}, status=400)
+
+    try:
+        start = datetime.strptime(start_str, '%Y-%m-%d').date()
+        end = datetime.strptime(end_str, '%Y-%m-%d').date()
+    except ValueError:
+        return JsonResponse({'error': '잘못된 날짜 형식입니다.'}, status=400)
+
+    max_days = getattr(settings, 'NOTICE_COUNTS_MAX_RANGE_DAYS', 31)
+    if end < start:
+        return JsonResponse({'error': '종료 날짜가 시작 날짜보다 빠릅니다.'}, status=400)
+    if (end - start).days + 1 > max_days:
+        return JsonResponse({'error': f'최대 {max_days}일까지 조회할 수 있습니다.'}, status=400)
+
+    dates = [(start + timedelta(days=i)).isoformat() for i in range((end - start).days + 1)]
+    return JsonResponse({
+        'start': start_str,
+        'end': end_str,
+        'dates': dates,
+        'categories': board_counts_for_range(start, end, dates),
+    })
 
+def board_counts_for_range(start, end, dates):
+    """
+    기간 내 활성 게시판의 날짜별 일반 공지 개수를 카테고리별로 묶어서 반환
+    게시판 목록 조회 1번 + 일별 집계 테이블에서 기간 조회 1번
+    (집계 테이블이 비어 있으면 Notice 테이블을 (게시판, 날짜)로 GROUP BY)
+    """
+    boards = list(
+        NoticeBoard.objects.filter(is_active=True)
+        .select_related('category')
+        .annotate(has_summary=Exists(NoticeDailyCount.objects.all()))
+        .order_by('category_id', 'id')
+    )
+    if not boards:
+        return []
+
+    if boards[0].has_summary:
+        rows = (
+            NoticeDailyCount.objects.filter(
+                published_date__range=(start, end), is_important=False, board__is_active=True)
+            .values_list('board_id', 'published_date', 'count')
+        )
+    else:
+        rows = (
+            Notice.objects.filter(
+                published_date__range=(start, end), is_important=False, board__is_active=True)
+            .order_by()
+            .values_list('board_id', 'published_date')
+            .annotate(total=Count('id'))
+        )
+
+    counts = {}
+    for board_id, published_date, count in rows:
+        counts[(board_id, published_date.isoformat())] = count
+
+    categories = {}
+    for board in boards:
+        category = categories.setdefault(board.category_id, {'name': board.category.name, 'boards': []})
+        category['boards'].append({
+            'name': board.name,
+            'url': board.url,
+            'counts': {date: counts.get((board.id, date), 0) for date in dates}
+        })
+    return list(categories.values())
+
+@cached_api_response('notice-preview', ('date', 'url'))
 def get_notice_preview(req):
     """특정 게시판의 공지사항 미리보기를 반환 (GET only)"""
     if req.method != 'GET':
@@ -89,25 +197,154 @@ def get_notice_preview(req):
         logger.exception("게시판 조회 중 오류")
         return JsonResponse({'error': 'Internal Server Error'}, status=500)
     
-    notices = Notice.objects.filter(
-        board=board,
-        published_date=target_date
-    ).order_by('display_order')
-
-    # 고정글 제외 후 최대 5개만 반환
-    notices_data = [
-        {
-            'title': notice.title,
-            'url': notice.url,
-            'author': notice.author,
-            'view_count': notice.view_count,
-            'is_important': notice.is_important
-        } for notice in notices if not notice.is_important
-    ][:5]
-    
-    return JsonResponse({
+    return JsonResponse(board_preview(board, target_date))
+
+def board_preview(board, target_date):
+    """게시판의 날짜별 미리보기 (notice-preview 응답, 대시보드 스냅샷에 같이 쓴다)"""
+    # 고정글 제외 후 최대 5개만 반환 (필터링, 정렬, 개수 제한 모두 SQL에서)
+    notices_data = list(
+        Notice.objects.filter(board=board, published_date=target_date, is_important=False)
+        .order_by('display_order', 'id')
+        .values('title', 'url', 'author', 'view_count', 'is_important')[:5]
+    )
+    return {
         'board_name': board.name,
-        'date': date_str,
+        'date': target_date.isoformat(),
         'notices': notices_data,
-        'total_count': len(notices_data)
-    })
\ No newline at end of file
+        'total_count': count_board_notices(board, target_date, target_date)
+    }
+
+BOARD_NOTICE_FIELDS = ('id', 'title', 'url', 'author', 'view_count', 'is_important', 'published_date', 'display_order')
+
+@cached_api_response('board-notices', ('from', 'to', 'date', 'include_important', 'limit', 'cursor'))
+def get_board_notices(req, board_id):
+    """
+    게시판 공지사항 목록 (GET only)
+    (published_date 내림차순, display_order, id) 기준 keyset 페이지네이션이라 뒤쪽 페이지도 첫 페이지와 비용이 같다.
+    - date 또는 from/to: 날짜 범위
+    - include_important: 'true'면 고정글 포함 (기본 제외)
+    - limit: 페이지 크기 (최대 BOARD_NOTICES_MAX_LIMIT)
+    - cursor: 이전 응답의 next_cursor
+    """
+    if req.method != 'GET':
+        return HttpResponseNotAllowed(['GET'])
+
+    try:
+        board = NoticeBoard.objects.get(id=board_id, is_active=True)
+    except NoticeBoard.DoesNotExist:
+        return JsonResponse({'error': '게시판을 찾을 수 없습니다.'}, status=404)
+
+    try:
+        date_from = _parse_date(req.GET.get('from') or req.GET.get('date'))
+        date_to = _parse_date(req.GET.get('to') or req.GET.get('date'))
+        cursor = _decode_cursor(req.GET.get('cursor'))
+    except ValueError:
+        return JsonResponse({'error': '잘못된 날짜 또는 커서 형식입니다.'}, status=400)
+
+    max_limit = getattr(settings, 'BOARD_NOTICES_MAX_LIMIT', 100)
+    try:
+        limit = min(max(int(req.GET.get('limit', 20)), 1), max_limit)
+    except ValueError:
+        return JsonResponse({'error': '잘못된 limit 값입니다.'}, status=400)
+    include_important = req.GET.get('include_important', '').lower() in ('1', 'true', 'yes')
+
+    queryset = Notice.objects.filter(board=board)
+    if date_from:
+        queryset = queryset.filter(published_date__gte=date_from)
+    if date_to:
+        queryset = queryset.filter(published_date__lte=date_to)
+    if not include_important:
+        queryset = queryset.filter(is_important=False)
+    if cursor:
+        last_date, last_order, last_id = cursor
+        queryset = queryset.filter(
+            Q(published_date__lt=last_date)
+            | Q(published_date=last_date, display_order__gt=last_order)
+            | Q(published_date=last_date, display_order=last_order, id__gt=last_id)
+        )
+
+    rows = list(
+        queryset.order_by('-published_date', 'display_order', 'id').values(*BOARD_NOTICE_FIELDS)[:limit + 1]
+    )
+    next_cursor = _encode_cursor(rows[limit - 1]) if len(rows) > limit else None
+    rows = rows[:limit]
+    for row in rows:
+        row['published_date'] = row['published_date'].isoformat()
+
+    return JsonResponse({
+        'board': {'id': board.id, 'name': board.name, 'url': board.url},
+        'notices': rows,
+        'total_count': count_board_notices(board, date_from, date_to, include_important),
+        'next_cursor': next_cursor,
+    })
+
+@cached_api_response('search', ('q', 'board', 'from', 'to', 'page', 'limit'))
+def search(req):
+    """
+    공지사항 검색 (GET only)
+    - q: 검색어 (공백으로 나눈 단어가 모두 들어 있는 글, 제목/작성자/게시판 이름 대상)
+    - board: 게시판 id
+    - from/to: 게시일 범위
+    - page, limit: 페이지 번호(1부터)와 페이지 크기 (최대 SEARCH_MAX_LIMIT)
+    """
+    if req.method != 'GET':
+        return HttpResponseNotAllowed(['GET'])
+
+    q = req.GET.get('q', '').strip()
+    if not q:
+        return JsonResponse({'error': '검색어가 필요합니다'}, status=400)
+
+    max_limit = getattr(settings, 'SEARCH_MAX_LIMIT', 50)
+    try:
+        date_from = _parse_date(req.GET.get('from'))
+        date_to = _parse_date(req.GET.get('to'))
+        board_id = int(req.GET['board']) if req.GET.get('board') else None
+        page = max(int(req.GET.get('page', 1)), 1)
+        limit = min(max(int(req.GET.get('limit', 20)), 1), max_limit)
+    except ValueError:
+        return JsonResponse({'error': '잘못된 검색 조건입니다.'}, status=400)
+
+    rows, total, backend = search_notices(
+        q, board_id=board_id, date_from=date_from, date_to=date_to,
+        limit=limit, offset=(page - 1) * limit,
+    )
+    for row in rows:
+        row['published_date'] = row['published_date'].isoformat()
+        row['board_name'] = row.pop('board__name')
+
+    return JsonResponse({
+        'query': q,
+        'backend': backend,
+        'page': page,
+        'total_count': total,
+        'has_next': page * limit < total,
+        'notices': rows,
+    })
+
+def count_board_notices(board, date_from=None, date_to=None, include_important=False):
+    """일별 집계 테이블로 게시판의 (기간 내) 공지사항 개수 계산"""
+    queryset = NoticeDailyCount.objects.filter(board=board)
+    if date_from:
+        queryset = queryset.filter(published_date__gte=date_from)
+    if date_to:
+        queryset = queryset.filter(published_date__lte=date_to)
+    if not include_important:
+        queryset = queryset.filter(is_important=False)
+    return queryset.aggregate(total=Coalesce(Sum('count'), 0))['total']
+
+def _parse_date(value):
+    return datetime.strptime(value, '%Y-%m-%d').date() if value else None
+
+def _encode_cursor(row):
+    raw = f"{row['published_date'].isoformat()}|{row['display_order']}|{row['id']}"
+    return urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+def _decode_cursor(value):
+    if not value:
+        return None
+    try:
+        raw = urlsafe_b64decode(value + '=' * (-len(value) % 4)).decode('utf-8')
+        published_date, display_order, notice_id = raw.split('|')
+        return _parse_date(published_date), int(display_order), int(notice_id)
+    except (TypeError, UnicodeDecodeError, binascii.Error) as e:
+        raise ValueError(str(e))